@@ -0,0 +1,81 @@
+"""Benchmark of the broadcast cache of the WebSocket transports.
+
+QWebChannel hands every client its own copy of each signal message. Compares encoding every copy with encoding the
+first copy and looking up the frame of the others in the BroadcastCache by the key of their copies, as the transports
+of a service do.
+
+Usage:
+    python benchmarks/bench_broadcast.py [clients] [repeats]
+"""
+import copy
+import sys
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+from pywebchannel.Codec import Codec
+from pywebchannel.WebChannelService import BroadcastCache
+
+
+class Sensors(QObject):
+    """The object whose signal is broadcast, it is watched by the cache."""
+
+    readings = Signal(list)
+
+
+sensors = Sensors()
+
+
+def perClient(codec: Codec, messages: list) -> None:
+    """Encodes the copy of the message of every client."""
+    for message in messages:
+        codec.encode(message)
+
+
+def broadcast(codec: Codec, messages: list) -> None:
+    """Encodes the first copy of the message and reuses its frame for the other clients."""
+    cache = BroadcastCache()
+    cache.watchSignals(sensors, "Sensors")
+    for message in messages:
+        key = cache.messageKey(message)
+        if cache.lookup(codec, key) is None:
+            cache.store(codec, key, codec.encode(message))
+
+
+def measure(send, codec: Codec, messages: list, repeats: int) -> float:
+    """Returns the best time of sending the messages, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        send(codec, messages)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    # A signal carrying a list of readings, one copy per client
+    message = {
+        "type": 1,
+        "object": "Sensors",
+        "signal": 5,
+        "args": [[{"id": i, "value": i * 0.5, "unit": "C", "ok": True} for i in range(200)]],
+    }
+    messages = [copy.deepcopy(message) for _ in range(clients)]
+
+    print(f"{clients} clients")
+    print(f"{'codec':<10} {'per client (ms)':>16} {'broadcast (ms)':>16} {'speedup':>8}")
+    for name in ("json", "fastjson", "msgpack"):
+        try:
+            codec = Codec.create(name)
+        except ImportError:
+            continue
+        perClientTime = measure(perClient, codec, messages, repeats)
+        broadcastTime = measure(broadcast, codec, messages, repeats)
+        print(f"{name:<10} {perClientTime:>16.3f} {broadcastTime:>16.3f} {perClientTime / broadcastTime:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
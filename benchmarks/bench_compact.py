@@ -0,0 +1,57 @@
+"""Benchmark of the compact encoding of the pydantic models.
+
+Compares the size of the JSON text and the conversion time of a list of models sent as dictionaries with the same
+list sent as a table of columns by CompactEncoding.
+
+Usage:
+    python benchmarks/bench_compact.py [items] [repeats]
+"""
+import json
+import sys
+import time
+
+from pydantic import BaseModel
+
+from pywebchannel.Compact import CompactEncoding
+from pywebchannel.Controller import Convert
+
+
+class Todo(BaseModel):
+    id: str
+    text: str
+    completed: bool
+    isSelected: bool
+
+
+def measure(convert, value, repeats: int) -> float:
+    """Returns the best time of converting the value, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        convert(value)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    todos = [Todo(id=str(i), text=f"todo {i}", completed=i % 2 == 0, isSelected=False) for i in range(items)]
+
+    # The models are sent as dictionaries until they are registered as compact
+    dictTime = measure(Convert.dump, todos, repeats)
+    dictSize = len(json.dumps(Convert.dump(todos), separators=(",", ":")))
+
+    CompactEncoding.register(Todo)
+    compactTime = measure(Convert.dump, todos, repeats)
+    compactSize = len(json.dumps(Convert.dump(todos), separators=(",", ":")))
+
+    print(f"{'encoding':<10} {'bytes':>10} {'dump (ms)':>10}")
+    print(f"{'dict':<10} {dictSize:>10} {dictTime:>10.3f}")
+    print(f"{'compact':<10} {compactSize:>10} {compactTime:>10.3f}")
+    print(f"size ratio {compactSize / dictSize:.2f}")
+
+
+if __name__ == "__main__":
+    main()
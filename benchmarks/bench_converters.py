@@ -0,0 +1,84 @@
+"""Benchmark of the argument and result conversions of the actions.
+
+Compares the per-call type introspection of Convert.from_web_to_py with the conversion plans, which are compiled once
+per action by Convert.plan_from_web_to_py. The results are compared as a model_dump() per item wrapped in a Response
+model against the cached TypeAdapter of Convert.plan_from_py_to_web wrapped in Response.envelope.
+
+Usage:
+    python benchmarks/bench_converters.py [items] [repeats]
+"""
+import sys
+import time
+from typing import List
+
+from pydantic import BaseModel
+
+from pywebchannel.Controller import Convert, Response
+
+
+class Todo(BaseModel):
+    id: int
+    text: str
+    done: bool
+
+
+def measure(convert, makeArg, repeats: int) -> float:
+    """Returns the best time of converting a fresh argument, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        # The legacy conversion modifies the argument in place, so every run gets a fresh copy
+        arg = makeArg()
+        start = time.perf_counter()
+        convert(arg)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    cases = {
+        "list[Todo]": (
+            list[Todo],
+            lambda: [{"id": i, "text": f"todo {i}", "done": i % 2 == 0} for i in range(items)],
+        ),
+        "list[list[float]]": (
+            list[list[float]],
+            lambda: [[float(i), float(i + 1), float(i + 2)] for i in range(items)],
+        ),
+        "List[int]": (
+            List[int],
+            lambda: list(range(items)),
+        ),
+    }
+
+    print(f"{'argument type':<20} {'per-call (ms)':>14} {'plan (ms)':>10} {'speedup':>8}")
+    for name, (paramType, makeArg) in cases.items():
+        plan = Convert.plan_from_web_to_py(paramType) or (lambda arg: arg)
+
+        def legacy(arg, paramType=paramType):
+            return Convert.from_web_to_py(arg, paramType)
+
+        legacyTime = measure(legacy, makeArg, repeats)
+        planTime = measure(plan, makeArg, repeats)
+        print(f"{name:<20} {legacyTime:>14.3f} {planTime:>10.3f} {legacyTime / planTime:>7.1f}x")
+
+    print()
+    print(f"{'result type':<20} {'per-call (ms)':>14} {'plan (ms)':>10} {'speedup':>8}")
+    makeResult = lambda: [Todo(id=i, text=f"todo {i}", done=i % 2 == 0) for i in range(items)]
+    dump = Convert.plan_from_py_to_web(list[Todo])
+
+    def legacyResponse(result):
+        return Response(data=[item.model_dump() for item in result]).model_dump()
+
+    def planResponse(result):
+        return Convert.from_py_to_web_response(result, dump)
+
+    legacyTime = measure(legacyResponse, makeResult, repeats)
+    planTime = measure(planResponse, makeResult, repeats)
+    print(f"{'list[Todo]':<20} {legacyTime:>14.3f} {planTime:>10.3f} {legacyTime / planTime:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,14 @@ from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWidgets import QApplication
 
 from controllers.HelloWorldController import HelloWorldController
-from pywebchannel import WebChannelService, HttpServer
+from pywebchannel import WebChannelService, HttpServer, Logger, QueueLogBackend
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
+    # Write the log messages on a background thread, so logging never blocks the event loop
+    Logger.setBackend(QueueLogBackend())
+
     # Create a WebChannelService with a desired serviceName and the parent QObject
     commandTransferService = WebChannelService("Command Transfer Service", app)
     # Start the service with a desired port number, 9000 in this example
@@ -8,13 +8,16 @@ from PySide6.QtWidgets import QApplication
 
 from controllers.TodoController import TodoController
 from controllers.WeatherController import WeatherController
-from pywebchannel import WebChannelService, HttpServer
+from pywebchannel import WebChannelService, HttpServer, Logger, QueueLogBackend
 
 signal.signal(signal.SIGINT, signal.SIG_DFL)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
+    # Write the log messages on a background thread, so logging never blocks the event loop
+    Logger.setBackend(QueueLogBackend())
+
     todoController = TodoController(app)
 
     weatherController = WeatherController(app)
@@ -0,0 +1,281 @@
+import asyncio
+import heapq
+import inspect
+import math
+import selectors
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QSocketNotifier, Qt, QTimer, Slot
+
+
+class _NotifyingSelector(selectors.DefaultSelector):
+    """A selector that lets the Qt event loop watch the files registered by the private asyncio loop.
+
+    Every registered file gets socket notifiers for its events, which step the private loop when the file is ready,
+    i.e. a socket of a coroutine or the self-pipe written by call_soon_threadsafe.
+    """
+
+    def __init__(self, bridge: "AsyncBridge") -> None:
+        """
+        The constructor method for the _NotifyingSelector class.
+
+        Args:
+            bridge (AsyncBridge): The bridge which steps the private loop.
+        """
+        super().__init__()
+        self._bridge = bridge
+        # The socket notifiers of the registered files, mapped by their file descriptors
+        self._notifiers: Dict[int, List[QSocketNotifier]] = {}
+
+    def register(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = super().register(fileobj, events, data)
+        self._watch(key)
+        return key
+
+    def unregister(self, fileobj) -> selectors.SelectorKey:
+        key = super().unregister(fileobj)
+        self._unwatch(key.fd)
+        return key
+
+    def modify(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = super().modify(fileobj, events, data)
+        self._unwatch(key.fd)
+        self._watch(key)
+        return key
+
+    def close(self) -> None:
+        for fd in [*self._notifiers]:
+            self._unwatch(fd)
+        super().close()
+
+    def _watch(self, key: selectors.SelectorKey) -> None:
+        """Creates the socket notifiers of a registered file.
+
+        Args:
+            key (selectors.SelectorKey): The key of the registered file.
+        """
+        notifiers = []
+        for event, notifierType in (
+                (selectors.EVENT_READ, QSocketNotifier.Type.Read),
+                (selectors.EVENT_WRITE, QSocketNotifier.Type.Write),
+        ):
+            if key.events & event:
+                notifier = QSocketNotifier(key.fd, notifierType, self._bridge)
+                notifier.activated.connect(lambda *_: self._bridge.wake())
+                notifiers.append(notifier)
+        self._notifiers[key.fd] = notifiers
+
+    def _unwatch(self, fd: int) -> None:
+        """Deletes the socket notifiers of a file which is not registered anymore.
+
+        Args:
+            fd (int): The file descriptor of the file.
+        """
+        for notifier in self._notifiers.pop(fd, []):
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+
+
+class _BridgeLoop(asyncio.SelectorEventLoop):
+    """The private asyncio loop of the bridge, which asks the bridge to step it whenever it has something to do.
+
+    Scheduling a callback steps the loop in the next iteration of the Qt event loop, and scheduling a timer steps it
+    when the timer is due. The files are watched by the socket notifiers of the selector.
+    """
+
+    def __init__(self, bridge: "AsyncBridge") -> None:
+        """
+        The constructor method for the _BridgeLoop class.
+
+        Args:
+            bridge (AsyncBridge): The bridge which steps the loop.
+        """
+        self._bridge = bridge
+        # The handles of the timers which are not run yet, ordered by their due times
+        self._timerHandles: List[asyncio.TimerHandle] = []
+        super().__init__(_NotifyingSelector(bridge))
+
+    def call_soon(self, callback, *args, context=None) -> asyncio.Handle:
+        handle = super().call_soon(callback, *args, context=context)
+        self._bridge.wake()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None) -> asyncio.TimerHandle:
+        handle = super().call_at(when, callback, *args, context=context)
+        heapq.heappush(self._timerHandles, handle)
+        self._bridge.wake(self.delayUntil(when))
+        return handle
+
+    def delayUntil(self, when: float) -> int:
+        """Returns the delay until a time of the loop.
+
+        Args:
+            when (float): The time of the loop.
+
+        Returns:
+            int: The delay in milliseconds, rounded up so the time is reached.
+        """
+        return max(0, math.ceil((when - self.time()) * 1000))
+
+    def step(self) -> None:
+        """Runs the callbacks which are ready, without waiting for anything, and asks the bridge to step the loop
+        again when the next timer is due."""
+        start = self.time()
+        # The loop stops right after one iteration, which polls the I/O without waiting. The stop is not a callback
+        # of the application, so it does not step the loop again.
+        super().call_soon(self.stop)
+        self.run_forever()
+
+        # Forget the timers which are run or cancelled, the timers due before the iteration are run by it. The
+        # delays of the timers are capped by the bridge, or a timer may fire a bit early, so the next one is checked.
+        while self._timerHandles and (
+                self._timerHandles[0].cancelled() or self._timerHandles[0].when() < start
+        ):
+            heapq.heappop(self._timerHandles)
+        if self._timerHandles:
+            self._bridge.wake(self.delayUntil(self._timerHandles[0].when()))
+
+
+class AsyncBridge(QObject):
+    """A class that runs coroutines on the Qt main thread without blocking the Qt event loop.
+
+    If the Qt event loop is run by an asyncio loop, i.e. the QAsyncioEventLoop of QtAsyncio, the coroutines are
+    scheduled on that asyncio loop. Otherwise, the bridge keeps a private asyncio loop, which is stepped by the Qt
+    event loop only when it has something to do: when a callback is ready, when its next timer is due, or when one of
+    its files, including the self-pipe of call_soon_threadsafe, is ready, which socket notifiers report. It is never
+    polled. Either way, the coroutines run on the main thread, so they can touch the controllers and emit their
+    signals safely.
+
+    Attributes:
+        _loop (Optional[_BridgeLoop]): The private asyncio loop, created on the first use.
+        _timer (QTimer): The single shot timer that steps the private asyncio loop when it is due.
+    """
+
+    maxDelay = 2 ** 31 - 1
+    """ The longest delay of the timer in milliseconds, the later timers of the private loop are checked again. """
+
+    _instance: Optional["AsyncBridge"] = None
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initializes the AsyncBridge object with the given parent.
+
+        Args:
+            parent (Optional[QObject], optional): The parent object for the AsyncBridge. Defaults to None.
+        """
+        super().__init__(parent)
+        self._loop: Optional[_BridgeLoop] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.tick)
+
+    @staticmethod
+    def instance() -> "AsyncBridge":
+        """Returns the shared AsyncBridge object, it is created on the first call.
+
+        Returns:
+            AsyncBridge: The shared AsyncBridge object.
+        """
+        if AsyncBridge._instance is None:
+            AsyncBridge._instance = AsyncBridge()
+        return AsyncBridge._instance
+
+    @staticmethod
+    def runningLoop() -> Optional[asyncio.AbstractEventLoop]:
+        """Returns the asyncio loop running the Qt event loop, i.e. the one of QtAsyncio, if any.
+
+        Returns:
+            Optional[asyncio.AbstractEventLoop]: The running asyncio loop, or None.
+        """
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def submit(
+            self, awaitable: Awaitable[Any], done: Optional[Callable[[asyncio.Future], None]] = None
+    ) -> asyncio.Future:
+        """Schedules an awaitable to run on the main thread.
+
+        Args:
+            awaitable (Awaitable[Any]): The coroutine or future to be run.
+            done (Callable[[asyncio.Future], None], optional): The function which is called with the finished future.
+                Defaults to None.
+
+        Returns:
+            asyncio.Future: The future of the awaitable.
+        """
+        # Schedule the awaitable on the running asyncio loop, if any
+        loop = AsyncBridge.runningLoop()
+        if loop is not None:
+            future = asyncio.ensure_future(awaitable, loop=loop)
+            if done is not None:
+                future.add_done_callback(done)
+            return future
+
+        # Otherwise, schedule it on the private loop, which is stepped until it is finished
+        future = asyncio.ensure_future(awaitable, loop=self._privateLoop())
+        if done is not None:
+            future.add_done_callback(done)
+        self.wake()
+        return future
+
+    def run(self, awaitable: Awaitable[Any]) -> Any:
+        """Runs an awaitable to completion and returns its result, blocking the Qt event loop meanwhile.
+
+        Args:
+            awaitable (Awaitable[Any]): The coroutine or future to be run.
+
+        Returns:
+            The result of the awaitable.
+
+        Raises:
+            RuntimeError: If an asyncio loop is already running, the awaitable must be awaited instead. A coroutine is
+                closed then, it is never run.
+        """
+        if AsyncBridge.runningLoop() is not None:
+            # Close the coroutine, so it is not reported as never awaited
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise RuntimeError("Cannot block on a coroutine while an asyncio loop is running, await it instead")
+        try:
+            return self._privateLoop().run_until_complete(awaitable)
+        finally:
+            # The other coroutines may have callbacks ready or new timers now
+            self.wake()
+
+    def _privateLoop(self) -> _BridgeLoop:
+        """Returns the private asyncio loop, it is created on the first call.
+
+        Returns:
+            _BridgeLoop: The private asyncio loop.
+        """
+        if self._loop is None:
+            self._loop = _BridgeLoop(self)
+        return self._loop
+
+    def wake(self, delay: int = 0) -> None:
+        """Steps the private asyncio loop after a delay, unless it is already going to be stepped earlier.
+
+        This method is called by the private loop when a callback or a timer is scheduled, and by the socket notifiers
+        of its files when they are ready.
+
+        Args:
+            delay (int, optional): The delay in milliseconds. Defaults to 0, which steps the loop in the next
+                iteration of the Qt event loop.
+        """
+        delay = min(delay, AsyncBridge.maxDelay)
+        if not self._timer.isActive() or self._timer.remainingTime() > delay:
+            self._timer.start(delay)
+
+    @Slot()
+    def tick(self) -> None:
+        """Steps the private asyncio loop, which runs the callbacks which are ready without waiting for anything.
+
+        This slot is invoked by the timer of the bridge.
+        """
+        loop = self._loop
+        # The loop is already running, i.e. a coroutine is run to completion by run
+        if loop is None or loop.is_running():
+            return
+        loop.step()
@@ -0,0 +1,240 @@
+import collections
+import json
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pywebchannel.NDArray import NDArray
+
+
+class CachePolicy:
+    """A class to represent the caching policy of an action.
+
+    The responses of a cached action are kept per controller, keyed by the converted arguments of the calls, so the
+    calls with the same arguments are answered without running the action again. Only the successful responses are
+    kept.
+
+    The cache is bounded by both the number and the total size of the responses by default. The size of a response is
+    the length of its JSON text, which is measured when it is kept. With max_bytes=0, the size is neither limited nor
+    measured, and the cache is bounded by the number of responses only, however large they are.
+
+    Attributes:
+        ttl (float): The number of seconds a response is kept, or 0 to keep it until it is evicted or invalidated.
+        max_entries (int): The maximum number of responses kept, the least recently used ones are evicted first.
+        max_bytes (int): The maximum total size of the JSON text of the responses kept, or 0 for no limit.
+        invalidate_on (List[str]): The names of the signals and properties of the controller whose emissions and
+            changes drop all the responses kept.
+    """
+
+    defaultMaxBytes = 8 * 1024 * 1024
+    """ The default maximum total size of the responses kept in bytes. """
+
+    def __init__(
+            self,
+            ttl: float = 0,
+            max_entries: int = 128,
+            max_bytes: int = defaultMaxBytes,
+            invalidate_on: Optional[List[str] | str] = None,
+    ) -> None:
+        """
+        The constructor method for the CachePolicy class.
+
+        Args:
+            ttl (float, optional): The number of seconds a response is kept. Defaults to 0, which keeps it until it
+                is evicted or invalidated.
+            max_entries (int, optional): The maximum number of responses kept. Defaults to 128.
+            max_bytes (int, optional): The maximum total size of the JSON text of the responses kept. Defaults to
+                CachePolicy.defaultMaxBytes, 0 means no limit.
+            invalidate_on (List[str] | str, optional): The names of the signals and properties of the controller
+                which invalidate the responses. Defaults to None.
+
+        Raises:
+            ValueError: If the limits are negative or no entry can be kept.
+        """
+        if ttl < 0 or max_bytes < 0 or max_entries <= 0:
+            raise ValueError(f"Invalid cache policy ttl={ttl}, max_entries={max_entries}, max_bytes={max_bytes}")
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.invalidate_on = [invalidate_on] if isinstance(invalidate_on, str) else [*(invalidate_on or [])]
+
+
+class ActionCache:
+    """A class that keeps the responses of a cached action of a controller, with LRU eviction.
+
+    Attributes:
+        policy (CachePolicy): The caching policy of the action.
+        hits (int): The number of calls answered from the cache.
+        misses (int): The number of calls which ran the action.
+        evictions (int): The number of responses dropped to stay within the limits.
+        expirations (int): The number of responses dropped after their time to live.
+        invalidations (int): The number of responses dropped by invalidation.
+        bytes (int): The total size of the responses kept, it is measured only if the policy limits it, and is 0
+            otherwise.
+    """
+
+    def __init__(self, policy: CachePolicy) -> None:
+        """Initializes the ActionCache object with the given policy.
+
+        Args:
+            policy (CachePolicy): The caching policy of the action.
+        """
+        self.policy = policy
+        # The responses with their expiry times and sizes, from the least to the most recently used
+        self._entries: collections.OrderedDict[Hashable, Tuple[Dict[str, Any], float, int]] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.bytes = 0
+
+    @staticmethod
+    def key(args: tuple) -> Optional[Hashable]:
+        """Returns the cache key of the converted arguments of a call.
+
+        Args:
+            args (tuple): The arguments of the call, without the controller.
+
+        Returns:
+            Optional[Hashable]: The arguments as they are if they are hashable, otherwise their hashable equivalent,
+                see ActionCache.hashable, or None if some argument has no hashable equivalent, the call is not cached
+                then.
+        """
+        try:
+            hash(args)
+            return args
+        except TypeError:
+            pass
+        try:
+            return ActionCache.hashable(args)
+        except TypeError:
+            return None
+
+    @staticmethod
+    def hashable(value: Any) -> Hashable:
+        """Returns a hashable equivalent of a value, which is equal for the equal values of the same type.
+
+        The lists, tuples, sets and dictionaries are replaced by tuples and frozensets of the hashable equivalents of
+        their items, the pydantic models by the ones of their fields and the NumPy arrays by their dtypes, shapes and
+        raw bytes, all of them tagged with their types.
+
+        Args:
+            value: The value, i.e. an argument converted from web format.
+
+        Returns:
+            Hashable: The hashable equivalent of the value.
+
+        Raises:
+            TypeError: If the value, or an item of it, is not hashable and has no hashable equivalent.
+        """
+        if isinstance(value, (list, tuple)):
+            return type(value), tuple(ActionCache.hashable(item) for item in value)
+        if isinstance(value, dict):
+            return type(value), frozenset((key, ActionCache.hashable(item)) for key, item in value.items())
+        if isinstance(value, (set, frozenset)):
+            return type(value), frozenset(value)
+        if isinstance(value, BaseModel):
+            return type(value), ActionCache.hashable(dict(value))
+        if NDArray.is_array(value):
+            return type(value), value.dtype.str, value.shape, value.tobytes()
+        hash(value)
+        return value
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Returns the response kept for a key, and marks it as the most recently used one.
+
+        Args:
+            key (Hashable): The cache key of the call.
+
+        Returns:
+            Optional[Dict[str, Any]]: The response, or None if there is no response or it is expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] < time.monotonic():
+            self._drop(key)
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, response: Dict[str, Any]) -> None:
+        """Keeps the response of a call, the least recently used responses are evicted to stay within the limits.
+
+        Args:
+            key (Hashable): The cache key of the call.
+            response (Dict[str, Any]): The response of the call in web format.
+        """
+        # The failed calls are not kept, they may succeed next time
+        if response.get("error") is not None:
+            return
+
+        policy = self.policy
+        size = 0
+        if policy.max_bytes > 0:
+            size = len(json.dumps(response, separators=(",", ":"), default=str))
+            # A response larger than the whole budget is never kept
+            if size > policy.max_bytes:
+                return
+
+        if key in self._entries:
+            self._drop(key)
+        expiresAt = time.monotonic() + policy.ttl if policy.ttl > 0 else float("inf")
+        self._entries[key] = (response, expiresAt, size)
+        self.bytes += size
+
+        # Evict the least recently used responses
+        while len(self._entries) > policy.max_entries or (policy.max_bytes > 0 and self.bytes > policy.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops the response kept for a key, or all the responses.
+
+        Args:
+            key (Hashable, optional): The cache key of the call. Defaults to None, which drops all the responses.
+        """
+        if key is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+        elif key in self._entries:
+            self._drop(key)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the counters of the cache.
+
+        Returns:
+            Dict[str, Any]: The hit, miss, eviction, expiration and invalidation counts, the hit ratio, and the number
+                and size of the responses kept. The size is None if the policy does not limit it, it is not measured
+                then.
+        """
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hits / calls if calls > 0 else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self.bytes if self.policy.max_bytes > 0 else None,
+        }
+
+    def _drop(self, key: Hashable) -> None:
+        """Drops the response kept for a key.
+
+        Args:
+            key (Hashable): The cache key of the call.
+        """
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
@@ -3,6 +3,7 @@ from typing import List
 
 from PySide6.QtCore import QMetaObject, QMetaMethod
 
+from pywebchannel.Compact import CompactEncoding
 from pywebchannel.Utils import Utils
 
 
@@ -286,8 +287,13 @@ class ControllerInterface(Interface):
                             )
                         )
 
+            # Get the rate limiting policy of the signal, if any
+            signalRateLimits: dict = getattr(self.MetaClass, "signalRateLimits", {})
+            rateLimit = signalRateLimits.get(name)
+
             # Create a Signal object and append it to the list
-            signalInfos.append(Signal(name, parameters, returnType))
+            signalInfos.append(Signal(name, parameters, returnType,
+                                      rateLimit.describe() if rateLimit is not None else ""))
 
         return signalInfos
 
@@ -360,6 +366,7 @@ class ModelInterface(Interface):
 
     Attributes:
         props (list of Property): The properties of the model class.
+        compactFields (list of str): The field names of the model class in the order of its rows, if it is compact.
     """
 
     def __init__(self, MetaClass):
@@ -384,6 +391,9 @@ class ModelInterface(Interface):
             prop.convertType()
             prop.convertCode()
 
+        # Keep the order of the fields in the rows of a compact model
+        self.compactFields: list[str] = list(MetaClass.model_fields) if CompactEncoding.is_compact(MetaClass) else []
+
     def classType(self):
         """Returns the type of the interface, which is SupportedTypes.Model.
 
@@ -460,9 +470,9 @@ class Parameter:
         """Return a list of the dependencies of the parameter type.
 
         Returns:
-            list[str]: A list of the types that the parameter type depends on, without brackets.
+            list[str]: A list of the types that the parameter type depends on, without brackets and type arguments.
         """
-        return [self.type.replace("[]", "")]
+        return [Utils.dependencyOf(self.type)]
 
 
 class Return:
@@ -514,8 +524,8 @@ class Return:
         Returns:
             list: A list of the types that the return type depends on.
         """
-        # Return a list with the type attribute without the array notation
-        return [self.type.replace("[]", "")]
+        # Return a list with the type attribute without the array notation and the type arguments
+        return [Utils.dependencyOf(self.type)]
 
 
 class Slot:
@@ -670,13 +680,13 @@ class Property:
         Returns:
             list: A list of the types that the property depends on.
         """
-        # Return a list with the type attribute
-        return [self.type.replace("[]", "")]
+        # Return a list with the type attribute without the array notation and the type arguments
+        return [Utils.dependencyOf(self.type)]
 
 
 class Signal:
     def __init__(
-            self, name: str, parameters: list[Parameter], returnType: Return
+            self, name: str, parameters: list[Parameter], returnType: Return, rateLimit: str = ""
     ) -> None:
         """
         Initialize a Signal object.
@@ -685,11 +695,13 @@ class Signal:
             name (str): The name of the signal.
             parameters (list[Parameter]): List of Parameter objects that represent parameters of the signal function.
             returnType (Return): A Return object that represents the return type of the signal function.
+            rateLimit (str, optional): The description of the rate limiting policy of the signal, if any.
         """
-        # Assign the name, parameters and returnType attributes
+        # Assign the name, parameters, returnType and rateLimit attributes
         self.name = name
         self.parameters = parameters
         self.returnType = returnType
+        self.rateLimit = rateLimit
         # Initialize the code attribute as an empty string
         self.code = ""
 
@@ -745,6 +757,10 @@ class Signal:
             f"{self.name}: Signal<({paramCodesCombined}) => {self.returnType.code}>;"
         )
 
+        # Document the rate limiting policy of the signal, so the client knows the emissions are limited
+        if self.rateLimit != "":
+            self.code += f" // {self.rateLimit}"
+
     def dependencies(self):
         """
         Return the dependencies of the signal.
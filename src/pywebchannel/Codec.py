@@ -0,0 +1,337 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QByteArray, QJsonArray, QJsonDocument, QJsonParseError
+
+try:
+    import msgpack
+except ImportError:
+    # MessagePack support is optional, install with 'pip install pywebchannel[msgpack]'
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson support is optional, install with 'pip install pywebchannel[orjson]'
+    orjson = None
+
+
+class CodecError(Exception):
+    """An exception that is raised when a frame cannot be decoded into a QWebChannel message."""
+    pass
+
+
+class Codec(ABC):
+    """A base class for the wire formats used by the WebSocketTransport.
+
+    A codec converts the QWebChannel messages (JSON objects), or lists of them in batch mode, into WebSocket frames
+    and back. Text codecs produce str frames that are sent with sendTextMessage, binary codecs produce bytes-like
+    frames that are sent with sendBinaryMessage.
+
+    Attributes:
+        name (str): The name of the codec, which is used to select the codec in WebChannelService.start.
+        binary (bool): True if the codec produces binary frames, False if it produces text frames.
+        joinable (bool): True if the codec joins the frames of several messages into the frame of their list without
+            decoding them, so joining is cheaper than encoding the list again.
+    """
+
+    name = ""
+    binary = False
+    joinable = False
+
+    @abstractmethod
+    def encode(self, message: Dict[str, Any] | List[Dict[str, Any]]) -> Any:
+        """Encodes a QWebChannel message into a WebSocket frame.
+
+        Args:
+            message (Dict[str, Any] | List[Dict[str, Any]]): The message, or the list of messages, to be encoded.
+
+        Returns:
+            The encoded frame, a str for text codecs or a bytes-like object for binary codecs.
+        """
+
+    def join(self, frames: List[Any]) -> Any:
+        """Joins the frames of several encoded messages into the frame of the list of the messages.
+
+        The batches reuse the frames of the messages which are shared with the other clients this way, instead of
+        encoding the whole list again. The joinable codecs override it to join the frames as they are, by default the
+        frames are decoded and their list is encoded.
+
+        Args:
+            frames (List[Any]): The frames of the messages, as returned by encode.
+
+        Returns:
+            The frame of the list of the messages, the same as encode returns for the list.
+        """
+        return self.encode([self.decode(frame) for frame in frames])
+
+    @abstractmethod
+    def decode(self, data: Any) -> Dict[str, Any]:
+        """Decodes a WebSocket frame into a QWebChannel message.
+
+        Args:
+            data: The received frame, a str for text frames or a QByteArray for binary frames.
+
+        Returns:
+            Dict[str, Any]: The decoded message.
+
+        Raises:
+            CodecError: If the frame cannot be decoded or the decoded value is not a JSON object.
+        """
+
+    @staticmethod
+    def create(codec: Optional["Codec | str"] = None) -> "Codec":
+        """Returns a codec object for the given codec name or object.
+
+        Args:
+            codec (Codec | str, optional): A codec object or one of the registered codec names. Defaults to None,
+                which selects the JSON codec.
+
+        Returns:
+            Codec: The codec object.
+
+        Raises:
+            ValueError: If the codec name is unknown.
+        """
+        # Return the default codec if nothing is given
+        if codec is None:
+            return JsonCodec()
+        # Return the codec as it is if it is already a codec object
+        if isinstance(codec, Codec):
+            return codec
+        # Look up the codec class by its name
+        for codecType in (JsonCodec, FastJsonCodec, MsgPackCodec):
+            if codecType.name == codec:
+                return codecType()
+
+        raise ValueError(f"Unknown codec '{codec}'")
+
+
+class JsonCodec(Codec):
+    """A text codec that encodes messages as compact JSON, which is the default wire format of QWebChannel."""
+
+    name = "json"
+    binary = False
+    joinable = True
+
+    def encode(self, message: Dict[str, Any] | List[Dict[str, Any]]) -> str:
+        """Encodes a message as a compact JSON string.
+
+        Args:
+            message (Dict[str, Any] | List[Dict[str, Any]]): The message, or the list of messages, to be encoded.
+
+        Returns:
+            str: The JSON string of the message.
+        """
+        # Convert the message, or the list of messages, to a QJsonDocument
+        doc = QJsonDocument(QJsonArray.fromVariantList(message) if isinstance(message, list) else message)
+        # Return the compact JSON string of the document
+        return doc.toJson(QJsonDocument.JsonFormat.Compact).toStdString()
+
+    def join(self, frames: List[str]) -> str:
+        """Joins the JSON strings of several messages into the JSON array of the messages.
+
+        Args:
+            frames (List[str]): The JSON strings of the messages.
+
+        Returns:
+            str: The JSON string of the list of the messages.
+        """
+        return "[" + ",".join(frames) + "]"
+
+    def decode(self, data: Any) -> Dict[str, Any]:
+        """Decodes a JSON text or binary frame into a message.
+
+        Args:
+            data (str | QByteArray): The JSON frame.
+
+        Returns:
+            Dict[str, Any]: The decoded message.
+
+        Raises:
+            CodecError: If the frame is not valid JSON or is not a JSON object.
+        """
+        # Convert text frames to a QByteArray
+        if isinstance(data, str):
+            data = QByteArray.fromStdString(data)
+        # Create a QJsonParseError object
+        error = QJsonParseError()
+        # Parse the frame as a QJsonDocument
+        messageDoc = QJsonDocument.fromJson(data, error)
+        # Check if there is any error in parsing
+        if error.error != QJsonParseError.ParseError.NoError:
+            raise CodecError(f"Failed to parse message as JSON object: {error.errorString()}")
+        # Check if the document is not a JSON object
+        if not messageDoc.isObject():
+            raise CodecError("Received JSON message that is not an object")
+        # Return the JSON object
+        return messageDoc.object()
+
+
+class FastJsonCodec(JsonCodec):
+    """A JSON codec that serializes messages in Python instead of going through QJsonDocument.
+
+    The JSON codec converts every message into a QJsonDocument, a QByteArray and a str, which copies the payload
+    several times. This codec parses and serializes the messages directly with orjson, if it is installed, or with
+    the standard json module otherwise.
+
+    With orjson the messages are sent as binary frames holding the UTF-8 JSON bytes, so no intermediate Python str is
+    created. With the standard json module the serialized str is sent as a text frame as it is.
+
+    Attributes:
+        backend (str): The name of the JSON backend, either "orjson" or "json".
+    """
+
+    name = "fastjson"
+
+    def __init__(self, backend: Optional[str] = None) -> None:
+        """Initializes the FastJsonCodec object with the given backend.
+
+        Args:
+            backend (str, optional): The JSON backend, either "orjson" or "json". Defaults to None, which selects
+                "orjson" if it is installed and "json" otherwise.
+
+        Raises:
+            ImportError: If the "orjson" backend is requested but the 'orjson' package is not installed.
+            ValueError: If the backend name is unknown.
+        """
+        # Select the best available backend if nothing is given
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        # Check the backend
+        if backend == "orjson" and orjson is None:
+            raise ImportError(
+                "orjson backend requires the 'orjson' package, install it with 'pip install pywebchannel[orjson]'"
+            )
+        if backend not in ("orjson", "json"):
+            raise ValueError(f"Unknown JSON backend '{backend}'")
+
+        self.backend = backend
+        # orjson produces bytes, which are sent as binary frames without decoding them into a str
+        self.binary = backend == "orjson"
+
+    def encode(self, message: Dict[str, Any] | List[Dict[str, Any]]) -> Any:
+        """Encodes a message as compact JSON.
+
+        Args:
+            message (Dict[str, Any] | List[Dict[str, Any]]): The message, or the list of messages, to be encoded.
+
+        Returns:
+            bytes | str: The UTF-8 JSON bytes with the orjson backend, the JSON string with the json backend.
+        """
+        if self.backend == "orjson":
+            return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+        return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+    def join(self, frames: List[Any]) -> Any:
+        """Joins the JSON frames of several messages into the JSON array of the messages.
+
+        Args:
+            frames (List[bytes | str]): The JSON frames of the messages.
+
+        Returns:
+            bytes | str: The JSON frame of the list of the messages.
+        """
+        if self.backend == "orjson":
+            return b"[" + b",".join(frames) + b"]"
+
+        return super().join(frames)
+
+    def decode(self, data: Any) -> Dict[str, Any]:
+        """Decodes a JSON text or binary frame into a message.
+
+        Args:
+            data (str | QByteArray | bytes): The JSON frame.
+
+        Returns:
+            Dict[str, Any]: The decoded message.
+
+        Raises:
+            CodecError: If the frame is not valid JSON or is not a JSON object.
+        """
+        # Read binary frames through the buffer protocol of QByteArray
+        if isinstance(data, QByteArray):
+            data = memoryview(data)
+        try:
+            if self.backend == "orjson":
+                message = orjson.loads(data)
+            else:
+                message = json.loads(data if isinstance(data, str) else bytes(data))
+        except ValueError as e:
+            raise CodecError(f"Failed to parse message as JSON object: {e}")
+        # Check if the message is not a JSON object
+        if not isinstance(message, dict):
+            raise CodecError("Received JSON message that is not an object")
+        # Return the message
+        return message
+
+
+class MsgPackCodec(Codec):
+    """A binary codec that encodes messages with MessagePack.
+
+    MessagePack keeps numbers in their binary form, so numeric-heavy messages are smaller and cheaper to produce and
+    parse than their JSON text. It requires the optional 'msgpack' package.
+    """
+
+    name = "msgpack"
+    binary = True
+    joinable = True
+
+    def __init__(self) -> None:
+        """Initializes the MsgPackCodec object.
+
+        Raises:
+            ImportError: If the 'msgpack' package is not installed.
+        """
+        if msgpack is None:
+            raise ImportError(
+                "MessagePack codec requires the 'msgpack' package, install it with 'pip install pywebchannel[msgpack]'"
+            )
+
+    def encode(self, message: Dict[str, Any] | List[Dict[str, Any]]) -> bytes:
+        """Encodes a message with MessagePack.
+
+        Args:
+            message (Dict[str, Any] | List[Dict[str, Any]]): The message, or the list of messages, to be encoded.
+
+        Returns:
+            bytes: The MessagePack frame of the message.
+        """
+        return msgpack.packb(message, use_bin_type=True)
+
+    def join(self, frames: List[bytes]) -> bytes:
+        """Joins the MessagePack frames of several messages into the MessagePack array of the messages.
+
+        Args:
+            frames (List[bytes]): The MessagePack frames of the messages.
+
+        Returns:
+            bytes: The MessagePack frame of the list of the messages.
+        """
+        # An array is its header followed by its packed items
+        return msgpack.Packer().pack_array_header(len(frames)) + b"".join(frames)
+
+    def decode(self, data: Any) -> Dict[str, Any]:
+        """Decodes a MessagePack frame into a message.
+
+        Args:
+            data (QByteArray | bytes): The MessagePack frame.
+
+        Returns:
+            Dict[str, Any]: The decoded message.
+
+        Raises:
+            CodecError: If the frame is not valid MessagePack or is not a map.
+        """
+        try:
+            message = msgpack.unpackb(data.data() if isinstance(data, QByteArray) else data,
+                                      raw=False, strict_map_key=False)
+        except Exception as e:
+            raise CodecError(f"Failed to parse message as MessagePack map: {e!r}")
+        # Check if the message is not a map
+        if not isinstance(message, dict):
+            raise CodecError("Received MessagePack message that is not a map")
+        # Return the message
+        return message
@@ -0,0 +1,235 @@
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PySide6 import QtCore
+from PySide6.QtCore import QObject
+from pydantic import BaseModel
+
+
+class CompactEncoding:
+    """A class that converts the compact pydantic models to and from their positional web format.
+
+    The field names of a compact model are sent once per client, in the init message, so the models themselves are
+    sent without their keys:
+        - A model is sent as a row, i.e. {"__compact__": "Todo", "row": ["1", "todo1", False, False]}.
+        - A list of models of the same compact class is sent as a table of columns, which starts with a header, i.e.
+          [{"__compact__": "Todo", "length": 2}, ["1", "2"], ["todo1", "todo2"], [False, True], [False, False]].
+
+    Attributes:
+        models (Dict[str, type]): The compact models, mapped by their names.
+    """
+
+    models: Dict[str, type] = {}
+
+    _fields: Dict[type, Tuple[str, ...]] = {}
+    """ The field names of the compact models, mapped by the model classes. """
+
+    _hasCompact: Dict[Any, bool] = {}
+    """ The cache of has_compact, mapped by the types. """
+
+    _primitives = (int, float, str, bool, type(None))
+    """ The types which are sent as they are. """
+
+    @staticmethod
+    def register(model: type) -> None:
+        """Registers a pydantic model class as compact.
+
+        Args:
+            model (type): The pydantic model class.
+
+        Raises:
+            Exception: If another compact model is registered with the same name.
+        """
+        name = model.__name__
+        if name in CompactEncoding.models and CompactEncoding.models[name] is not model:
+            raise Exception(f"Another compact model is already registered with the name '{name}'")
+
+        CompactEncoding.models[name] = model
+        CompactEncoding._fields[model] = tuple(model.model_fields)
+        CompactEncoding._hasCompact.clear()
+
+    @staticmethod
+    def schema() -> Dict[str, List[str]]:
+        """Returns the field names of the compact models, mapped by the model names.
+
+        Returns:
+            Dict[str, List[str]]: The schema of the compact models.
+        """
+        return {name: list(CompactEncoding._fields[model]) for name, model in CompactEncoding.models.items()}
+
+    @staticmethod
+    def is_compact(var_type: Any) -> bool:
+        """Returns whether the given type is a compact model class.
+
+        Args:
+            var_type: The type to be checked.
+
+        Returns:
+            bool: True if the type is a compact model class, False otherwise.
+        """
+        return var_type in CompactEncoding._fields
+
+    @staticmethod
+    def has_compact(var_type: Any) -> bool:
+        """Returns whether the given type is or contains a compact model class, i.e. list[Todo] or a model which has a
+        field of a compact model class.
+
+        Args:
+            var_type: The type to be checked.
+
+        Returns:
+            bool: True if the type holds compact models, False otherwise.
+        """
+        if len(CompactEncoding._fields) == 0:
+            return False
+
+        cached = CompactEncoding._hasCompact.get(var_type)
+        if cached is not None:
+            return cached
+
+        # Recursive models are assumed to hold no compact models while they are being checked
+        CompactEncoding._hasCompact[var_type] = False
+        if CompactEncoding.is_compact(var_type):
+            result = True
+        elif isinstance(var_type, type) and issubclass(var_type, BaseModel):
+            result = any(CompactEncoding.has_compact(f.annotation) for f in var_type.model_fields.values())
+        else:
+            result = any(CompactEncoding.has_compact(t) for t in typing.get_args(var_type))
+        CompactEncoding._hasCompact[var_type] = result
+        return result
+
+    @staticmethod
+    def is_table(value: Any) -> bool:
+        """Returns whether the given value is a non-empty list of models of the same compact class.
+
+        Args:
+            value: The value to be checked.
+
+        Returns:
+            bool: True if the value is sent as a table, False otherwise.
+        """
+        if not isinstance(value, (list, tuple)) or len(value) == 0:
+            return False
+        model = type(value[0])
+        return model in CompactEncoding._fields and all(type(item) is model for item in value)
+
+    @staticmethod
+    def dump(value: Any, leaf: Callable[[Any], Any]) -> Any:
+        """Converts a Python format value to web format, the compact models are converted to rows and tables.
+
+        Args:
+            value: The value to be converted.
+            leaf (Callable[[Any], Any]): The conversion of the values which hold no compact models.
+
+        Returns:
+            The value in web format.
+        """
+        valueType = type(value)
+        if valueType in CompactEncoding._primitives:
+            return value
+
+        if isinstance(value, BaseModel):
+            fields = CompactEncoding._fields.get(valueType)
+            # Compact models are converted to rows
+            if fields is not None:
+                return {
+                    "__compact__": valueType.__name__,
+                    "row": [CompactEncoding.dump(getattr(value, name), leaf) for name in fields],
+                }
+            # The other models are converted to dictionaries, with their compact fields converted to rows and tables
+            if CompactEncoding.has_compact(valueType):
+                return {name: CompactEncoding.dump(getattr(value, name), leaf) for name in valueType.model_fields}
+            return leaf(value)
+
+        if isinstance(value, (list, tuple)):
+            # Lists of compact models are converted to tables
+            if CompactEncoding.is_table(value):
+                model = type(value[0])
+                header = {"__compact__": model.__name__, "length": len(value)}
+                return [header, *(
+                    [CompactEncoding.dump(getattr(item, name), leaf) for item in value]
+                    for name in CompactEncoding._fields[model]
+                )]
+            return [CompactEncoding.dump(item, leaf) for item in value]
+
+        if isinstance(value, dict):
+            return {key: CompactEncoding.dump(item, leaf) for key, item in value.items()}
+
+        return leaf(value)
+
+    @staticmethod
+    def load(arg: Any) -> Any:
+        """Converts the rows and tables of a web format argument to dictionaries and lists of dictionaries.
+
+        Args:
+            arg: The argument in web format.
+
+        Returns:
+            The argument with the compact models as dictionaries, so they can be validated by pydantic.
+        """
+        if isinstance(arg, dict):
+            fields = CompactEncoding._fieldsOf(arg)
+            if fields is not None and "row" in arg:
+                return {name: CompactEncoding.load(item) for name, item in zip(fields, arg["row"])}
+            return {key: CompactEncoding.load(item) for key, item in arg.items()}
+
+        if isinstance(arg, list):
+            fields = CompactEncoding._fieldsOf(arg[0]) if len(arg) > 0 and isinstance(arg[0], dict) else None
+            if fields is not None and "length" in arg[0]:
+                columns = [[CompactEncoding.load(item) for item in column] for column in arg[1:]]
+                return [dict(zip(fields, row)) for row in zip(*columns)]
+            return [CompactEncoding.load(item) for item in arg]
+
+        return arg
+
+    @staticmethod
+    def _fieldsOf(marker: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        """Returns the field names of the compact model named by a row or a table header.
+
+        Args:
+            marker (Dict[str, Any]): The dictionary to be checked.
+
+        Returns:
+            Optional[Tuple[str, ...]]: The field names, or None if the dictionary is not a row or a table header.
+        """
+        model = CompactEncoding.models.get(marker.get("__compact__"))
+        return CompactEncoding._fields[model] if model is not None else None
+
+
+def Compact(model: type) -> type:
+    """A decorator that marks a pydantic model class as compact, so its instances are sent without their keys.
+
+    Args:
+        model (type): The pydantic model class.
+
+    Returns:
+        type: The same model class.
+    """
+    CompactEncoding.register(model)
+    return model
+
+
+class CompactSchema(QObject):
+    """A class that publishes the field names of the compact models to the clients.
+
+    It is registered to the web channel along with the first controller, if there are compact models. Its constant
+    property is sent in the init message, and the clients decode the rows and tables with it.
+    """
+
+    channelName = "__compact__"
+    """ The name of the object in the web channel. """
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initializes the CompactSchema object with the given parent.
+
+        Args:
+            parent (Optional[QObject], optional): The parent object for the CompactSchema. Defaults to None.
+        """
+        super().__init__(parent)
+
+    def getModels(self) -> Dict[str, List[str]]:
+        return CompactEncoding.schema()
+
+    # noinspection PyTypeChecker
+    models = QtCore.Property("QVariantMap", fget=getModels, constant=True)
+    """ The field names of the compact models, mapped by the model names. """
@@ -1,11 +1,27 @@
 import functools
 import inspect
-from typing import Optional, Dict, Any, List, Tuple
+import math
+import secrets
+import threading
+import time
+import types
+import typing
+from concurrent.futures import Executor
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
 from PySide6 import QtCore
-from PySide6.QtCore import QObject, Slot
-from pydantic import BaseModel
-
+from PySide6.QtCore import QObject, QTimer, Slot
+from pydantic import BaseModel, TypeAdapter
+
+from pywebchannel.AsyncBridge import AsyncBridge
+from pywebchannel.Cache import ActionCache, CachePolicy
+from pywebchannel.Compact import CompactEncoding
+from pywebchannel.ExecutorBridge import ExecutorBridge
+from pywebchannel.JsonPatch import JsonPatch
+from pywebchannel.Metrics import ActionMetrics, Metrics
+from pywebchannel.NDArray import NDArray
+from pywebchannel.Scheduler import NotifyScheduler
+from pywebchannel.Tracing import Span, Tracer
 from pywebchannel.Utils import Logger
 
 
@@ -26,9 +42,39 @@ class Controller(QObject):
         super().__init__(parent)
         self._controllerName = controllerName
 
+        # Replace the rate limited signals of the instance with their rate limiting wrappers
+        # noinspection PyUnresolvedReferences
+        for signalName, rateLimit in self.signalRateLimits.items():
+            setattr(self, signalName, RateLimitedSignal(getattr(self, signalName), rateLimit, self))
+
+        # Create the response caches of the cached actions, which are dropped by the signals of their policies
+        self._actionCaches: Dict[str, ActionCache] = dict()
+        # noinspection PyUnresolvedReferences
+        for actionName, policy in self.cachePolicies.items():
+            cache = ActionCache(policy)
+            self._actionCaches[actionName] = cache
+            for name in policy.invalidate_on:
+                for signal in self._invalidationSignals(actionName, name):
+                    signal.connect(lambda *_, c=cache: c.invalidate())
+
+        # The versions of the state of the controller, the identifier of the object makes the versions known by the
+        # clients before a restart of the backend stale
+        self._versionEpoch = secrets.token_hex(4)
+        # The number of changes of the state, and the number of changes of each part of it, mapped by the names of
+        # the parts, "" for the changes of the whole state
+        self._changeCount = 0
+        self._versions: Dict[str, int] = dict()
+
     __signalArgsMap__: Dict[str, Dict[str, type]] = dict()
+    __signalRateLimits__: Dict[str, "RateLimit"] = dict()
     __propsTypes__: Dict[str, type | Tuple[type, QtCore.Signal]] = dict()
-    __actionNotifications__: Dict[str, Dict[str, type]] = dict()
+    __actionNotifications__: Dict[str, "Notify"] = dict()
+    __actionCaches__: Dict[str, CachePolicy] = dict()
+    __actionVersions__: Dict[str, str] = dict()
+
+    signalRateLimits: Dict[str, "RateLimit"] = dict()
+    cachePolicies: Dict[str, CachePolicy] = dict()
+    versionScopes: Dict[str, str] = dict()
 
     def __init_subclass__(cls, **kwargs):
         """A special method that is called when a subclass of Controller is created.
@@ -58,16 +104,25 @@ class Controller(QObject):
             setattr(cls, cls_attr_name, result)
 
         # Generate notifier signals
-        for name, signalArgs in [*cls.__actionNotifications__.items()]:
+        for name, notify in [*cls.__actionNotifications__.items()]:
             if name.__contains__(cls.__name__):
                 signalName = name.split(".")[1]
-                signal = Signal(signalArgs, cls.__name__, signalName)
+                signal = Signal(notify.arguments, cls.__name__, signalName, **notify.rateLimit.options())
                 setattr(cls, signalName, signal)
                 del cls.__actionNotifications__[name]
 
         # Move signal arguments from base class into the concrete class
         move_from_base_to_cls("__signalArgsMap__", "signalArgsMap")
 
+        # Move signal rate limits from base class into the concrete class
+        move_from_base_to_cls("__signalRateLimits__", "signalRateLimits")
+
+        # Move action caching policies from base class into the concrete class
+        move_from_base_to_cls("__actionCaches__", "cachePolicies")
+
+        # Move the state parts of versioned actions from base class into the concrete class
+        move_from_base_to_cls("__actionVersions__", "versionScopes")
+
         # Move prop types from base class into the concrete class
         move_from_base_to_cls("__propsTypes__", "propsTypes")
 
@@ -89,6 +144,106 @@ class Controller(QObject):
         """
         return self._controllerName
 
+    def invalidateCache(self, actionName: Optional[str] = None, *args) -> None:
+        """Drops the responses kept for a cached action, i.e. when the data it reads is changed.
+
+        Args:
+            actionName (str, optional): The name of the action. Defaults to None, which drops the responses of all
+                the cached actions.
+            *args: The arguments of the call whose response is dropped, as the action receives them. Without
+                arguments, all the responses of the action are dropped.
+
+        Raises:
+            Exception: If the action is not cached.
+        """
+        if actionName is None:
+            for cache in self._actionCaches.values():
+                cache.invalidate()
+            return
+
+        cache = self._actionCaches.get(actionName)
+        if cache is None:
+            raise Exception(f"Action '{actionName}' of {self._controllerName} is not cached")
+        if len(args) == 0:
+            cache.invalidate()
+            return
+        key = ActionCache.key(args)
+        if key is not None:
+            cache.invalidate(key)
+
+    def cacheStats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the counters of the caches of the cached actions.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The counters of each cache, see ActionCache.stats, mapped by the action names.
+        """
+        return {actionName: cache.stats() for actionName, cache in self._actionCaches.items()}
+
+    def version(self, scope: str = "") -> str:
+        """Returns the current version of the state of the controller, or of a part of it.
+
+        The versions are opaque ETag strings, which change whenever the state is marked as changed by bumpVersion.
+
+        Args:
+            scope (str, optional): The name of the part of the state. Defaults to "", which is the whole state.
+
+        Returns:
+            str: The version of the state.
+        """
+        # The whole state changes along with any of its parts
+        if scope == "":
+            return f"{self._versionEpoch}.{self._changeCount}"
+        # A part of the state changes along with the whole state too, but not along with the other parts
+        return f"{self._versionEpoch}.{self._versions.get('', 0)}.{self._versions.get(scope, 0)}"
+
+    def bumpVersion(self, scope: str = "") -> str:
+        """Marks the state of the controller, or a part of it, as changed.
+
+        The versioned actions reading the state reply with their data again, instead of a not modified response, to
+        the clients which know an older version, and their cached responses are dropped. It must be called by every
+        change of the state they read.
+
+        Args:
+            scope (str, optional): The name of the changed part of the state. Defaults to "", which marks the whole
+                state, and so all of its parts, as changed.
+
+        Returns:
+            str: The new version of the state.
+        """
+        self._changeCount += 1
+        self._versions[scope] = self._versions.get(scope, 0) + 1
+
+        # The cached responses of the versioned actions reading the changed state are stale
+        # noinspection PyUnresolvedReferences
+        for actionName, actionScope in self.versionScopes.items():
+            if actionName in self._actionCaches and (scope == "" or actionScope in ("", scope)):
+                self._actionCaches[actionName].invalidate()
+
+        return self.version(scope)
+
+    def _invalidationSignals(self, actionName: str, name: str) -> List[Any]:
+        """Returns the signals which invalidate the cache of an action for a name given in its policy.
+
+        Args:
+            actionName (str): The name of the cached action.
+            name (str): The name of a signal, or the name of a property whose changed and patched signals are used.
+
+        Returns:
+            List[Any]: The signal instances.
+
+        Raises:
+            Exception: If the controller has no such signal or property.
+        """
+        # noinspection PyUnresolvedReferences
+        names = [f"{name}Changed", f"{name}Patched"] if name in self.propsTypes else [name]
+        signals = [getattr(self, signalName) for signalName in names if hasattr(self, signalName)]
+        if len(signals) == 0:
+            raise Exception(
+                f"Unknown signal or property '{name}' to invalidate the cache of action '{actionName}' of "
+                f"{self._controllerName}"
+            )
+        return signals
+
     def cleanup(self) -> None:
         """Performs any necessary cleanup actions before the controller is destroyed.
 
@@ -113,6 +268,46 @@ class Response(BaseModel):
     """Any Python object that stores the result of the operation. It can be of any type, such as a dict, a list, 
     a tuple, a string, a number, etc. Pydantic will not perform any validation or conversion on this field."""
 
+    version: Optional[str] = None
+    """A string that identifies the version of the state the data is read from, for the versioned actions. The
+    client sends it back with its next call, and gets a not modified response while the state is not changed."""
+
+    notModified: Optional[bool] = None
+    """True if the state is not changed since the version sent by the client, the data is not sent then and the 
+    client reuses the data it received with that version."""
+
+    @staticmethod
+    def envelope(
+            success: Optional[str] = None,
+            error: Optional[str] = None,
+            data: Any = None,
+            version: Optional[str] = None,
+            notModified: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Returns the dictionary of a response without creating a Response object.
+
+        It is equal to Response(success=success, error=error, data=data).model_dump() for the data in web format. The
+        version and notModified keys are added only if they are given, so the other responses stay as small as they
+        are.
+
+        Args:
+            success (str, optional): The success string. Defaults to None.
+            error (str, optional): The error message. Defaults to None.
+            data (Any, optional): The result data in web format. Defaults to None.
+            version (str, optional): The version of the state the data is read from. Defaults to None.
+            notModified (bool, optional): Whether the state is not changed since the version known by the client.
+                Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The dictionary of the response.
+        """
+        response = {"success": success, "error": error, "data": data}
+        if version is not None:
+            response["version"] = version
+        if notModified:
+            response["notModified"] = True
+        return response
+
 
 class Helper:
     @staticmethod
@@ -161,6 +356,18 @@ class Type:
 
         is_pydantic(var_type: type) -> bool:
             Returns True if the given type is a subclass of pydantic.BaseModel, False otherwise.
+
+        is_optional(var_type: type) -> bool:
+            Returns True if the given type is a union, i.e. Optional[int] or int | None, False otherwise.
+
+        has_pydantic(var_type: type) -> bool:
+            Returns True if the given type is or contains a subclass of pydantic.BaseModel, i.e. list[Model].
+
+        is_ndarray(var_type: type) -> bool:
+            Returns True if the given type is a NumPy array type, i.e. numpy.typing.NDArray[numpy.float64].
+
+        has_ndarray(var_type: type) -> bool:
+            Returns True if the given type is or contains a NumPy array type, i.e. list[numpy.ndarray].
     """
 
     primitives = (bool, str, int, float, type(None))
@@ -174,11 +381,27 @@ class Type:
 
     @staticmethod
     def is_list(var_type: type):
-        return var_type.__name__.lower() == "list"
+        return getattr(var_type, "__name__", "").lower() == "list"
 
     @staticmethod
     def is_pydantic(var_type: type):
-        return issubclass(var_type, BaseModel)
+        return isinstance(var_type, type) and issubclass(var_type, BaseModel)
+
+    @staticmethod
+    def is_optional(var_type: type):
+        return typing.get_origin(var_type) in (typing.Union, types.UnionType)
+
+    @staticmethod
+    def has_pydantic(var_type: type):
+        return Type.is_pydantic(var_type) or any(Type.has_pydantic(t) for t in typing.get_args(var_type))
+
+    @staticmethod
+    def is_ndarray(var_type: type):
+        return NDArray.is_ndarray(var_type)
+
+    @staticmethod
+    def has_ndarray(var_type: type):
+        return Type.is_ndarray(var_type) or any(Type.has_ndarray(t) for t in typing.get_args(var_type))
 
 
 class Convert:
@@ -192,6 +415,8 @@ class Convert:
             - Primitive types are kept as they are.
             - List types are converted to list type.
             - Pydantic types are converted to dict type.
+            - NumPy array types are converted to QVariant type, which accepts both their descriptors and nested lists.
+            - Optional and union types are converted to QVariant type, which also accepts null.
             - Other types are converted to dict type.
 
         Returns:
@@ -210,11 +435,151 @@ class Convert:
                 arg_types.append(list)
             elif Type.is_pydantic(arg_type):
                 arg_types.append(dict)
+            elif Type.is_optional(arg_type) or Type.is_ndarray(arg_type):
+                arg_types.append("QVariant")
             else:
                 arg_types.append(dict)
 
         return arg_names, arg_types
 
+    @staticmethod
+    def plan_from_web_to_py(paramType) -> Optional[Callable[[Any], Any]]:
+        """Compiles the conversion of a web format argument to a Python format argument for the given parameter type.
+
+        The type is inspected once, and the returned function converts the arguments without any type introspection.
+            - Primitive types and unknown types need no conversion.
+            - List and dict types convert their items, if the items need conversion.
+            - Optional types convert the value unless it is null.
+            - Pydantic types are instantiated using the argument as a keyword dictionary.
+            - Compact pydantic types are received as rows and lists of them as tables, see CompactEncoding.
+            - NumPy array types are decoded from their descriptors.
+
+        Returns:
+            Optional[Callable[[Any], Any]] - the conversion function, or None if the arguments are used as they are.
+        """
+        origin = typing.get_origin(paramType)
+        typeArgs = typing.get_args(paramType)
+
+        # Compact models are received as rows and tables, which are loaded as dictionaries
+        if Type.is_pydantic(paramType) and CompactEncoding.has_compact(paramType):
+            return lambda arg: paramType(**CompactEncoding.load(arg))
+        if origin is list and len(typeArgs) == 1 and CompactEncoding.is_compact(typeArgs[0]):
+            itemType = typeArgs[0]
+            return lambda arg: [itemType(**item) for item in CompactEncoding.load(arg)]
+
+        # Pydantic models are instantiated from the dictionaries
+        if Type.is_pydantic(paramType):
+            return lambda arg: paramType(**arg)
+
+        # NumPy arrays are decoded from the descriptors
+        if Type.is_ndarray(paramType):
+            dtype = NDArray.dtype_of(paramType)
+            return lambda arg: NDArray.decode(arg, dtype)
+
+        # List items are converted one by one
+        if origin is list and len(typeArgs) == 1:
+            convertItem = Convert.plan_from_web_to_py(typeArgs[0])
+            if convertItem is None:
+                return None
+            return lambda arg: [convertItem(item) for item in arg]
+
+        # Dictionary values are converted one by one
+        if origin is dict and len(typeArgs) == 2:
+            convertValue = Convert.plan_from_web_to_py(typeArgs[1])
+            if convertValue is None:
+                return None
+            return lambda arg: {key: convertValue(value) for key, value in arg.items()}
+
+        # Optional values are converted unless they are null, the other unions are ambiguous and kept as they are
+        if Type.is_optional(paramType):
+            valueTypes = [t for t in typeArgs if t is not type(None)]
+            convertValue = Convert.plan_from_web_to_py(valueTypes[0]) if len(valueTypes) == 1 else None
+            if convertValue is None:
+                return None
+            return lambda arg: None if arg is None else convertValue(arg)
+
+        return None
+
+    @staticmethod
+    def plan_from_py_to_web(resultType) -> Optional[Callable[[Any], Any]]:
+        """Compiles the conversion of a Python format result to a web format result for the given result type.
+
+        Types which hold pydantic models, at any depth, are dumped by the cached TypeAdapter of the type, which
+        converts the whole nested structure in one compiled call. NumPy arrays are encoded as descriptors, and compact
+        models are converted to rows and tables.
+
+        Returns:
+            Optional[Callable[[Any], Any]] - the conversion function, or None if the results are used as they are.
+        """
+        # NumPy arrays are encoded directly, the structures holding them are converted by their runtime types
+        if Type.is_ndarray(resultType):
+            return NDArray.encode
+        if Type.has_ndarray(resultType):
+            return Convert.dump
+
+        # Compact models are converted to rows and tables
+        if CompactEncoding.has_compact(resultType):
+            return Convert.dump
+
+        if not Type.has_pydantic(resultType):
+            return None
+
+        adapter = Convert.adapter(resultType)
+        return lambda result: adapter.dump_python(result, warnings=False)
+
+    @staticmethod
+    def adapter(valueType) -> TypeAdapter:
+        """Returns the TypeAdapter of the given type, it is created once per type and cached.
+
+        Returns:
+            TypeAdapter - the TypeAdapter of the type.
+        """
+        adapter = Convert._adapters.get(valueType)
+        if adapter is None:
+            adapter = Convert._adapters[valueType] = TypeAdapter(valueType)
+        return adapter
+
+    _adapters: Dict[Any, TypeAdapter] = dict()
+    """ The cache of the TypeAdapters, mapped by their types. """
+
+    @staticmethod
+    def dump(value) -> Any:
+        """Converts a Python format value of any type to web format in one compiled call.
+
+        Unlike from_py_to_web, the value is not modified, and the pydantic models are converted at any depth, i.e.
+        inside dictionaries too. NumPy arrays are encoded as descriptors and NumPy scalars as Python numbers. If there
+        are compact models, they are converted to rows and tables.
+
+        Returns:
+            Any - the value in web format.
+        """
+        if len(CompactEncoding.models) > 0:
+            return CompactEncoding.dump(value, Convert._dumpAny)
+        return Convert._dumpAny(value)
+
+    @staticmethod
+    def _dumpAny(value) -> Any:
+        """Converts a Python format value of any type to web format by the TypeAdapter of Any, see dump.
+
+        Returns:
+            Any - the value in web format.
+        """
+        return Convert.adapter(Any).dump_python(value, warnings=False, fallback=Convert._dumpFallback)
+
+    @staticmethod
+    def _dumpFallback(value) -> Any:
+        """Converts the values which pydantic does not know to web format, it is called by Convert.dump.
+
+        Returns:
+            Any - the value in web format.
+        """
+        if NDArray.is_array(value):
+            return NDArray.encode(value)
+        # NumPy scalars, i.e. numpy.int64, are converted to the Python numbers
+        if hasattr(value, "item") and hasattr(value, "dtype"):
+            return value.item()
+        return value
+
     @staticmethod
     def from_web_to_py(arg, paramType) -> Any:
         """Converts a web format argument to a Python format argument according to the given parameter type.
@@ -223,6 +588,7 @@ class Convert:
             - Primitive types are kept as they are.
             - List types are recursively converted using the inner type.
             - Pydantic types are instantiated using the argument as a keyword dictionary.
+            - NumPy array types are decoded from their descriptors.
             - Other types are kept as they are.
         """
         if Type.is_primitive(paramType):
@@ -234,6 +600,8 @@ class Convert:
             return arg
         elif Type.is_pydantic(paramType):
             return paramType(**arg)
+        elif Type.is_ndarray(paramType):
+            return NDArray.decode(arg, NDArray.dtype_of(paramType))
         else:
             return arg
 
@@ -245,38 +613,52 @@ class Convert:
             - Primitive types are kept as they are.
             - List types are recursively converted using the inner type.
             - Pydantic types are converted to a dictionary using the dict() method.
+            - Compact pydantic types are converted to rows and lists of them to tables, see CompactEncoding.
+            - NumPy arrays are converted to their descriptors.
             - Other types are converted to a dictionary using the dict() method.
         """
         if Type.is_primitive(type(arg)):
             return arg
 
         if Type.is_list(type(arg)):
+            if CompactEncoding.is_table(arg):
+                return Convert.dump(arg)
             for i in range(len(arg)):
                 arg[i] = Convert.from_py_to_web(arg[i])
             return arg
 
         if Type.is_pydantic(type(arg)):
-            return arg.model_dump()
+            return Convert.dump(arg) if CompactEncoding.has_compact(type(arg)) else arg.model_dump()
+
+        if NDArray.is_array(arg):
+            return NDArray.encode(arg)
 
         return arg
 
     @staticmethod
-    def from_py_to_web_response(result) -> Dict[str, Any]:
+    def from_py_to_web_response(result, dump: Callable[[Any], Any] = None) -> Dict[str, Any]:
         """Converts a Python format result to a web format response.
-            - String types are wrapped in a Response object with success attribute.
-            - Response types are converted to a dictionary using the dict() method.
-            - Other types are wrapped in a Response object with data attribute.
+            - String types are wrapped in a response with success attribute.
+            - Response types are converted to a dictionary, with their data converted to web format.
+            - Other types are converted to web format and wrapped in a response with data attribute.
+
+        Args:
+            result: The result.
+            dump (Callable[[Any], Any], optional): The conversion of the data to web format. Defaults to None, which
+                selects Convert.dump.
 
         Returns:
              Dict[str, Any] - a dictionary that represents the response.
         """
         if isinstance(result, str):
-            return Response(success=result).model_dump()
+            return Response.envelope(success=result)
 
         if isinstance(result, Response):
-            return result.model_dump()
+            return Response.envelope(
+                result.success, result.error, Convert.dump(result.data), result.version, result.notModified
+            )
 
-        return Response(data=result).model_dump()
+        return Response.envelope(data=(dump or Convert.dump)(result))
 
 
 class EmitBy:
@@ -286,6 +668,203 @@ class EmitBy:
     User = 1
 
 
+class Edge:
+    """A class to represent the edges of a rate limiting window at which the emissions are delivered."""
+
+    Leading = 1
+    """ The first emission is delivered right away, the following ones in the window are dropped. """
+
+    Trailing = 2
+    """ The last emission is delivered at the end of the window. """
+
+    Both = 3
+    """ The first emission is delivered right away and the last one at the end of the window. """
+
+
+class RateLimit:
+    """A class to represent the rate limiting policy of a signal.
+
+    Attributes:
+        throttle_ms (int): The throttling window in milliseconds, at most one emission per edge is delivered in
+            each window.
+        debounce_ms (int): The debouncing window in milliseconds, the emissions are delivered only after the signal
+            stays quiet for this long.
+        edge (int): One of the Edge values, the edges of the window at which the emissions are delivered.
+    """
+
+    def __init__(self, throttle_ms: int = 0, debounce_ms: int = 0, max_rate: float = 0, edge: int = Edge.Trailing):
+        """
+        The constructor method for the RateLimit class.
+
+        Args:
+            throttle_ms (int, optional): The throttling window in milliseconds. Defaults to 0.
+            debounce_ms (int, optional): The debouncing window in milliseconds. Defaults to 0.
+            max_rate (float, optional): The maximum number of emissions per second, an alternative to throttle_ms
+                which selects a throttling window of 1000 / max_rate milliseconds. Defaults to 0.
+            edge (int, optional): One of the Edge values. Defaults to Edge.Trailing.
+
+        Raises:
+            ValueError: If both throttling and debouncing are requested.
+        """
+        # Convert the maximum rate into a throttling window
+        if throttle_ms <= 0 and max_rate > 0:
+            throttle_ms = max(1, round(1000 / max_rate))
+
+        if throttle_ms > 0 and debounce_ms > 0:
+            raise ValueError("A signal can be either throttled or debounced, not both")
+
+        self.throttle_ms = throttle_ms
+        self.debounce_ms = debounce_ms
+        self.edge = edge
+
+    def isActive(self) -> bool:
+        """Returns whether the policy limits the emissions at all.
+
+        Returns:
+            bool: True if the signal is throttled or debounced, False otherwise.
+        """
+        return self.throttle_ms > 0 or self.debounce_ms > 0
+
+    def options(self) -> Dict[str, int]:
+        """Returns the policy as keyword arguments of the Signal function.
+
+        Returns:
+            Dict[str, int]: The throttle_ms, debounce_ms and edge arguments.
+        """
+        return dict(throttle_ms=self.throttle_ms, debounce_ms=self.debounce_ms, edge=self.edge)
+
+    def describe(self) -> str:
+        """Returns a human-readable description of the policy, i.e. "throttle 100 ms, trailing edge".
+
+        Returns:
+            str: The description of the policy.
+        """
+        mode = f"throttle {self.throttle_ms} ms" if self.throttle_ms > 0 else f"debounce {self.debounce_ms} ms"
+        edges = {Edge.Leading: "leading edge", Edge.Trailing: "trailing edge", Edge.Both: "leading and trailing edges"}
+        return f"{mode}, {edges[self.edge]}"
+
+
+class RateLimitedSignal:
+    """A class that wraps the signal instance of a controller and rate limits its emissions.
+
+    The controller replaces its rate limited signals with these wrappers, so the emissions are limited on the server,
+    before they reach QWebChannel. Each signal has its own timer: a throttled signal holds the trailing emission until
+    throttle_ms after its last delivered emission, a debounced signal restarts the timer on every emission.
+
+    Attributes:
+        signal (QtCore.SignalInstance): The wrapped signal instance.
+        rateLimit (RateLimit): The rate limiting policy of the signal.
+    """
+
+    def __init__(self, signal: QtCore.SignalInstance, rateLimit: RateLimit, parent: QObject) -> None:
+        """
+        The constructor method for the RateLimitedSignal class.
+
+        Args:
+            signal (QtCore.SignalInstance): The signal instance to be wrapped.
+            rateLimit (RateLimit): The rate limiting policy of the signal.
+            parent (QObject): The controller that owns the signal, it is the parent of the timer.
+        """
+        self.signal = signal
+        self.rateLimit = rateLimit
+        # The arguments of the emission which waits for the trailing edge
+        self._pendingArgs: Optional[tuple] = None
+        # The time of the last delivered emission in milliseconds
+        self._lastEmitTime = -float("inf")
+        # The timer of the trailing edge, its interval is set on every start for a throttled signal
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(rateLimit.debounce_ms)
+        self._timer.timeout.connect(self._deliverPending)
+
+    def emit(self, *args) -> None:
+        """Emits the signal according to the rate limiting policy.
+
+        Args:
+            *args: The arguments of the signal.
+        """
+        if self.rateLimit.debounce_ms > 0:
+            self._debounce(args)
+        else:
+            self._throttle(args)
+
+    def _throttle(self, args: tuple) -> None:
+        """Delivers at most one emission per edge of each throttling window.
+
+        A window starts with each delivered emission, or with the first emission if only the trailing edge is on, and
+        nothing else is delivered until it is over.
+
+        Args:
+            args (tuple): The arguments of the signal.
+        """
+        # The time until the window of the last delivered emission is over
+        wait = self._lastEmitTime + self.rateLimit.throttle_ms - time.monotonic() * 1000
+        # Deliver right away if the leading edge is on and the last window is over
+        if self.rateLimit.edge & Edge.Leading and self._pendingArgs is None and wait <= 0:
+            self._deliver(args)
+            return
+
+        # Drop the emission if the trailing edge is off
+        if not self.rateLimit.edge & Edge.Trailing:
+            return
+
+        # Otherwise, keep the latest arguments for the end of the window, which starts now if there is none
+        self._pendingArgs = args
+        if not self._timer.isActive():
+            self._timer.start(max(0, math.ceil(wait)) if self.rateLimit.edge & Edge.Leading
+                              else self.rateLimit.throttle_ms)
+
+    def _debounce(self, args: tuple) -> None:
+        """Delivers the emissions once the signal stays quiet for the debouncing window.
+
+        Args:
+            args (tuple): The arguments of the signal.
+        """
+        # Deliver right away if the leading edge is on and the signal was quiet
+        if self.rateLimit.edge & Edge.Leading and not self._timer.isActive():
+            self._deliver(args)
+        # Otherwise, keep the latest arguments for the end of the quiet period if the trailing edge is on
+        elif self.rateLimit.edge & Edge.Trailing:
+            self._pendingArgs = args
+
+        # Restart the quiet period
+        self._timer.start()
+
+    def _deliverPending(self) -> None:
+        """Emits the signal with the arguments which wait for the trailing edge.
+
+        This method is invoked by the timer at the end of the window.
+        """
+        if self._pendingArgs is None:
+            return
+        # Wait for the rest of the throttling window if the timer fired early
+        wait = self._lastEmitTime + self.rateLimit.throttle_ms - time.monotonic() * 1000
+        if self.rateLimit.throttle_ms > 0 and wait > 0:
+            self._timer.start(math.ceil(wait))
+            return
+        args = self._pendingArgs
+        self._pendingArgs = None
+        self._deliver(args)
+
+    def _deliver(self, args: tuple) -> None:
+        """Emits the signal and records the time of the delivery.
+
+        Args:
+            args (tuple): The arguments of the signal.
+        """
+        self._lastEmitTime = time.monotonic() * 1000
+        self.signal.emit(*args)
+
+    def connect(self, *args, **kwargs):
+        """Connects the wrapped signal instance, see QtCore.SignalInstance.connect."""
+        return self.signal.connect(*args, **kwargs)
+
+    def disconnect(self, *args, **kwargs):
+        """Disconnects the wrapped signal instance, see QtCore.SignalInstance.disconnect."""
+        return self.signal.disconnect(*args, **kwargs)
+
+
 class Notify:
     """A class to represent a notification object.
 
@@ -295,6 +874,7 @@ class Notify:
         name as the key and the argument type as the value.
         emitBy (EmitBy): The source of the notification, either EmitBy.Auto or EmitBy.User.
         The default value is EmitBy.Auto.
+        rateLimit (RateLimit): The rate limiting policy of the notification signal.
     """
 
     def __init__(
@@ -302,6 +882,10 @@ class Notify:
             arguments: Dict[str, type] | List[type],
             name: str = None,
             emitBy: EmitBy = EmitBy.Auto,
+            throttle_ms: int = 0,
+            debounce_ms: int = 0,
+            max_rate: float = 0,
+            edge: int = Edge.Trailing,
     ):
         """
         The constructor method for the Notify class.
@@ -312,14 +896,104 @@ class Notify:
             with the argument name as the key and the argument type as the value.
             emitBy (EmitBy, optional): The source of the notification, either EmitBy.Auto or EmitBy.User.
             The default value is EmitBy.Auto.
+            throttle_ms (int, optional): The throttling window of the notification in milliseconds, see Signal.
+            debounce_ms (int, optional): The debouncing window of the notification in milliseconds, see Signal.
+            max_rate (float, optional): The maximum number of notifications per second, see Signal.
+            edge (int, optional): One of the Edge values, see Signal. Defaults to Edge.Trailing.
         """
 
         self.name = name
         self.arguments = arguments
         self.emitBy = emitBy
+        self.rateLimit = RateLimit(throttle_ms, debounce_ms, max_rate, edge)
+
+
+async def _collect(items) -> List[Any]:
+    """Collects the items of an async iterable into a list.
+
+    Args:
+        items: The async iterable.
+
+    Returns:
+        List[Any]: The list of the items.
+    """
+    return [item async for item in items]
+
+
+class Invocation:
+    """A class to represent the call of an action by a client, which is being dispatched.
+
+    The transport which dispatches a message enters an invocation around it, so an action can find out which client
+    called it, i.e. to send a streamed result back to that client. The invocations are entered on the main thread,
+    the other threads read them through snapshot.
+
+    Attributes:
+        transport (QObject): The transport of the client that sent the message.
+        message (Dict[str, Any]): The message being dispatched.
+        metrics (Optional[ActionMetrics]): The metrics of the called action, which are set by the action, so the
+            transport can record the sizes of the call and its response.
+    """
 
+    _stack: List["Invocation"] = []
 
-def Action(notify: Notify = None):
+    _lock = threading.Lock()
+
+    def __init__(self, transport: QObject, message: Dict[str, Any]) -> None:
+        """
+        The constructor method for the Invocation class.
+
+        Args:
+            transport (QObject): The transport of the client that sent the message.
+            message (Dict[str, Any]): The message being dispatched.
+        """
+        self.transport = transport
+        self.message = message
+        self.metrics: Optional[ActionMetrics] = None
+
+    def __enter__(self) -> "Invocation":
+        """Makes the invocation the current one until it is exited."""
+        with Invocation._lock:
+            Invocation._stack.append(self)
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Restores the previous invocation, if any."""
+        with Invocation._lock:
+            Invocation._stack.pop()
+
+    @staticmethod
+    def current() -> Optional["Invocation"]:
+        """Returns the invocation being dispatched.
+
+        Returns:
+            Optional[Invocation]: The invocation, or None if the action is not called by a client.
+        """
+        return Invocation._stack[-1] if Invocation._stack else None
+
+    @staticmethod
+    def snapshot() -> List["Invocation"]:
+        """Returns a copy of the invocations being dispatched, it can be taken from any thread.
+
+        Returns:
+            List[Invocation]: The invocations, from the outermost to the current one.
+        """
+        with Invocation._lock:
+            return [*Invocation._stack]
+
+
+_deferredPlaceholder = Response.envelope()
+""" The response the web channel replies with to a deferred call, the transport drops it. """
+
+
+def Action(
+        notify: Notify = None,
+        stream: bool = False,
+        chunk_size: int = 100,
+        executor: "str | Executor" = None,
+        task: Callable[..., Any] = None,
+        cache: CachePolicy = None,
+        versioned: bool | str = False,
+):
     """
     A decorator that converts a Python function into a Qt slot. The notify argument is used to emit after the function
     is executed. Defaults to None. If it is specified, a signal with the given name will be created and attached
@@ -328,14 +1002,65 @@ def Action(notify: Notify = None):
     will be emitted automatically after the function is executed. If it is set to EmitBy.User, the notification will
     be emitted only if the function explicitly emits it.
 
+    The function can be a coroutine function (async def). The slot then returns right away without blocking the event
+    loop, and the client receives the response once the coroutine is finished. The coroutines run on the QtAsyncio
+    loop if the Qt event loop is run by it, otherwise on a private asyncio loop which is stepped by the Qt event
+    loop, see AsyncBridge. Called from Python outside of a client call, e.g. by another controller, the slot blocks
+    until the coroutine is finished. It cannot block while an asyncio loop is running, i.e. under QtAsyncio, so the
+    coroutine is not run and the slot replies with an error then; await the coroutine function instead, which is the
+    __wrapped__ attribute of the slot.
+
+    With an executor, the function runs on a thread pool or a process pool instead of the main thread, so CPU bound
+    work does not stall the channel and can use all cores. The result is handed back to the main thread, where the
+    notification is emitted and the response is sent, see ExecutorBridge. A function running on a thread must not
+    touch the Qt objects other than emitting signals. A process pool cannot run a method of a controller, so it runs
+    the task instead, a picklable module level function that takes the arguments of the action without self and
+    returns its result. The body of the decorated function is not used then.
+
+    With stream=True, the function is expected to return an iterable, typically by being a generator or an async
+    generator. Its items are sent to the calling client incrementally in chunks of chunk_size items as they are
+    produced, instead of being collected into one response, and the client receives an async iterator as the data of
+    the response. The transport pauses the iteration whenever the client falls behind. If the function is not called
+    by a client over a transport which supports streaming, the items are collected into a list. The items of an async
+    generator are collected like the result of a coroutine.
+
+    With a cache policy, the successful responses are kept per controller, keyed by the converted arguments, and the
+    calls with the same arguments are answered from the cache without running the function, until the responses
+    expire, are evicted or are invalidated. The controller drops them by invalidateCache, or on the signals and
+    property changes listed in the policy, and reports the hits and misses by cacheStats.
+
+    A versioned action reads a state of the controller whose changes are marked by Controller.bumpVersion. Its
+    responses carry the version of the state, and a client which calls it again with the version it knows gets a
+    tiny not modified response, without the function being run, until the state is changed. With a string, the
+    version of that part of the state is used instead of the version of the whole state.
+
+    The calls are traced while a tracing hook is registered, each call is a span with the child spans of its phases,
+    see Tracer.
+
     Args:
         notify (Notify, optional): A Notify object that specifies the name and arguments of a notification signal
+        stream (bool, optional): Whether to stream the items of the result to the client. Defaults to False.
+        chunk_size (int, optional): The maximum number of items sent in one chunk of a stream. Defaults to 100.
+        executor (str | Executor, optional): "thread" for the shared thread pool, "process" for the shared process
+            pool, or a concurrent.futures.Executor object. Defaults to None, which runs the function on the main thread.
+        task (Callable[..., Any], optional): The function that runs on the executor instead of the decorated one.
+            It is required for process pools. Defaults to None.
+        cache (CachePolicy, optional): The caching policy of the responses. Defaults to None, which runs the
+            function on every call.
+        versioned (bool | str, optional): Whether the responses are versioned by the state of the controller, or the
+            name of the part of the state they are versioned by. Defaults to False.
 
     Returns:
         A wrapper function that is a Qt slot with the same arguments and return type as the original function.
         The slot also handles serialization and deserialization of inputs and outputs, exception handling,and optionally
         emits a notification signal with the result.
 
+    Raises:
+        Exception: If a streaming action is asked to emit its notification automatically, or if a process pool is
+            requested without a task, or if a coroutine function is requested to run on an executor, or if a
+            streaming action or an action emitting its notification automatically is cached, or if a streaming
+            action is versioned.
+
     References:
         https://doc.qt.io/qtforpython-6/tutorials/basictutorial/signals_and_slots.html
 
@@ -343,48 +1068,238 @@ def Action(notify: Notify = None):
         Signal, Property
     """
 
+    # The result of a streaming action is never complete, so it cannot be emitted automatically
+    if stream and notify is not None and notify.emitBy == EmitBy.Auto:
+        raise Exception("Streaming actions cannot emit notifications automatically, use EmitBy.User")
+
+    # A cached response is neither a stream of items nor emitted again
+    if cache is not None and (stream or (notify is not None and notify.emitBy == EmitBy.Auto)):
+        raise Exception("Streaming actions and actions emitting notifications automatically cannot be cached")
+
+    # The items of a stream are sent after the response, they cannot be skipped by the version of the state
+    if stream and versioned is not False:
+        raise Exception("Streaming actions cannot be versioned")
+
+    # The name of the part of the state the responses are versioned by, "" for the whole state
+    versionScope = versioned if isinstance(versioned, str) else ""
+
+    # A process pool cannot pickle the controller, it needs a module level function to run
+    if executor is not None and task is None and ExecutorBridge.isProcessPool(executor):
+        raise Exception("Actions running on a process pool need a module level task function")
+
     # The decorator function takes the function to be wrapped as an argument
     def ActionWrapper(func):
+        # Coroutines already leave the event loop free while waiting, and an executor cannot run them
+        target = task if task is not None else func
+        if executor is not None and (inspect.iscoroutinefunction(target) or inspect.isasyncgenfunction(target)):
+            raise Exception(f"Action '{func.__name__}' is a coroutine function, it cannot run on an executor")
+
         # Get the annotations of the function, which are the types of the arguments and return value
         annots: dict = func.__annotations__
         # Convert the Python types to Qt types
         arg_names, arg_types = Convert.from_py_to_qt(annots)
 
+        # Compile the conversions of the arguments once, only the arguments which need conversion are kept, with
+        # their positions in the slot arguments (after self)
+        paramTypes = [paramType for paramName, paramType in annots.items() if paramName != "return"]
+        argPlans = [
+            (i + 1, plan) for i, plan in enumerate(map(Convert.plan_from_web_to_py, paramTypes)) if plan is not None
+        ]
+        # Compile the conversion of the result if it is annotated, otherwise it is converted by its runtime type
+        resultPlan = Convert.dump
+        if "return" in annots:
+            resultPlan = Convert.plan_from_py_to_web(annots["return"]) or (lambda result: result)
+
         # Define the slot with the Qt types and the result type as a dict
         @Slot(*arg_types, result=dict)
         # Preserve the name and docstring of the original function
         @functools.wraps(func)
         def wrapper(*args):
+            metrics = Metrics.instance()
+            tracer = Tracer.instance()
+            if not metrics.enabled and not tracer.hooks:
+                return call(args, None)
+
+            invocation = Invocation.current()
+            # Let the transport record the sizes of the call and its response for the action
+            actionMetrics = None
+            if metrics.enabled:
+                actionMetrics = metrics.action(args[0].name(), func.__name__)
+                if invocation is not None:
+                    invocation.metrics = actionMetrics
+            # Open the span of the call, in the trace given by the client if any
+            span = None
+            if tracer.hooks:
+                span = tracer.startSpan(
+                    f"{args[0].name()}.{func.__name__}",
+                    traceId=invocation.message.get("trace") if invocation is not None else None,
+                    attributes={"controller": args[0].name(), "action": func.__name__},
+                )
+
+            # Measure the call, the deferred calls are measured once their responses are ready
+            measure = (actionMetrics, time.perf_counter(), span)
+            response = call(args, measure)
+            if response is not _deferredPlaceholder:
+                record(measure, response)
+            return response
+
+        def record(measure: Tuple[Optional[ActionMetrics], float, Optional[Span]], response: Dict[str, Any]) -> None:
+            actionMetrics, start, span = measure
+            if actionMetrics is not None:
+                actionMetrics.record(start, response)
+            if span is not None:
+                span.end(response.get("error"))
+
+        def call(args, measure: Optional[Tuple[Optional[ActionMetrics], float, Optional[Span]]]) -> Dict[str, Any]:
+            span = measure[2] if measure is not None else None
             try:
+                # Reply without running the function if the client already has the data of the current version
+                version = None
+                if versioned is not False:
+                    version = args[0].version(versionScope)
+                    invocation = Invocation.current()
+                    if invocation is not None and invocation.message.get("version") == version:
+                        return Response.envelope(version=version, notModified=True)
+
                 # Deserialize inputs
                 params = [*args]
-                for i, paramName in enumerate(annots):
-                    paramType = annots[paramName]
-                    # Convert the input from web format to Python format
-                    params[i + 1] = Convert.from_web_to_py(params[i + 1], paramType)
-
-                # Call the original function
-                result = func(*params)
-
-                # If a notification signal is specified
-                if notify is not None and notify.emitBy == EmitBy.Auto:
-                    # Convert the result from Python format to web format
-                    result = Convert.from_py_to_web(result)
-                    # Get the signal object from the first argument, which is the controller
-                    signal = getattr(params[0], notify.name, None)
-                    # If the signal object exists, emit it with the result
-                    if signal is not None:
-                        signal.emit(result)
-
-                # Serialize response
-                # Convert the result from Python format to web response format
-                return Convert.from_py_to_web_response(result)
+                with Tracer.child(span, "convert"):
+                    for i, plan in argPlans:
+                        # Convert the input from web format to Python format
+                        params[i] = plan(params[i])
+
+                # Answer from the cache if the action is called with the same arguments before
+                cacheKey = None
+                if cache is not None:
+                    cacheKey = ActionCache.key(tuple(params[1:]))
+                    response = params[0]._actionCaches[func.__name__].get(cacheKey) if cacheKey is not None else None
+                    if response is not None:
+                        return response if version is None else {**response, "version": version}
+
+                # If an executor is specified, run the function there and reply once it is finished
+                if executor is not None:
+                    targetArgs = tuple(params[1:]) if task is not None else tuple(params)
+                    bridge = ExecutorBridge.instance()
+                    return deferResponse(
+                        params[0],
+                        lambda done: bridge.submit(executor, target, targetArgs, done),
+                        lambda: bridge.executor(executor).submit(target, *targetArgs).result(),
+                        cacheKey,
+                        version,
+                        measure,
+                        Tracer.child(span, "call"),
+                    )
+
+                # Call the original function, the span of a coroutine lasts until it is finished
+                bodySpan = Tracer.child(span, "call")
+                try:
+                    result = func(*params)
+                except Exception as e:
+                    bodySpan.end(str(e))
+                    raise
+
+                # Collect the items of an async generator which cannot be streamed like the result of a coroutine
+                invocation = Invocation.current()
+                transport = invocation.transport if invocation is not None else None
+                if stream and hasattr(result, "__aiter__") and not hasattr(transport, "openStream"):
+                    result = _collect(result)
+
+                # If the function is a coroutine, reply once it is finished without blocking the event loop
+                if inspect.isawaitable(result):
+                    return deferResponse(
+                        params[0],
+                        lambda done: AsyncBridge.instance().submit(result, done),
+                        lambda: AsyncBridge.instance().run(result),
+                        cacheKey,
+                        version,
+                        measure,
+                        bodySpan,
+                    )
+
+                bodySpan.end()
+                return respond(params[0], result, Invocation.current(), cacheKey, version, span)
 
             # Handle any exceptions
             except Exception as e:
                 Logger.error(str(e))
                 # Return a response with the error message
-                return Response(error=str(e)).model_dump()
+                return Response.envelope(error=str(e))
+
+        def respond(
+                controller, result, invocation: Optional[Invocation], cacheKey=None, version=None, span=None
+        ) -> Dict[str, Any]:
+            # If the result is streamed
+            if stream:
+                # Get the transport of the calling client
+                openStream = getattr(invocation.transport, "openStream", None) if invocation else None
+                # Send the items incrementally if the transport supports it, reply with the stream identifier
+                if openStream is not None:
+                    return Response.envelope(data={"__stream__": openStream(result, chunk_size)})
+                # Otherwise, collect the items into a list, the items of an async generator are already collected
+                result = [*result]
+
+            # If a notification signal is specified
+            if notify is not None and notify.emitBy == EmitBy.Auto:
+                # Convert the result from Python format to web format
+                with Tracer.child(span, "serialize"):
+                    webResult = resultPlan(result)
+                # Get the signal object from the first argument, which is the controller
+                signal = getattr(controller, notify.name, None)
+                # If the signal object exists, emit it with the result
+                if signal is not None:
+                    with Tracer.child(span, "notify"):
+                        signal.emit(webResult)
+                # Serialize response, the result is already in web format
+                response = Convert.from_py_to_web_response(result, lambda _: webResult)
+            else:
+                # Serialize response
+                # Convert the result from Python format to web response format
+                with Tracer.child(span, "serialize"):
+                    response = Convert.from_py_to_web_response(result, resultPlan)
+                # Keep the response of a cached action
+                if cacheKey is not None:
+                    controller._actionCaches[func.__name__].put(cacheKey, response)
+
+            # Tell the client which version of the state the data is read from
+            if version is not None:
+                response = {**response, "version": version}
+            return response
+
+        def deferResponse(controller, start, wait, cacheKey, version, measure, bodySpan) -> Dict[str, Any]:
+            # Get the transport of the calling client
+            invocation = Invocation.current()
+            transport = invocation.transport if invocation else None
+            messageId = invocation.message.get("id") if invocation else None
+            span = measure[2] if measure is not None else None
+
+            # If the transport cannot defer the response, i.e. the action is called from Python, wait for the result.
+            # A coroutine cannot be waited for while an asyncio loop is running, it is closed and the error is replied.
+            if messageId is None or not hasattr(transport, "deferResponse"):
+                with bodySpan:
+                    result = wait()
+                return respond(controller, result, invocation, cacheKey, version, span)
+
+            def done(future):
+                try:
+                    # The function is finished once its result is ready
+                    error = future.exception()
+                    bodySpan.end(str(error) if error is not None else None)
+                    response = respond(controller, future.result(), invocation, cacheKey, version, span)
+                except Exception as e:
+                    Logger.error(str(e))
+                    response = Response.envelope(error=str(e))
+                if measure is not None:
+                    record(measure, response)
+                try:
+                    transport.sendResponse(messageId, response)
+                except RuntimeError:
+                    # The client is disconnected while the coroutine was running
+                    pass
+
+            # The web channel replies as soon as the slot returns, hold that reply back and send the real one later
+            transport.deferResponse(messageId)
+            start(done)
+            return _deferredPlaceholder
 
         # If a notification signal is specified
         if notify is not None:
@@ -399,7 +1314,21 @@ def Action(notify: Notify = None):
             # Store the notification information in a class attribute of Controller
             Controller.__actionNotifications__[
                 f"{controllerName}.{notify.name}"
-            ] = notify.arguments
+            ] = notify
+
+        # If a caching policy is specified
+        if cache is not None:
+            # Get the name of the controller that defines the function
+            controllerName, _ = Helper.infer_caller_info(inspect.stack())
+            # Store the caching policy in a class attribute of Controller
+            Controller.__actionCaches__[f"{controllerName}.{func.__name__}"] = cache
+
+        # If the responses are versioned
+        if versioned is not False:
+            # Get the name of the controller that defines the function
+            controllerName, _ = Helper.infer_caller_info(inspect.stack())
+            # Store the part of the state in a class attribute of Controller
+            Controller.__actionVersions__[f"{controllerName}.{func.__name__}"] = versionScope
 
         return wrapper
 
@@ -410,15 +1339,30 @@ def Signal(
         args: Dict[str, type] | List[type],
         controllerName: str = None,
         signalName: str = None,
+        throttle_ms: int = 0,
+        debounce_ms: int = 0,
+        max_rate: float = 0,
+        edge: int = Edge.Trailing,
 ) -> QtCore.Signal:
     """
     A function that creates a Qt signal with the given arguments by making necessary type conversions to keep Qt
     and serialization process happy.
 
+    The emissions of the signal can be rate limited on the server, before they reach the clients:
+        - Throttling delivers at most one emission per edge in each throttle_ms window.
+        - Debouncing delivers the emissions only after the signal stays quiet for debounce_ms.
+    The edge argument selects whether the first emission (leading edge), the last emission (trailing edge) or both
+    are delivered. The emissions which are not delivered are dropped.
+
     Args:
         args (Dict[str, type] or List[type]): A dictionary that maps the names and types of the signal arguments.
         controllerName (str, optional): The name of the controller that defines the signal. Defaults to None.
         signalName (str, optional): The name of the signal. Defaults to None.
+        throttle_ms (int, optional): The throttling window in milliseconds. Defaults to 0, which means no throttling.
+        debounce_ms (int, optional): The debouncing window in milliseconds. Defaults to 0, which means no debouncing.
+        max_rate (float, optional): The maximum number of emissions per second, an alternative to throttle_ms which
+            selects a throttling window of 1000 / max_rate milliseconds. Defaults to 0, which means no limit.
+        edge (int, optional): One of the Edge values. Defaults to Edge.Trailing.
 
     Returns:
         A QtCore.Signal object with the specified arguments, name, and arguments names.
@@ -461,6 +1405,11 @@ def Signal(
     # Store the signal arguments in a class attribute of Controller
     Controller.__signalArgsMap__[f"{controllerName}.{signalName}"] = args
 
+    # Store the rate limiting policy of the signal in a class attribute of Controller
+    rateLimit = RateLimit(throttle_ms, debounce_ms, max_rate, edge)
+    if rateLimit.isActive():
+        Controller.__signalRateLimits__[f"{controllerName}.{signalName}"] = rateLimit
+
     # Create a new signal with the Qt types, name, and arguments names
     signal = QtCore.Signal(*arg_types, name=signalName, arguments=arg_names)
 
@@ -468,22 +1417,52 @@ def Signal(
     return signal
 
 
-def Property(p_type: type, init_val=None, get_f=None, set_f=None) -> QtCore.Property:
+def Property(
+        p_type: type,
+        init_val=None,
+        get_f=None,
+        set_f=None,
+        coalesce_ms: int = 0,
+        max_rate: float = 0,
+        delta: bool = False,
+) -> QtCore.Property:
     """
     A function that creates a Qt property and a corresponding signal. The function is responsible for creating
     the backend variable, getter and setter functions, and the signal object related with the property.
 
+    By default, the default setter emits the changed signal on every distinct assignment. With a coalescing window,
+    the value is still assigned right away, but the changed signal is emitted once at the end of the window with the
+    latest value, and the intermediate values are never sent to the clients. The windows of the same length share a
+    single timer across all properties.
+
+    In delta mode, which is meant for large list, dict or pydantic properties, the controller keeps a snapshot of the
+    value last sent to the clients. The changes are collected until the end of the coalescing window, or of the event
+    loop iteration without one, and then a '<name>Patched' signal is emitted with the RFC 6902 JSON Patch from the
+    snapshot to the new value instead of the whole value, so the traffic grows with the size of the change rather than
+    the size of the value. The snapshot is taken and compared once per notification, not once per change. When the
+    patch would not be smaller than the value encoded as JSON, the patch replaces the whole value instead. The changed
+    signal is not emitted in delta mode, and a client which connects while a patch is pending receives it before its
+    init message, so its init value is the base of the next patch. The frontend applies the patches to the property
+    cache.
+
     Args:
         p_type (type): The type of the property value.
         init_val: The initial value of the property. Defaults to None
         get_f (function, optional): A custom getter function for the property. Defaults to None.
         set_f (function, optional): A custom setter function for the property. Defaults to None.
+        coalesce_ms (int, optional): The coalescing window of the changed signal in milliseconds. Defaults to 0,
+            which emits the changed signal right away.
+        max_rate (float, optional): The maximum number of changed signals per second, an alternative to coalesce_ms
+            which selects a window of 1000 / max_rate milliseconds. Defaults to 0, which means no limit.
+        delta (bool, optional): Whether to send the changes as JSON Patches. It applies to the default setter only.
+            Defaults to False.
 
     Returns:
         The prop which is a QtCore.Property object.
 
     Raises:
-        Exception: If the property name cannot be inferred from the caller information
+        Exception: If the property name cannot be inferred from the caller information, or if delta mode is requested
+            for a primitive type.
 
     References:
         https://doc.qt.io/qtforpython-6/PySide6/QtCore/Property.html
@@ -501,6 +1480,22 @@ def Property(p_type: type, init_val=None, get_f=None, set_f=None) -> QtCore.Prop
         )
 
     signalName = f"{propName}Changed"
+    patchSignalName = f"{propName}Patched"
+    snapshotName = f"_{propName}Snapshot"
+
+    # Resolve the coalescing window of the changed signal
+    if coalesce_ms <= 0 and max_rate > 0:
+        coalesce_ms = max(1, round(1000 / max_rate))
+
+    # Delta mode needs a container type, primitive values and arrays are always sent as a whole
+    if delta and (Type.is_primitive(p_type) or Type.is_ndarray(p_type)):
+        raise Exception(
+            f"Property '{propName}' at {controllerName} cannot use delta mode with type {p_type.__name__}"
+        )
+
+    # NumPy arrays are kept as they are, and converted to their descriptors for Qt
+    ndarray = Type.is_ndarray(p_type)
+    dtype = NDArray.dtype_of(p_type) if ndarray else None
 
     # Define default get & set behavior
     # Define a getter function that returns the property value
@@ -509,21 +1504,71 @@ def Property(p_type: type, init_val=None, get_f=None, set_f=None) -> QtCore.Prop
         if not hasattr(self, f"_{propName}"):
             setattr(self, f"_{propName}", init_val)
 
+        # In delta mode, take the first snapshot when the value is first read, i.e. for the init message of a client
+        if delta and not hasattr(self, snapshotName):
+            setattr(self, snapshotName, JsonPatch.snapshot(getattr(self, f"_{propName}")))
+
         # Return the property value
+        if ndarray:
+            return NDArray.encode(getattr(self, f"_{propName}"))
         return getattr(self, f"_{propName}")
 
+    def notifyDelta(self):
+        # Compute the patch from the snapshot the clients have to the current value, at the end of the window
+        snapshot = JsonPatch.snapshot(getattr(self, f"_{propName}"))
+        patch = JsonPatch.diff(getattr(self, snapshotName), snapshot)
+        setattr(self, snapshotName, snapshot)
+        # If nothing is changed, there is nothing to notify
+        if len(patch) == 0:
+            return
+
+        # Replace the whole value if the patch is not smaller than the value. It is still sent as a patch, the changed
+        # signal would make the web channel read the value later, which may be ahead of the snapshot by then
+        patchSize = JsonPatch.size(patch)
+        if any(op["path"] == "" for op in patch) or JsonPatch.size(snapshot, patchSize) <= patchSize:
+            patch = [{"op": "replace", "path": "", "value": snapshot}]
+        getattr(self, patchSignalName).emit(patch)
+
     # Define a setter function that sets the property value
     def setter(self, new_value):
+        # In delta mode, the value is compared with the snapshot once the notification is due, not on every change
+        if delta:
+            # Make sure the snapshot of the value the clients have exists before it is replaced
+            getter(self)
+            setattr(self, f"_{propName}", new_value)
+            if getattr(self, patchSignalName, None) is not None:
+                NotifyScheduler.instance().schedule(
+                    max(coalesce_ms, 0), (id(self), propName), lambda: notifyDelta(self)
+                )
+            return
+
+        # Arrays set by the frontend are received as descriptors
+        if ndarray:
+            if not NDArray.is_array(new_value):
+                new_value = NDArray.decode(new_value, dtype)
+            # Make sure the current value exists before it is compared
+            if not hasattr(self, f"_{propName}"):
+                setattr(self, f"_{propName}", init_val)
+
         # If the new value is different from the current value
-        if getattr(self, f"_{propName}") != new_value:
+        if (not NDArray.equal(getattr(self, f"_{propName}"), new_value) if ndarray
+                else getattr(self, f"_{propName}") != new_value):
             # Set the property value to the new value
             setattr(self, f"_{propName}", new_value)
 
             # Get the signal object from the self attribute
             s = getattr(self, f"{signalName}", None)
-            # If the signal object exists, emit it with the new value
-            if s is not None:
-                s.emit(new_value)
+            # If the signal object does not exist, there is nothing to notify
+            if s is None:
+                return
+
+            # If there is no coalescing window, emit it with the new value
+            if coalesce_ms <= 0:
+                s.emit(NDArray.encode(new_value) if ndarray else new_value)
+                return
+
+            # Otherwise, emit it at the end of the window with the latest value
+            NotifyScheduler.instance().schedule(coalesce_ms, (id(self), propName), lambda: s.emit(getter(self)))
 
     # Rearrange variable types so that Qt Property will be happy
     # Convert the Python type to a Qt type
@@ -547,5 +1592,11 @@ def Property(p_type: type, init_val=None, get_f=None, set_f=None) -> QtCore.Prop
     # Store the property type and relevant changed signal in a class attribute of Controller
     Controller.__propsTypes__[f"{controllerName}.{propName}"] = (p_type, signal)
 
+    # In delta mode, register the patch signal to be generated along with the action notifiers
+    if delta:
+        Controller.__actionNotifications__[f"{controllerName}.{patchSignalName}"] = Notify(
+            {"patch": list}, name=patchSignalName
+        )
+
     # Return the property and signal objects
     return prop
@@ -0,0 +1,115 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+
+
+class ExecutorBridge(QObject):
+    """A class that runs functions on thread or process pools and hands their results back to the main thread.
+
+    The futures of the pools finish on worker threads. Their done functions are passed through a queued signal, so
+    they are called on the thread of the bridge, which is the main thread, in a later iteration of the Qt event loop.
+
+    Attributes:
+        _threadPool (Optional[ThreadPoolExecutor]): The shared thread pool, created on the first use.
+        _processPool (Optional[ProcessPoolExecutor]): The shared process pool, created on the first use.
+    """
+
+    _instance: Optional["ExecutorBridge"] = None
+
+    finished = Signal(object, object)
+    """ The signal that is emitted from the worker threads with a finished future and its done function. """
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initializes the ExecutorBridge object with the given parent.
+
+        Args:
+            parent (Optional[QObject], optional): The parent object for the ExecutorBridge. Defaults to None.
+        """
+        super().__init__(parent)
+        self._threadPool: Optional[ThreadPoolExecutor] = None
+        self._processPool: Optional[ProcessPoolExecutor] = None
+        # The signal is emitted from the worker threads, so the slot is queued to the thread of the bridge. It is
+        # queued on the main thread too, when the future is finished before its done function is added
+        self.finished.connect(self.onFinished, Qt.ConnectionType.QueuedConnection)
+
+    @staticmethod
+    def instance() -> "ExecutorBridge":
+        """Returns the shared ExecutorBridge object, it is created on the first call.
+
+        The first call must be made on the main thread, which is where the done functions are called.
+
+        Returns:
+            ExecutorBridge: The shared ExecutorBridge object.
+        """
+        if ExecutorBridge._instance is None:
+            ExecutorBridge._instance = ExecutorBridge()
+        return ExecutorBridge._instance
+
+    def executor(self, executor: "str | Executor") -> Executor:
+        """Returns the executor for the given executor name or object.
+
+        Args:
+            executor (str | Executor): "thread" for the shared thread pool, "process" for the shared process pool, or
+                an Executor object.
+
+        Returns:
+            Executor: The executor object.
+
+        Raises:
+            ValueError: If the executor name is unknown.
+        """
+        if isinstance(executor, Executor):
+            return executor
+        if executor == "thread":
+            if self._threadPool is None:
+                self._threadPool = ThreadPoolExecutor(thread_name_prefix="pywebchannel")
+            return self._threadPool
+        if executor == "process":
+            if self._processPool is None:
+                self._processPool = ProcessPoolExecutor()
+            return self._processPool
+
+        raise ValueError(f"Unknown executor '{executor}'")
+
+    @staticmethod
+    def isProcessPool(executor: "str | Executor") -> bool:
+        """Returns whether the given executor name or object runs the functions in other processes.
+
+        Args:
+            executor (str | Executor): The executor name or object.
+
+        Returns:
+            bool: True for process pools, False otherwise.
+        """
+        return executor == "process" or isinstance(executor, ProcessPoolExecutor)
+
+    def submit(
+            self, executor: "str | Executor", func: Callable[..., Any], args: tuple, done: Callable[[Future], None]
+    ) -> Future:
+        """Runs a function on an executor and calls the done function with its future on the main thread.
+
+        Args:
+            executor (str | Executor): The executor name or object, see executor.
+            func (Callable[..., Any]): The function to be run.
+            args (tuple): The arguments of the function.
+            done (Callable[[Future], None]): The function which is called with the finished future.
+
+        Returns:
+            Future: The future of the function.
+        """
+        future = self.executor(executor).submit(func, *args)
+        future.add_done_callback(lambda f: self.finished.emit(f, done))
+        return future
+
+    @Slot(object, object)
+    def onFinished(self, future: Future, done: Callable[[Future], None]) -> None:
+        """Calls the done function of a finished future.
+
+        This slot is invoked on the main thread when a worker thread emits the finished signal.
+
+        Args:
+            future (Future): The finished future.
+            done (Callable[[Future], None]): The done function.
+        """
+        done(future)
@@ -0,0 +1,196 @@
+import math
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+
+class JsonPatch:
+    """A class that computes the structural difference of two JSON values as an RFC 6902 JSON Patch.
+
+    The patches only use the "add", "remove" and "replace" operations, so they can be applied by any RFC 6902
+    implementation, i.e. applyJsonPatch of the qwebchannel module on the frontend.
+
+    References:
+        https://datatracker.ietf.org/doc/html/rfc6902
+    """
+
+    @staticmethod
+    def snapshot(value: Any) -> Any:
+        """Returns a deep copy of a value in web format, which is not affected by later in-place modifications.
+
+        Args:
+            value: The value to be copied. Pydantic models are converted to dictionaries.
+
+        Returns:
+            The copy of the value, made of dictionaries, lists and primitive values.
+        """
+        if isinstance(value, BaseModel):
+            return value.model_dump()
+        if isinstance(value, dict):
+            return {key: JsonPatch.snapshot(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [JsonPatch.snapshot(item) for item in value]
+        return value
+
+    @staticmethod
+    def equal(a: Any, b: Any) -> bool:
+        """Returns whether two values are equal as JSON values.
+
+        Unlike the == operator, booleans are not equal to the numbers, i.e. True and 1 are different values.
+
+        Args:
+            a: The first value, a snapshot in web format.
+            b: The second value, a snapshot in web format.
+
+        Returns:
+            bool: True if the values are equal, False otherwise.
+        """
+        # The == operator is fast, and the values are never equal as JSON values if it says they are different
+        if a is b:
+            return True
+        if a != b:
+            return False
+
+        # Numbers of different types are equal, unless one of them is a boolean
+        if type(a) is not type(b):
+            return not isinstance(a, bool) and not isinstance(b, bool)
+        # Compare the containers item by item, as they may hold booleans and numbers
+        if isinstance(a, dict):
+            return all(JsonPatch.equal(a[key], b[key]) for key in a)
+        if isinstance(a, list):
+            return all(map(JsonPatch.equal, a, b))
+        return True
+
+    @staticmethod
+    def size(value: Any, limit: float = math.inf) -> int:
+        """Estimates the length of a value encoded as compact JSON, i.e. to compare a patch with the whole value.
+
+        Args:
+            value: The value, a snapshot in web format or a patch.
+            limit (float, optional): The length above which the counting stops, so a large value is not walked
+                through only to find out it is larger than the limit. Defaults to no limit.
+
+        Returns:
+            int: The estimated length, which is above the limit if the counting stopped.
+        """
+        total = 0
+        stack = [value]
+        while stack and total <= limit:
+            item = stack.pop()
+            if isinstance(item, dict):
+                # The braces and the commas, and the quotes and the colon of each key
+                total += 1 + max(1, len(item)) + sum(len(str(key)) + 3 for key in item)
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple)):
+                # The brackets and the commas
+                total += 1 + max(1, len(item))
+                stack.extend(item)
+            elif isinstance(item, str):
+                total += len(item) + 2
+            elif item is None or item is True:
+                total += 4
+            elif item is False:
+                total += 5
+            else:
+                total += len(str(item))
+        return total
+
+    @staticmethod
+    def diff(old: Any, new: Any) -> List[Dict[str, Any]]:
+        """Computes the patch that transforms the old value into the new value.
+
+        Args:
+            old: The old value, a snapshot in web format.
+            new: The new value, a snapshot in web format.
+
+        Returns:
+            List[Dict[str, Any]]: The list of the patch operations, empty if the values are equal.
+        """
+        patch: List[Dict[str, Any]] = []
+        JsonPatch._diff(old, new, "", patch)
+        return patch
+
+    @staticmethod
+    def _diff(old: Any, new: Any, path: str, patch: List[Dict[str, Any]]) -> None:
+        """Appends the operations that transform the old value into the new value at the given path.
+
+        Args:
+            old: The old value.
+            new: The new value.
+            path (str): The JSON pointer of the values.
+            patch (List[Dict[str, Any]]): The list of the patch operations to be extended.
+        """
+        # Nothing to do if the values are equal
+        if JsonPatch.equal(old, new):
+            return
+
+        # Compare the dictionaries key by key
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in old.keys() - new.keys():
+                patch.append({"op": "remove", "path": f"{path}/{JsonPatch._escape(key)}"})
+            for key, value in new.items():
+                keyPath = f"{path}/{JsonPatch._escape(key)}"
+                if key in old:
+                    JsonPatch._diff(old[key], value, keyPath, patch)
+                else:
+                    patch.append({"op": "add", "path": keyPath, "value": value})
+            return
+
+        # Compare the lists item by item
+        if isinstance(old, list) and isinstance(new, list):
+            JsonPatch._diffList(old, new, path, patch)
+            return
+
+        # Replace the values of different types
+        patch.append({"op": "replace", "path": path, "value": new})
+
+    @staticmethod
+    def _diffList(old: List[Any], new: List[Any], path: str, patch: List[Dict[str, Any]]) -> None:
+        """Appends the operations that transform the old list into the new list at the given path.
+
+        The common head and tail of the lists are skipped, so inserting or removing a range of items produces only the
+        operations of that range, regardless of the length of the lists.
+
+        Args:
+            old (List[Any]): The old list.
+            new (List[Any]): The new list.
+            path (str): The JSON pointer of the lists.
+            patch (List[Dict[str, Any]]): The list of the patch operations to be extended.
+        """
+        # Skip the common head
+        start = 0
+        end = min(len(old), len(new))
+        while start < end and JsonPatch.equal(old[start], new[start]):
+            start += 1
+
+        # Skip the common tail
+        oldEnd = len(old)
+        newEnd = len(new)
+        while oldEnd > start and newEnd > start and JsonPatch.equal(old[oldEnd - 1], new[newEnd - 1]):
+            oldEnd -= 1
+            newEnd -= 1
+
+        # Compare the overlapping items of the changed range in place
+        common = min(oldEnd, newEnd) - start
+        for i in range(start, start + common):
+            JsonPatch._diff(old[i], new[i], f"{path}/{i}", patch)
+
+        # Insert the extra items of the new list
+        for i in range(start + common, newEnd):
+            patch.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+
+        # Remove the extra items of the old list, from the last one so the indexes stay valid
+        for i in reversed(range(start + common, oldEnd)):
+            patch.append({"op": "remove", "path": f"{path}/{i}"})
+
+    @staticmethod
+    def _escape(key: Any) -> str:
+        """Escapes a dictionary key as a JSON pointer token.
+
+        Args:
+            key: The dictionary key.
+
+        Returns:
+            str: The escaped token.
+        """
+        return str(key).replace("~", "~0").replace("/", "~1")
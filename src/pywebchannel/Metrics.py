@@ -0,0 +1,532 @@
+import bisect
+import collections
+import functools
+import time
+import weakref
+from typing import Any, Deque, Dict, List, MutableMapping, Optional, Tuple
+
+from PySide6.QtCore import QMetaMethod, QObject, Qt, QTimer, Slot
+
+
+class Histogram:
+    """A class that counts observed values in fixed buckets, i.e. the latencies of the calls of an action.
+
+    The buckets are fixed, so observing a value costs a binary search and an increment, and the quantiles are
+    estimated from the bucket counts.
+
+    Attributes:
+        bounds (Tuple[float, ...]): The upper bounds of the buckets, the last bucket has no upper bound.
+        counts (List[int]): The number of values in each bucket, including the last one.
+        count (int): The number of values.
+        sum (float): The sum of the values.
+    """
+
+    BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    """ The default upper bounds of the buckets, in milliseconds. """
+
+    def __init__(self, bounds: Tuple[float, ...] = BOUNDS) -> None:
+        """
+        The constructor method for the Histogram class.
+
+        Args:
+            bounds (Tuple[float, ...], optional): The ascending upper bounds of the buckets. Defaults to BOUNDS.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Counts a value in its bucket.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile of the values, interpolating within the bucket it falls into.
+
+        Args:
+            q (float): The quantile between 0 and 1, i.e. 0.95 for the 95th percentile.
+
+        Returns:
+            float: The estimated quantile, or 0 if there are no values. The values of the last bucket are estimated
+                as its lower bound.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count > 0 and seen + count >= rank:
+                if i == len(self.bounds):
+                    return float(self.bounds[-1])
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / count
+            seen += count
+        return float(self.bounds[-1])
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Returns the cumulative counts of the buckets.
+
+        Returns:
+            List[Tuple[float, int]]: The upper bounds with the number of values up to them, the last bound is inf.
+        """
+        result = []
+        seen = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the summary of the values.
+
+        Returns:
+            Dict[str, Any]: The count, sum, mean and the 50th, 95th and 99th percentiles of the values.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count > 0 else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class RateMeter:
+    """A class that counts events, i.e. messages or bytes, and measures their rate per second.
+
+    The rate is measured over windows of about a second, the rate of the last complete window is reported until the
+    current one is complete.
+
+    Attributes:
+        total (int): The number of events.
+    """
+
+    window = 1.0
+    """ The length of the measurement windows in seconds. """
+
+    def __init__(self) -> None:
+        """
+        The constructor method for the RateMeter class.
+        """
+        self.total = 0
+        self._windowStart = time.monotonic()
+        self._windowCount = 0
+        self._rate = 0.0
+
+    def mark(self, count: int = 1) -> None:
+        """Counts events.
+
+        Args:
+            count (int, optional): The number of events. Defaults to 1.
+        """
+        now = time.monotonic()
+        elapsed = now - self._windowStart
+        # Close the current window
+        if elapsed >= self.window:
+            self._rate = self._windowCount / elapsed
+            self._windowStart = now
+            self._windowCount = 0
+        self._windowCount += count
+        self.total += count
+
+    def rate(self) -> float:
+        """Returns the number of events per second.
+
+        Returns:
+            float: The rate of the current window if it is complete, otherwise the rate of the last complete window.
+        """
+        elapsed = time.monotonic() - self._windowStart
+        if elapsed >= self.window:
+            return self._windowCount / elapsed
+        return self._rate
+
+
+class ActionMetrics:
+    """A class that holds the metrics of an action of a controller.
+
+    Attributes:
+        calls (int): The number of calls.
+        errors (int): The number of calls which failed or replied with an error.
+        latency (Histogram): The latencies of the calls in milliseconds, until their responses are ready.
+        inboundBytes (int): The size of the call messages received from the clients.
+        outboundBytes (int): The size of the response messages sent to the clients.
+    """
+
+    def __init__(self) -> None:
+        """
+        The constructor method for the ActionMetrics class.
+        """
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.inboundBytes = 0
+        self.outboundBytes = 0
+
+    def record(self, start: float, response: Any) -> None:
+        """Records a finished call.
+
+        Args:
+            start (float): The time.perf_counter value at the start of the call.
+            response: The response of the call.
+        """
+        self.latency.observe((time.perf_counter() - start) * 1000)
+        self.calls += 1
+        if isinstance(response, dict) and response.get("error") is not None:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the metrics of the action.
+
+        Returns:
+            Dict[str, Any]: The counts, the latency summary in milliseconds and the sizes in bytes.
+        """
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency": self.latency.snapshot(),
+            "inboundBytes": self.inboundBytes,
+            "outboundBytes": self.outboundBytes,
+        }
+
+
+class SignalMetrics:
+    """A class that holds the metrics of a signal of a controller.
+
+    Attributes:
+        emissions (RateMeter): The emissions of the signal, after rate limiting.
+        messages (int): The number of signal messages sent to the clients, one per client per emission.
+        outboundBytes (int): The size of the signal messages sent to the clients.
+    """
+
+    def __init__(self) -> None:
+        """
+        The constructor method for the SignalMetrics class.
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the counters."""
+        self.emissions = RateMeter()
+        self.messages = 0
+        self.outboundBytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the metrics of the signal.
+
+        Returns:
+            Dict[str, Any]: The emission count and rate per second, the message count and the size in bytes.
+        """
+        return {
+            "emissions": self.emissions.total,
+            "emissionRate": self.emissions.rate(),
+            "messages": self.messages,
+            "outboundBytes": self.outboundBytes,
+        }
+
+
+class Metrics(QObject):
+    """A class that collects the metrics of the actions, the signals and the traffic of the web channel services.
+
+    The metrics are plain counters updated on the main thread, without locks. The actions are recorded by their
+    wrappers, the signals are counted by a slot without arguments, so their arguments are not converted, and the
+    traffic is recorded by the transports. The slot is connected to the watched signals only while the metrics are
+    enabled. The counters are shared by all the services of the process.
+
+    Nothing is recorded until the metrics are enabled, either by WebChannelService.serveMetrics or by setting the
+    enabled attribute of the shared object, so the services which do not use them pay nothing.
+
+    Attributes:
+        enabled (bool): Whether the metrics are recorded, False by default.
+        actions (Dict[Tuple[str, str], ActionMetrics]): The metrics of the actions, mapped by the controller names
+            and the action names.
+        signals (Dict[Tuple[str, str], SignalMetrics]): The metrics of the signals, mapped by the controller names
+            and the signal names.
+        inboundMessages (RateMeter): The messages received from the clients.
+        inboundBytes (RateMeter): The size of the frames received from the clients. The text frames are counted by
+            their length in characters.
+        outboundMessages (RateMeter): The messages sent to the clients.
+        outboundBytes (RateMeter): The size of the frames sent to the clients.
+        eventLoopLag (Histogram): The delays of the event loop in milliseconds, measured by the EventLoopProbe.
+        lastEventLoopLag (float): The last delay of the event loop in milliseconds.
+        stalls (int): The number of stalls of the event loop detected by the Watchdog.
+        stallDuration (Histogram): The durations of the stalls in milliseconds.
+        recentStalls (Deque[Dict[str, Any]]): The reports of the last stalls, see Watchdog.
+    """
+
+    recentStallCount = 20
+    """ The number of stall reports kept. """
+
+    _instance: Optional["Metrics"] = None
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initializes the Metrics object with the given parent.
+
+        Args:
+            parent (Optional[QObject], optional): The parent object for the Metrics. Defaults to None.
+        """
+        super().__init__(parent)
+        self._enabled = False
+        self.actions: Dict[Tuple[str, str], ActionMetrics] = {}
+        self.signals: Dict[Tuple[str, str], SignalMetrics] = {}
+        self.inboundMessages = RateMeter()
+        self.inboundBytes = RateMeter()
+        self.outboundMessages = RateMeter()
+        self.outboundBytes = RateMeter()
+        self.eventLoopLag = Histogram()
+        self.lastEventLoopLag = 0.0
+        self.stalls = 0
+        self.stallDuration = Histogram()
+        self.recentStalls: Deque[Dict[str, Any]] = collections.deque(maxlen=Metrics.recentStallCount)
+        # The metrics of the signals of the watched objects, mapped by the objects and then by the signal indexes. The
+        # objects are weak keys, so watching a controller does not keep it alive
+        self._signalIndexes: MutableMapping[QObject, Dict[int, SignalMetrics]] = weakref.WeakKeyDictionary()
+        # The metrics of the signals, mapped by the names of the watched objects and then by the signal indexes, they
+        # are dropped when the objects are destroyed
+        self._signalsByName: Dict[str, Dict[int, SignalMetrics]] = {}
+
+    @staticmethod
+    def instance() -> "Metrics":
+        """Returns the shared Metrics object, it is created on the first call.
+
+        Returns:
+            Metrics: The shared Metrics object.
+        """
+        if Metrics._instance is None:
+            Metrics._instance = Metrics()
+        return Metrics._instance
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if the metrics are recorded."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        """Enables or disables the metrics, and connects or disconnects the watched signals accordingly.
+
+        Args:
+            enabled (bool): True to record the metrics.
+        """
+        enabled = bool(enabled)
+        if enabled == self._enabled:
+            return
+        self._enabled = enabled
+        for obj in [*self._signalIndexes]:
+            self._connectSignals(obj, enabled)
+
+    def action(self, controllerName: str, actionName: str) -> ActionMetrics:
+        """Returns the metrics of an action, they are created on the first call.
+
+        Args:
+            controllerName (str): The name of the controller.
+            actionName (str): The name of the action.
+
+        Returns:
+            ActionMetrics: The metrics of the action.
+        """
+        metrics = self.actions.get((controllerName, actionName))
+        if metrics is None:
+            metrics = self.actions[(controllerName, actionName)] = ActionMetrics()
+        return metrics
+
+    def signalAt(self, objectName: str, signalIndex: Any) -> Optional[SignalMetrics]:
+        """Returns the metrics of a signal by the index the web channel sends it with.
+
+        Args:
+            objectName (str): The name of the object in the web channel.
+            signalIndex: The method index of the signal.
+
+        Returns:
+            Optional[SignalMetrics]: The metrics of the signal, or None if the object is not watched.
+        """
+        signals = self._signalsByName.get(objectName)
+        return signals.get(signalIndex) if signals is not None else None
+
+    def watchSignals(self, obj: QObject, objectName: str) -> None:
+        """Counts the emissions of the signals an object declares, i.e. the signals and properties of a controller.
+
+        Args:
+            obj (QObject): The object, which is published to the clients.
+            objectName (str): The name of the object in the web channel.
+        """
+        if obj in self._signalIndexes:
+            return
+        signals: Dict[int, SignalMetrics] = {}
+        metaObject = obj.metaObject()
+        # The signals of QObject itself, i.e. destroyed, are not published
+        for index in range(QObject.staticMetaObject.methodCount(), metaObject.methodCount()):
+            method = metaObject.method(index)
+            if method.methodType() != QMetaMethod.MethodType.Signal:
+                continue
+            signalName = method.name().data().decode()
+            metrics = self.signals.get((objectName, signalName))
+            if metrics is None:
+                metrics = self.signals[(objectName, signalName)] = SignalMetrics()
+            signals[index] = metrics
+        self._signalIndexes[obj] = signals
+        self._signalsByName[objectName] = signals
+        # The slot holds no reference to the object, only its name and its metrics
+        obj.destroyed.connect(functools.partial(self._forgetSignals, objectName, signals))
+        if self._enabled:
+            self._connectSignals(obj, True)
+
+    def _connectSignals(self, obj: QObject, connect: bool) -> None:
+        """Connects the watched signals of an object to the onSignalEmitted slot, or disconnects them.
+
+        Args:
+            obj (QObject): The watched object.
+            connect (bool): True to connect the signals, False to disconnect them.
+        """
+        metaObject = obj.metaObject()
+        # The overloads of a signal share its name, it is connected once
+        for signalName in {metaObject.method(index).name().data().decode() for index in self._signalIndexes[obj]}:
+            signal = getattr(obj, signalName)
+            # The slot takes no arguments, so the arguments of the signal are not converted for it
+            if connect:
+                signal.connect(self.onSignalEmitted)
+            else:
+                signal.disconnect(self.onSignalEmitted)
+
+    def _forgetSignals(self, objectName: str, signals: Dict[int, SignalMetrics]) -> None:
+        """Stops watching a destroyed object, the metrics of its signals are kept.
+
+        This method is invoked when a watched object emits its destroyed signal.
+
+        Args:
+            objectName (str): The name of the object in the web channel.
+            signals (Dict[int, SignalMetrics]): The metrics of the signals of the object, mapped by the signal indexes.
+        """
+        # Keep the metrics of another object published by the same name since
+        if self._signalsByName.get(objectName) is signals:
+            del self._signalsByName[objectName]
+        for obj in [obj for obj, indexes in self._signalIndexes.items() if indexes is signals]:
+            del self._signalIndexes[obj]
+
+    @Slot()
+    def onSignalEmitted(self) -> None:
+        """Counts an emission of a watched signal.
+
+        This slot is invoked when a watched object emits one of its signals, while the metrics are enabled.
+        """
+        signals = self._signalIndexes.get(self.sender())
+        if signals is None:
+            return
+        metrics = signals.get(self.senderSignalIndex())
+        if metrics is not None:
+            metrics.emissions.mark()
+
+    def reset(self) -> None:
+        """Clears the counters, the watched signals are still counted."""
+        for key in self.actions:
+            self.actions[key] = ActionMetrics()
+        for metrics in self.signals.values():
+            metrics.reset()
+        self.inboundMessages = RateMeter()
+        self.inboundBytes = RateMeter()
+        self.outboundMessages = RateMeter()
+        self.outboundBytes = RateMeter()
+        self.eventLoopLag = Histogram()
+        self.lastEventLoopLag = 0.0
+        self.stalls = 0
+        self.stallDuration = Histogram()
+        self.recentStalls.clear()
+
+    def recordStall(self, stall: Dict[str, Any]) -> None:
+        """Records a stall of the event loop.
+
+        Args:
+            stall (Dict[str, Any]): The report of the stall, with its duration in milliseconds, see Watchdog.
+        """
+        if not self.enabled:
+            return
+        self.stalls += 1
+        self.stallDuration.observe(stall["duration"])
+        self.recentStalls.append(stall)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns all the metrics.
+
+        Returns:
+            Dict[str, Any]: The metrics of the actions and the signals, mapped by the controller names and then by the
+                action and signal names, the totals and rates per second of the traffic, the delays of the event loop
+                in milliseconds, and its stalls.
+        """
+        actions: Dict[str, Dict[str, Any]] = {}
+        for (controllerName, actionName), metrics in self.actions.items():
+            actions.setdefault(controllerName, {})[actionName] = metrics.snapshot()
+        signals: Dict[str, Dict[str, Any]] = {}
+        for (objectName, signalName), metrics in self.signals.items():
+            signals.setdefault(objectName, {})[signalName] = metrics.snapshot()
+        return {
+            "actions": actions,
+            "signals": signals,
+            "inbound": {
+                "messages": self.inboundMessages.total,
+                "messageRate": self.inboundMessages.rate(),
+                "bytes": self.inboundBytes.total,
+                "byteRate": self.inboundBytes.rate(),
+            },
+            "outbound": {
+                "messages": self.outboundMessages.total,
+                "messageRate": self.outboundMessages.rate(),
+                "bytes": self.outboundBytes.total,
+                "byteRate": self.outboundBytes.rate(),
+            },
+            "eventLoop": {"lag": self.lastEventLoopLag, "lagSummary": self.eventLoopLag.snapshot()},
+            "stalls": {"count": self.stalls, "duration": self.stallDuration.snapshot(), "recent": [*self.recentStalls]},
+        }
+
+
+class EventLoopProbe(QObject):
+    """A class that measures the delay of the Qt event loop, which is how long the events wait to be processed.
+
+    A precise single shot timer is armed again on every timeout, so the time it fires later than its interval is the
+    time the event loop was busy with other events. The delays are recorded in the shared Metrics object.
+
+    Attributes:
+        interval (int): The interval of the timer in milliseconds.
+    """
+
+    def __init__(self, interval: int = 100, parent: Optional[QObject] = None) -> None:
+        """Initializes the EventLoopProbe object with the given interval and parent.
+
+        Args:
+            interval (int, optional): The interval of the timer in milliseconds. Defaults to 100.
+            parent (Optional[QObject], optional): The parent object for the EventLoopProbe. Defaults to None.
+        """
+        super().__init__(parent)
+        self.interval = interval
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.onTimeout)
+        self._armedAt = 0.0
+
+    def start(self) -> None:
+        """Starts measuring the delays."""
+        self._armedAt = time.perf_counter()
+        self._timer.start(self.interval)
+
+    def stop(self) -> None:
+        """Stops measuring the delays."""
+        self._timer.stop()
+
+    @Slot()
+    def onTimeout(self) -> None:
+        """Records how late the timer fired, and arms it again.
+
+        This slot is invoked by the timer.
+        """
+        lag = max(0.0, (time.perf_counter() - self._armedAt) * 1000 - self.interval)
+        metrics = Metrics.instance()
+        if metrics.enabled:
+            metrics.lastEventLoopLag = lag
+            metrics.eventLoopLag.observe(lag)
+        self.start()
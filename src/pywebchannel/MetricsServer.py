@@ -0,0 +1,300 @@
+import math
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QByteArray, QObject, Slot
+from PySide6.QtNetwork import QHostAddress, QTcpServer, QTcpSocket
+
+from pywebchannel.Metrics import EventLoopProbe, Histogram, Metrics
+from pywebchannel.Utils import Logger
+
+
+# A class that represents a metrics HTTP endpoint
+class MetricsServer(QObject):
+    """A class that serves the metrics of the web channel services in the OpenMetrics text format over HTTP.
+
+    The server answers GET requests to the metrics path on its own port, so a Prometheus compatible monitoring stack
+    can scrape every backend instance. It runs on the Qt event loop, the metrics are formatted when they are scraped.
+
+    Attributes:
+        port (int): The port number of the HTTP endpoint.
+        path (str): The path of the metrics.
+        services (List[WebChannelService]): The services whose clients and queues are reported.
+        server (QTcpServer): The TCP server that accepts the scrape connections.
+        probe (EventLoopProbe): The probe that measures the delay of the event loop.
+    """
+
+    contentType = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+    """ The content type of the metrics. """
+
+    prefix = "pywebchannel"
+    """ The prefix of the metric names. """
+
+    def __init__(self, port: int, path: str = "/metrics", parent: Optional[QObject] = None) -> None:
+        """Initializes the MetricsServer object with the given port, path and parent.
+
+        Args:
+            port (int): The port number of the HTTP endpoint.
+            path (str, optional): The path of the metrics. Defaults to "/metrics".
+            parent (Optional[QObject], optional): The parent object for the MetricsServer. Defaults to None.
+        """
+        super().__init__(parent)
+        self.port = port
+        self.path = path
+        self.services = []
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self.onNewConnection)
+        self.probe = EventLoopProbe(parent=self)
+        # The request bytes received so far, mapped by the sockets
+        self._requests: Dict[QTcpSocket, bytes] = {}
+
+    def addService(self, service) -> None:
+        """Reports the clients and queues of a web channel service.
+
+        Args:
+            service (WebChannelService): The web channel service.
+        """
+        if service not in self.services:
+            self.services.append(service)
+
+    def start(self) -> bool:
+        """Starts listening for the scrape requests and measuring the delay of the event loop.
+
+        Returns:
+            bool: True if the server is started successfully, False otherwise.
+        """
+        if not self.server.listen(QHostAddress.Any, self.port):
+            Logger.error(f"Failed to start the metrics endpoint at {self.port}", "MetricsServer")
+            return False
+        self.probe.start()
+        Logger.info(f"Metrics are served at PORT={self.port}{self.path}", "MetricsServer")
+        return True
+
+    @Slot()
+    def stop(self) -> None:
+        """Stops listening for the scrape requests and measuring the delay of the event loop."""
+        self.probe.stop()
+        self.server.close()
+
+    @Slot()
+    def onNewConnection(self) -> None:
+        """Accepts the pending scrape connections.
+
+        This slot is invoked when the server emits the newConnection signal.
+        """
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._requests[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self.onReadyRead(s))
+            socket.disconnected.connect(lambda s=socket: self._close(s))
+
+    def onReadyRead(self, socket: QTcpSocket) -> None:
+        """Reads the request of a scrape connection and answers it once its headers are complete.
+
+        Args:
+            socket (QTcpSocket): The scrape connection.
+        """
+        request = self._requests.get(socket, b"") + socket.readAll().data()
+        # Wait for the end of the headers, the requests have no body
+        if b"\r\n\r\n" not in request:
+            # Drop the connections which send too much
+            if len(request) > 8192:
+                self._close(socket)
+            else:
+                self._requests[socket] = request
+            return
+
+        requestLine = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+        method = requestLine[0]
+        target = requestLine[1] if len(requestLine) > 1 else ""
+        if method != "GET":
+            self._respond(socket, "405 Method Not Allowed", "text/plain", b"Method Not Allowed\n")
+        elif target.split("?", 1)[0] != self.path:
+            self._respond(socket, "404 Not Found", "text/plain", b"Not Found\n")
+        else:
+            self._respond(socket, "200 OK", MetricsServer.contentType, self.exposition().encode())
+
+    def _respond(self, socket: QTcpSocket, status: str, contentType: str, body: bytes) -> None:
+        """Sends a response and closes the connection.
+
+        Args:
+            socket (QTcpSocket): The scrape connection.
+            status (str): The status line of the response, i.e. "200 OK".
+            contentType (str): The content type of the body.
+            body (bytes): The body of the response.
+        """
+        head = f"HTTP/1.1 {status}\r\nContent-Type: {contentType}\r\nContent-Length: {len(body)}\r\n" \
+               f"Connection: close\r\n\r\n"
+        socket.write(QByteArray(head.encode("latin-1") + body))
+        self._requests.pop(socket, None)
+        socket.disconnectFromHost()
+
+    def _close(self, socket: QTcpSocket) -> None:
+        """Forgets a scrape connection and deletes its socket.
+
+        Args:
+            socket (QTcpSocket): The scrape connection.
+        """
+        if self._requests.pop(socket, None) is not None:
+            socket.abort()
+        socket.deleteLater()
+
+    def exposition(self) -> str:
+        """Formats the metrics of the process and the services in the OpenMetrics text format.
+
+        Returns:
+            str: The metrics, terminated by the EOF marker.
+        """
+        metrics = Metrics.instance()
+        writer = _MetricWriter(MetricsServer.prefix)
+
+        # The clients and the outgoing queues of the services
+        writer.family("clients", "gauge", "The number of connected clients.")
+        for service in self.services:
+            writer.sample("clients", {"service": service.serviceName}, service.activeClientCount)
+        writer.family("client_send_queue_bytes", "gauge", "The bytes waiting in the socket buffer of a client.")
+        for service in self.services:
+            for transport in service.transports:
+                socket = transport.socket
+                client = f"{socket.peerAddress().toString()}:{socket.peerPort()}"
+                labels = {"service": service.serviceName, "client": client}
+                writer.sample("client_send_queue_bytes", labels, transport.bytesToWrite())
+
+        # The traffic, as counters and as rates per second
+        for direction, messages, size in (
+                ("inbound", metrics.inboundMessages, metrics.inboundBytes),
+                ("outbound", metrics.outboundMessages, metrics.outboundBytes),
+        ):
+            writer.family(f"{direction}_messages", "counter", f"The {direction} messages.")
+            writer.sample(f"{direction}_messages_total", {}, messages.total)
+            writer.family(f"{direction}_bytes", "counter", f"The size of the {direction} frames.")
+            writer.sample(f"{direction}_bytes_total", {}, size.total)
+            writer.family(f"{direction}_messages_per_second", "gauge", f"The rate of the {direction} messages.")
+            writer.sample(f"{direction}_messages_per_second", {}, messages.rate())
+            writer.family(f"{direction}_bytes_per_second", "gauge", f"The rate of the {direction} bytes.")
+            writer.sample(f"{direction}_bytes_per_second", {}, size.rate())
+
+        # The actions, their latencies are converted to seconds
+        actions = sorted(metrics.actions.items())
+        writer.family("action_calls", "counter", "The calls of an action.")
+        for (controller, action), actionMetrics in actions:
+            writer.sample("action_calls_total", {"controller": controller, "action": action}, actionMetrics.calls)
+        writer.family("action_errors", "counter", "The calls of an action which failed.")
+        for (controller, action), actionMetrics in actions:
+            writer.sample("action_errors_total", {"controller": controller, "action": action}, actionMetrics.errors)
+        writer.family("action_latency_seconds", "histogram", "The latency of the calls of an action.")
+        for (controller, action), actionMetrics in actions:
+            writer.histogram("action_latency_seconds", {"controller": controller, "action": action},
+                             actionMetrics.latency)
+        for direction in ("inbound", "outbound"):
+            writer.family(f"action_{direction}_bytes", "counter", f"The {direction} bytes of the calls of an action.")
+            for (controller, action), actionMetrics in actions:
+                writer.sample(f"action_{direction}_bytes_total", {"controller": controller, "action": action},
+                              getattr(actionMetrics, f"{direction}Bytes"))
+
+        # The signals
+        signals = sorted(metrics.signals.items())
+        writer.family("signal_emissions", "counter", "The emissions of a signal.")
+        for (controller, signal), signalMetrics in signals:
+            writer.sample("signal_emissions_total", {"controller": controller, "signal": signal},
+                          signalMetrics.emissions.total)
+        writer.family("signal_outbound_bytes", "counter", "The size of the messages of a signal sent to the clients.")
+        for (controller, signal), signalMetrics in signals:
+            writer.sample("signal_outbound_bytes_total", {"controller": controller, "signal": signal},
+                          signalMetrics.outboundBytes)
+
+        # The delay of the event loop
+        writer.family("event_loop_lag_seconds", "gauge", "The last delay of the event loop.")
+        writer.sample("event_loop_lag_seconds", {}, metrics.lastEventLoopLag / 1000)
+        writer.family("event_loop_lag_distribution_seconds", "histogram", "The delays of the event loop.")
+        writer.histogram("event_loop_lag_distribution_seconds", {}, metrics.eventLoopLag)
+        writer.family("event_loop_stalls", "counter", "The stalls of the event loop detected by the watchdog.")
+        writer.sample("event_loop_stalls_total", {}, metrics.stalls)
+        writer.family("event_loop_stall_duration_seconds", "histogram",
+                      "The durations of the stalls of the event loop.")
+        writer.histogram("event_loop_stall_duration_seconds", {}, metrics.stallDuration)
+
+        return writer.text()
+
+
+class _MetricWriter:
+    """A helper class that formats the metric families and samples in the OpenMetrics text format."""
+
+    def __init__(self, prefix: str) -> None:
+        """
+        The constructor method for the _MetricWriter class.
+
+        Args:
+            prefix (str): The prefix of the metric names.
+        """
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def family(self, name: str, metricType: str, description: str) -> None:
+        """Writes the metadata of a metric family.
+
+        Args:
+            name (str): The name of the family, without the prefix.
+            metricType (str): The OpenMetrics type, i.e. "counter", "gauge" or "histogram".
+            description (str): The help text of the family.
+        """
+        self.lines.append(f"# TYPE {self.prefix}_{name} {metricType}")
+        self.lines.append(f"# HELP {self.prefix}_{name} {description}")
+
+    def sample(self, name: str, labels: Dict[str, str], value: float) -> None:
+        """Writes a sample.
+
+        Args:
+            name (str): The name of the sample, without the prefix.
+            labels (Dict[str, str]): The labels of the sample.
+            value (float): The value of the sample.
+        """
+        labelText = ",".join(f'{key}="{_MetricWriter.escape(str(item))}"' for key, item in labels.items())
+        self.lines.append(f"{self.prefix}_{name}{{{labelText}}} {_MetricWriter.number(value)}" if labelText
+                          else f"{self.prefix}_{name} {_MetricWriter.number(value)}")
+
+    def histogram(self, name: str, labels: Dict[str, str], histogram: Histogram) -> None:
+        """Writes the samples of a histogram of milliseconds, in seconds.
+
+        Args:
+            name (str): The name of the histogram, without the prefix.
+            labels (Dict[str, str]): The labels of the histogram.
+            histogram (Histogram): The histogram.
+        """
+        for bound, count in histogram.buckets():
+            self.sample(f"{name}_bucket", {**labels, "le": _MetricWriter.number(bound / 1000)}, count)
+        self.sample(f"{name}_count", labels, histogram.count)
+        self.sample(f"{name}_sum", labels, histogram.sum / 1000)
+
+    def text(self) -> str:
+        """Returns the formatted metrics.
+
+        Returns:
+            str: The lines of the metrics, terminated by the EOF marker.
+        """
+        return "\n".join([*self.lines, "# EOF"]) + "\n"
+
+    @staticmethod
+    def escape(value: str) -> str:
+        """Escapes a label value.
+
+        Args:
+            value (str): The label value.
+
+        Returns:
+            str: The value with the backslashes, double quotes and line feeds escaped.
+        """
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def number(value: float) -> str:
+        """Formats a number.
+
+        Args:
+            value (float): The number.
+
+        Returns:
+            str: The number, "+Inf" for infinity.
+        """
+        if isinstance(value, float) and math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value) if isinstance(value, float) else str(value)
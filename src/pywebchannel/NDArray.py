@@ -0,0 +1,144 @@
+import base64
+import typing
+from typing import Any, Dict, Optional
+
+try:
+    import numpy
+except ImportError:
+    # NumPy support is optional, install with 'pip install pywebchannel[numpy]'
+    numpy = None
+
+
+class NDArray:
+    """A class that converts NumPy arrays to and from their web format.
+
+    An array is sent as a descriptor of its dtype, its shape and its raw little-endian buffer encoded in base64, i.e.
+    {"__ndarray__": "AAAAAAAA8D8AAAAAAAAAQA==", "dtype": "float64", "shape": [2]}. The frontend decodes the buffer
+    once and views it as a typed array of the dtype, i.e. Float64Array, without converting the items one by one.
+
+    Attributes:
+        TYPED_ARRAYS (Dict[str, str]): The supported dtypes, mapped to the TypeScript typed arrays which view them.
+    """
+
+    TYPED_ARRAYS = {
+        "bool": "Uint8Array",
+        "int8": "Int8Array",
+        "uint8": "Uint8Array",
+        "int16": "Int16Array",
+        "uint16": "Uint16Array",
+        "int32": "Int32Array",
+        "uint32": "Uint32Array",
+        "int64": "BigInt64Array",
+        "uint64": "BigUint64Array",
+        "float32": "Float32Array",
+        "float64": "Float64Array",
+    }
+
+    @staticmethod
+    def is_ndarray(var_type: Any) -> bool:
+        """Returns whether the given type is a NumPy array type, i.e. numpy.ndarray or numpy.typing.NDArray[float64].
+
+        Args:
+            var_type: The type to be checked.
+
+        Returns:
+            bool: True if the type is a NumPy array type, False otherwise. Always False if NumPy is not installed.
+        """
+        if numpy is None:
+            return False
+        return var_type is numpy.ndarray or typing.get_origin(var_type) is numpy.ndarray
+
+    @staticmethod
+    def is_array(value: Any) -> bool:
+        """Returns whether the given value is a NumPy array.
+
+        Args:
+            value: The value to be checked.
+
+        Returns:
+            bool: True if the value is a NumPy array, False otherwise. Always False if NumPy is not installed.
+        """
+        return numpy is not None and isinstance(value, numpy.ndarray)
+
+    @staticmethod
+    def dtype_of(var_type: Any) -> Optional[str]:
+        """Returns the dtype name of a NumPy array type, i.e. "float64" for numpy.typing.NDArray[numpy.float64].
+
+        Args:
+            var_type: The NumPy array type.
+
+        Returns:
+            Optional[str]: The dtype name, or None if the type does not specify a dtype.
+        """
+        # The arguments of ndarray[shape, dtype[scalar]] types
+        typeArgs = typing.get_args(var_type)
+        if len(typeArgs) != 2:
+            return None
+        scalarArgs = typing.get_args(typeArgs[1])
+        if len(scalarArgs) != 1 or not isinstance(scalarArgs[0], type):
+            return None
+        return numpy.dtype(scalarArgs[0]).name
+
+    @staticmethod
+    def encode(array: Any) -> Optional[Dict[str, Any]]:
+        """Converts a NumPy array to its web format.
+
+        Args:
+            array: The NumPy array, or None.
+
+        Returns:
+            Optional[Dict[str, Any]]: The descriptor of the array, or None if the array is None.
+
+        Raises:
+            Exception: If the dtype of the array is not supported.
+        """
+        if array is None:
+            return None
+
+        dtype = array.dtype.name
+        if dtype not in NDArray.TYPED_ARRAYS:
+            raise Exception(f"Arrays of dtype '{dtype}' are not supported, use one of {list(NDArray.TYPED_ARRAYS)}")
+
+        # The buffer is sent in little-endian byte order and row-major item order
+        buffer = numpy.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<")).tobytes()
+        return {"__ndarray__": base64.b64encode(buffer).decode("ascii"), "dtype": dtype, "shape": list(array.shape)}
+
+    @staticmethod
+    def decode(arg: Any, dtype: Optional[str] = None) -> Any:
+        """Converts a NumPy array from its web format.
+
+        Args:
+            arg: The descriptor of the array. Nested lists of numbers are accepted too.
+            dtype (Optional[str], optional): The dtype of the nested lists. Defaults to None, which selects the dtype
+                NumPy infers from the items.
+
+        Returns:
+            The writable NumPy array, or None if the argument is None.
+        """
+        if arg is None:
+            return None
+
+        # Arrays may be sent as nested lists of numbers too
+        if not isinstance(arg, dict):
+            return numpy.array(arg, dtype=dtype)
+
+        buffer = bytearray(base64.b64decode(arg["__ndarray__"]))
+        array = numpy.frombuffer(buffer, dtype=numpy.dtype(arg["dtype"]).newbyteorder("<"))
+        return array.reshape(arg["shape"])
+
+    @staticmethod
+    def equal(a: Any, b: Any) -> bool:
+        """Returns whether two NumPy arrays have the same dtype, shape and items.
+
+        Args:
+            a: The first array, or None.
+            b: The second array, or None.
+
+        Returns:
+            bool: True if the arrays are equal, False otherwise.
+        """
+        if a is b:
+            return True
+        if a is None or b is None:
+            return False
+        return a.dtype == b.dtype and numpy.array_equal(a, b)
@@ -0,0 +1,103 @@
+from typing import Callable, Dict, Hashable, Optional
+
+from PySide6.QtCore import QObject, QTimer, Slot
+
+
+class NotifyScheduler(QObject):
+    """A class that delays notifications to the end of a time window and collapses the ones in the same window.
+
+    Every notification is scheduled with a window length and a key. The notifications with the same key replace each
+    other until the window is over, so only the latest one is delivered. The windows with the same length share one
+    timer, regardless of how many controllers or properties use them.
+
+    Attributes:
+        _timers (Dict[int, QTimer]): The timers of the windows, mapped by the window lengths in milliseconds.
+        _pending (Dict[int, Dict[Hashable, Callable[[], None]]]): The pending notifications of the windows, mapped by
+            the window lengths in milliseconds and then by the notification keys.
+    """
+
+    _instance: Optional["NotifyScheduler"] = None
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initializes the NotifyScheduler object with the given parent.
+
+        Args:
+            parent (Optional[QObject], optional): The parent object for the NotifyScheduler. Defaults to None.
+        """
+        super().__init__(parent)
+        self._timers: Dict[int, QTimer] = {}
+        self._pending: Dict[int, Dict[Hashable, Callable[[], None]]] = {}
+
+    @staticmethod
+    def instance() -> "NotifyScheduler":
+        """Returns the shared NotifyScheduler object, it is created on the first call.
+
+        Returns:
+            NotifyScheduler: The shared NotifyScheduler object.
+        """
+        if NotifyScheduler._instance is None:
+            NotifyScheduler._instance = NotifyScheduler()
+        return NotifyScheduler._instance
+
+    def schedule(self, window: int, key: Hashable, notify: Callable[[], None]) -> None:
+        """Schedules a notification to the end of the current window, it replaces the pending one with the same key.
+
+        Args:
+            window (int): The window length in milliseconds.
+            key (Hashable): The key of the notification, i.e. the controller and the property name.
+            notify (Callable[[], None]): The function which delivers the notification.
+        """
+        # Get the pending notifications of the window
+        pending = self._pending.setdefault(window, {})
+        # Replace the pending notification with the same key
+        pending[key] = notify
+
+        # Get the timer of the window, create it for the first use
+        timer = self._timers.get(window)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(window)
+            timer.timeout.connect(lambda: self.flush(window))
+            self._timers[window] = timer
+
+        # Start the window if it is not running
+        if not timer.isActive():
+            timer.start()
+
+    def cancel(self, key: Hashable) -> None:
+        """Removes the pending notifications with the given key from all windows.
+
+        Args:
+            key (Hashable): The key of the notification.
+        """
+        for pending in self._pending.values():
+            pending.pop(key, None)
+
+    def flushAll(self) -> None:
+        """Delivers the pending notifications of all windows right away, i.e. before a client reads the values."""
+        for window, timer in [*self._timers.items()]:
+            timer.stop()
+            self.flush(window)
+
+    @Slot(int)
+    def flush(self, window: int) -> None:
+        """Delivers the pending notifications of a window.
+
+        This slot is invoked when the timer of the window times out.
+
+        Args:
+            window (int): The window length in milliseconds.
+        """
+        # Take the pending notifications, the ones scheduled while delivering go into the next window
+        pending = self._pending.get(window)
+        if not pending:
+            return
+        self._pending[window] = {}
+
+        for notify in pending.values():
+            try:
+                notify()
+            except RuntimeError:
+                # The controller is deleted while its notification was pending
+                pass
@@ -0,0 +1,231 @@
+import secrets
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pywebchannel.Utils import Logger
+
+
+class Span:
+    """A class to represent a timed phase of the work, i.e. the call of an action or the conversion of its arguments.
+
+    The spans of a call share the trace identifier, which is given by the client to correlate its own events with
+    them, and refer to their parents by the span identifiers.
+
+    Attributes:
+        name (str): The name of the span, i.e. "TodoController.getTodos" or "convert".
+        traceId (str): The identifier of the trace the span belongs to.
+        spanId (str): The identifier of the span.
+        parentId (Optional[str]): The identifier of the parent span, or None for a root span.
+        attributes (Dict[str, Any]): The attributes of the span.
+        startTime (int): The start time in nanoseconds since the epoch.
+        endTime (Optional[int]): The end time in nanoseconds since the epoch, or None if the span is not ended.
+        error (Optional[str]): The error the span ended with, if any.
+    """
+
+    def __init__(
+            self,
+            tracer: "Tracer",
+            name: str,
+            traceId: str,
+            parentId: Optional[str] = None,
+            attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        The constructor method for the Span class.
+
+        Args:
+            tracer (Tracer): The tracer whose hooks are called when the span ends.
+            name (str): The name of the span.
+            traceId (str): The identifier of the trace the span belongs to.
+            parentId (str, optional): The identifier of the parent span. Defaults to None.
+            attributes (Dict[str, Any], optional): The attributes of the span. Defaults to None.
+        """
+        self.name = name
+        self.traceId = traceId
+        self.spanId = secrets.token_hex(8)
+        self.parentId = parentId
+        self.attributes = attributes or {}
+        self.startTime = time.time_ns()
+        self.endTime: Optional[int] = None
+        self.error: Optional[str] = None
+        self._tracer = tracer
+        # The callables returned by the hooks, they are called when the span ends
+        self._onEnd: List[Callable[["Span"], None]] = []
+
+    @property
+    def duration(self) -> float:
+        """Returns the duration of the span in milliseconds, up to now if it is not ended."""
+        return ((self.endTime or time.time_ns()) - self.startTime) / 1e6
+
+    def child(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> "Span":
+        """Starts a child span of the span.
+
+        Args:
+            name (str): The name of the child span.
+            attributes (Dict[str, Any], optional): The attributes of the child span. Defaults to None.
+
+        Returns:
+            Span: The child span, which must be ended.
+        """
+        return self._tracer.startSpan(name, self, attributes=attributes)
+
+    def end(self, error: Optional[str] = None) -> None:
+        """Ends the span and passes it to the end callables of the hooks, a span ends once.
+
+        Args:
+            error (str, optional): The error the span ended with. Defaults to None.
+        """
+        if self.endTime is not None:
+            return
+        self.endTime = time.time_ns()
+        self.error = error
+        for onEnd in self._onEnd:
+            self._tracer.callHook(onEnd, self)
+
+    def __enter__(self) -> "Span":
+        """Returns the span, which is ended when the block is exited."""
+        return self
+
+    def __exit__(self, excType, exc, _) -> None:
+        """Ends the span, with the error of the exception raised in the block, if any."""
+        self.end(str(exc) if exc is not None else None)
+
+
+class _NoSpan:
+    """A helper class that stands for a child span when the call is not traced, so the phases need no checks."""
+
+    def end(self, error: Optional[str] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+_noSpan = _NoSpan()
+
+
+class Tracer:
+    """A class that opens the spans of the action calls and passes them to the registered hooks.
+
+    Tracing has no dependency on a tracing SDK, the hooks export the spans wherever they want, i.e. to OpenTelemetry
+    or to a log. A hook is a callable which is called with each span when it starts, and which may return a callable
+    that is called with the span when it ends. Nothing is traced while no hook is registered.
+
+    Each call of an action is a root span named after the controller and the action, with the child spans of its
+    phases: "convert" for the conversion of the arguments, "call" for the function body, until the result of a
+    coroutine or an executor is ready, "notify" for the emission of the notification and "serialize" for the
+    conversion of the result to the response. The trace identifier of a call is the "trace" field of its invoke
+    message if the client sends one, see BaseAPI.trace, otherwise a new one.
+
+    Attributes:
+        hooks (List[Callable[[Span], Optional[Callable[[Span], None]]]]): The registered hooks.
+    """
+
+    _instance: Optional["Tracer"] = None
+
+    maxTraceIdLength = 128
+    """ The maximum length of a trace identifier given by a client, the longer ones are replaced. """
+
+    def __init__(self) -> None:
+        """
+        The constructor method for the Tracer class.
+        """
+        self.hooks: List[Callable[[Span], Optional[Callable[[Span], None]]]] = []
+
+    @staticmethod
+    def instance() -> "Tracer":
+        """Returns the shared Tracer object, it is created on the first call.
+
+        Returns:
+            Tracer: The shared Tracer object.
+        """
+        if Tracer._instance is None:
+            Tracer._instance = Tracer()
+        return Tracer._instance
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if any hook is registered."""
+        return len(self.hooks) > 0
+
+    def addHook(self, hook: Callable[[Span], Optional[Callable[[Span], None]]]) -> None:
+        """Registers a hook, which is called with each span when it starts.
+
+        Args:
+            hook (Callable[[Span], Optional[Callable[[Span], None]]]): The hook, it may return a callable which is
+                called with the span when it ends.
+        """
+        if hook not in self.hooks:
+            self.hooks.append(hook)
+
+    def removeHook(self, hook: Callable[[Span], Optional[Callable[[Span], None]]]) -> None:
+        """Unregisters a hook, the spans which are already started still call their end callables.
+
+        Args:
+            hook (Callable[[Span], Optional[Callable[[Span], None]]]): The hook.
+        """
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def startSpan(
+            self,
+            name: str,
+            parent: Optional[Span] = None,
+            traceId: Optional[str] = None,
+            attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """Starts a span and calls the hooks with it.
+
+        Args:
+            name (str): The name of the span.
+            parent (Span, optional): The parent span. Defaults to None, which starts a root span.
+            traceId (str, optional): The trace identifier of a root span, i.e. given by the client. Defaults to None,
+                which uses the trace of the parent or a new one.
+            attributes (Dict[str, Any], optional): The attributes of the span. Defaults to None.
+
+        Returns:
+            Span: The span, which must be ended.
+        """
+        if parent is not None:
+            traceId = parent.traceId
+        elif not isinstance(traceId, str) or not 0 < len(traceId) <= Tracer.maxTraceIdLength:
+            traceId = secrets.token_hex(16)
+        span = Span(self, name, traceId, parent.spanId if parent is not None else None, attributes)
+        for hook in self.hooks:
+            onEnd = self.callHook(hook, span)
+            if callable(onEnd):
+                span._onEnd.append(onEnd)
+        return span
+
+    @staticmethod
+    def child(parent: Optional[Span], name: str) -> Span | _NoSpan:
+        """Starts a child span of a span which may be None, to be used in a with statement.
+
+        Args:
+            parent (Optional[Span]): The parent span, or None if the work is not traced.
+            name (str): The name of the child span.
+
+        Returns:
+            Span | _NoSpan: The child span, or a placeholder which does nothing if the parent is None.
+        """
+        return parent.child(name) if parent is not None else _noSpan
+
+    @staticmethod
+    def callHook(hook: Callable[[Span], Any], span: Span) -> Any:
+        """Calls a hook or an end callable, its errors are logged so they do not break the call being traced.
+
+        Args:
+            hook (Callable[[Span], Any]): The hook or the end callable.
+            span (Span): The span.
+
+        Returns:
+            Any: The return value of the hook, or None if it raised an exception.
+        """
+        try:
+            return hook(span)
+        except Exception as e:
+            Logger.error(f"Tracing hook failed: {e}", "Tracer")
+            return None
@@ -1,12 +1,21 @@
+import atexit
 import inspect
+import json
 import pprint
+import queue
+import re
 import sys
+import threading
+import time
 from datetime import datetime
 from inspect import signature
+from typing import Dict, List, Optional, TextIO, Tuple
 
 import colorama
 from colorama import Fore, Back
 
+from pywebchannel.NDArray import NDArray
+
 
 class Utils:
     """A class that provides some utility methods for working with types and signatures.
@@ -85,8 +94,14 @@ class Utils:
             t: A type object that represents the type to be converted.
 
         Returns:
-            A string that represents the type, with the format 'list[<type>]' for list types.
+            A string that represents the type, with the format 'list[<type>]' for list types and 'ndarray[<dtype>]'
+            for NumPy array types.
         """
+        # If the type is a NumPy array type, keep its dtype
+        if NDArray.is_ndarray(t):
+            dtype = NDArray.dtype_of(t)
+            return f"ndarray[{dtype}]" if dtype is not None else "ndarray"
+
         # If the type is a list type
         if t.__name__.lower() == "list":
             # Return the string representation of the list type with the element type
@@ -120,6 +135,14 @@ class Utils:
             # Recursively simplify the element type and add the brackets
             return f"list[{Utils.simplyVariableType(text)}]"
         else:
+            # NumPy array types keep only their dtype, i.e. numpy.ndarray[..., numpy.dtype[numpy.float64]]
+            ndarrayMatch = re.fullmatch(r"(?:\w+\.)*(?:ndarray|NDArray)(\[.*])?", text)
+            if ndarrayMatch is not None:
+                # The dtype is the last name in the brackets
+                dtype = re.search(r"(\w+)]*$", ndarrayMatch.group(1) or "")
+                dtype = dtype.group(1).removesuffix("_") if dtype is not None else ""
+                return f"ndarray[{dtype}]" if dtype in NDArray.TYPED_ARRAYS else "ndarray"
+
             # Remove package information and keep only last part
             text = text.split(".")[-1]
             # Return the simplified type
@@ -151,6 +174,43 @@ class Utils:
         # Return False and an empty string
         return False, ""
 
+    @staticmethod
+    def splitTopLevel(text: str, separator: str) -> list[str]:
+        """Splits a string by a separator, skipping the separators inside brackets, i.e. the ones of generic types.
+
+        Args:
+            text: A string to be split.
+            separator: A single character separator.
+
+        Returns:
+            A list of the parts of the string.
+        """
+        parts = []
+        depth = 0
+        start = 0
+        for i, char in enumerate(text):
+            if char == "[":
+                depth += 1
+            elif char == "]":
+                depth -= 1
+            elif char == separator and depth == 0:
+                parts.append(text[start:i])
+                start = i + 1
+        parts.append(text[start:])
+        return parts
+
+    @staticmethod
+    def dependencyOf(text: str) -> str:
+        """Returns the name of the type which a TypeScript type depends on.
+
+        Args:
+            text: A string that represents the TypeScript type, i.e. 'Todo[]' or 'NDArray<Float64Array>'.
+
+        Returns:
+            A string that represents the type without the array notation and the type arguments, i.e. 'NDArray'.
+        """
+        return text.replace("[]", "").split("<")[0]
+
     @staticmethod
     def isTypescriptPrimitive(text: str) -> bool:
         """Checks if a string representation of a type is a TypeScript primitive type.
@@ -172,7 +232,8 @@ class Utils:
             text: A string that represents the Python type to be converted.
 
         Returns:
-            A string that represents the TypeScript type, with the format '<type>[]' for list types.
+            A string that represents the TypeScript type, with the format '<type>[]' for list types and
+            'NDArray<<typed array>>' for NumPy array types.
         """
         # Check if the type is a list type and get the prefix
         _isList, _listPrefix = Utils.isList(text)
@@ -184,6 +245,11 @@ class Utils:
             text = text.removesuffix("]")
             # Recursively convert the element type and add the brackets
             return f"{Utils.convertType(text)}[]"
+        elif text.startswith("ndarray"):  # If the type is a NumPy array type
+            # View the buffer as the typed array of the dtype, i.e. NDArray<Float64Array> for ndarray[float64]
+            dtype = text.removeprefix("ndarray[").removesuffix("]")
+            typedArray = NDArray.TYPED_ARRAYS.get(dtype)
+            return f"NDArray<{typedArray}>" if typedArray is not None else "NDArray"
         else:  # If the type is not a list type
             # Look up the type in the map and get the corresponding TypeScript type
             newType = Utils.VARIABLE_TYPE_MAP.get(text)
@@ -254,8 +320,8 @@ class Utils:
             # Remove leading and ending parentheses
             inputPartStr = inputPartStr.removeprefix("(").removesuffix(")")
 
-            # Split the input part by commas
-            inputParameters = inputPartStr.split(",")
+            # Split the input part by the commas which are not inside the brackets of the types
+            inputParameters = Utils.splitTopLevel(inputPartStr, ",")
 
             # Remove 'self' from the input parameters
             inputParameters.remove("self")
@@ -397,15 +463,95 @@ class Generator:
         # Append an empty line to the list
         cLines.append(f"")
 
+        # Append the encode and decode functions of a compact model
+        compactFields = getattr(interface, "compactFields", [])
+        if len(compactFields) > 0:
+            cLines.extend(Generator.compactFunctions(name, compactFields))
+
         # Return the interface declaration
         return cLines
 
+    @staticmethod
+    def compactFunctions(name: str, fields: list[str]):
+        """
+        Generate the functions which encode and decode the rows and tables of a compact model.
+
+        Args:
+            name (str): The name of the model.
+            fields (list[str]): The field names of the model in the order of its rows.
+
+        Returns:
+            list: A list of strings that represent the function declarations.
+        """
+        # The object literals of a row and of the i-th row of a table
+        rowObject = ", ".join(f"{field}: row[{i}]" for i, field in enumerate(fields))
+        tableObject = ", ".join(f"{field}: columns[{i}][i]" for i, field in enumerate(fields))
+        # The values of a row and the columns of a table
+        rowValues = ", ".join(f"value.{field}" for field in fields)
+        columnValues = ", ".join(f"values.map((value) => value.{field})" for field in fields)
+
+        return [
+            f"// {name} compact encoding",
+            f"export function decode{name}(value: {{ row: any[] }}): {name} {{",
+            f"  const row = value.row;",
+            f"  return {{ {rowObject} }};",
+            f"}}",
+            f"",
+            f"export function encode{name}(value: {name}): {{ __compact__: string; row: any[] }} {{",
+            f"  return {{ __compact__: \"{name}\", row: [{rowValues}] }};",
+            f"}}",
+            f"",
+            f"export function decode{name}List(table: any[]): {name}[] {{",
+            f"  const columns = table.slice(1);",
+            f"  const rows: {name}[] = new Array(table[0].length);",
+            f"  for (let i = 0; i < rows.length; ++i) {{",
+            f"    rows[i] = {{ {tableObject} }};",
+            f"  }}",
+            f"  return rows;",
+            f"}}",
+            f"",
+            f"export function encode{name}List(values: {name}[]): any[] {{",
+            f"  return [{{ __compact__: \"{name}\", length: values.length }}, {columnValues}];",
+            f"}}",
+            f"",
+        ]
+
+
+class LogLevel:
+    """A class to represent the levels of the log messages, the messages below the level of the Logger are dropped."""
+
+    Status = 10
+    """ The status messages, i.e. the access log lines of the HTTP server. """
+
+    Info = 20
+    """ The info messages. """
+
+    Warning = 30
+    """ The warning messages. """
+
+    Error = 40
+    """ The error messages. """
+
+    Names = {Status: "STATUS", Info: "INFO", Warning: "WARNING", Error: "ERROR"}
+    """ The names of the levels. """
+
 
 class Logger:
     """
     A class to log messages with different colors and levels.
+
+    The messages are written to the standard output synchronously until a backend is set. With a backend, i.e.
+    QueueLogBackend, they are handed to it instead, so logging never blocks the event loop. The backend is set by the
+    application, i.e. with Logger.setBackend(QueueLogBackend()) before it starts the services.
+
+    Attributes:
+        level (int): The lowest level of the messages which are logged, see LogLevel.
+        backend (Optional[QueueLogBackend]): The backend the messages are handed to, or None to write them directly.
     """
 
+    level = LogLevel.Status
+    backend: Optional["QueueLogBackend"] = None
+
     def __init__(self) -> None:
         """
         Initialize a Logger object.
@@ -413,6 +559,24 @@ class Logger:
         # Call the init method of the colorama module
         colorama.init(autoreset=True)
 
+    @staticmethod
+    def setBackend(backend: Optional["QueueLogBackend"]) -> None:
+        """
+        Set the backend the messages are handed to, the previous backend is closed after writing its messages.
+
+        Args:
+            backend (Optional[QueueLogBackend]): The backend, or None to write the messages directly.
+
+        Returns:
+            None
+        """
+        previous = Logger.backend
+        Logger.backend = backend
+        if previous is not None and previous is not backend:
+            previous.close()
+        if backend is not None:
+            backend.start()
+
     @staticmethod
     def info(message, sender="") -> None:
         """
@@ -425,10 +589,7 @@ class Logger:
         Returns:
             None
         """
-        # Print the message with green color for the level, cyan color for the sender, and reset color for the message
-        print(
-            f"\r{Fore.GREEN}[INFO] - {Back.CYAN}{sender}{Back.RESET}: {message}{Fore.RESET}"
-        )
+        Logger.log(LogLevel.Info, message, sender)
 
     @staticmethod
     def warning(message, sender="") -> None:
@@ -442,8 +603,7 @@ class Logger:
         Returns:
             None
         """
-        # Print the message with yellow color for the level and the message, and reset color for the sender
-        print(f"\r{Fore.YELLOW}[WARNING] - {sender}: {message}{Fore.RESET}")
+        Logger.log(LogLevel.Warning, message, sender)
 
     @staticmethod
     def error(message, sender="") -> None:
@@ -457,8 +617,7 @@ class Logger:
         Returns:
             None
         """
-        # Print the message with red color for the level and the message, and reset color for the sender
-        print(f"\r{Fore.RED}[ERROR] - {sender}: {message}{Fore.RESET}")
+        Logger.log(LogLevel.Error, message, sender)
 
     @staticmethod
     def status(message, sender="", override=True) -> None:
@@ -472,12 +631,285 @@ class Logger:
         Returns:
             None
         """
-        # Check if the override flag is True
-        if override:
-            # Write the message with blue color for the level and the message to the standard output
-            sys.stdout.write(f"\r{Fore.BLUE}[STATUS] - {sender}: {message}{Fore.RESET}")
-            # Flush the standard output
-            sys.stdout.flush()
-        else:
-            # Print the message with blue color for the level and the message
-            print(f"\r{Fore.BLUE}[STATUS] - {sender}: {message}{Fore.RESET}")
+        Logger.log(LogLevel.Status, message, sender, override)
+
+    @staticmethod
+    def log(level: int, message, sender="", override=False) -> None:
+        """
+        Log a message with the given level, if it is not below the level of the Logger.
+
+        Args:
+            level (int): The level of the message, see LogLevel.
+            message (str): The message to log.
+            sender (str): The name of the sender of the message. Default to "".
+            override (bool): A flag to indicate whether a status message overrides the previous one. Default to False.
+
+        Returns:
+            None
+        """
+        # Drop the messages below the level before doing anything else
+        if level < Logger.level:
+            return
+        # Hand the message to the backend if there is one
+        backend = Logger.backend
+        if backend is not None:
+            backend.submit(level, str(message), sender, override)
+            return
+        # Otherwise write it right away, the overriding status messages are not terminated so the next one overrides
+        # them
+        sys.stdout.write(Logger.format(level, message, sender, override))
+        sys.stdout.flush()
+
+    @staticmethod
+    def format(level: int, message, sender="", override=False) -> str:
+        """
+        Format a message with the color of its level.
+
+        Args:
+            level (int): The level of the message, see LogLevel.
+            message (str): The message.
+            sender (str): The name of the sender of the message. Default to "".
+            override (bool): A flag to indicate whether a status message overrides the previous one. Default to False.
+
+        Returns:
+            str: The formatted message, terminated by a line feed unless it is an overriding status message.
+        """
+        if level >= LogLevel.Error:
+            # Red color for the level and the message, and reset color for the sender
+            return f"\r{Fore.RED}[ERROR] - {sender}: {message}{Fore.RESET}\n"
+        if level >= LogLevel.Warning:
+            # Yellow color for the level and the message, and reset color for the sender
+            return f"\r{Fore.YELLOW}[WARNING] - {sender}: {message}{Fore.RESET}\n"
+        if level >= LogLevel.Info:
+            # Green color for the level, cyan color for the sender, and reset color for the message
+            return f"\r{Fore.GREEN}[INFO] - {Back.CYAN}{sender}{Back.RESET}: {message}{Fore.RESET}\n"
+        # Blue color for the level and the message
+        return f"\r{Fore.BLUE}[STATUS] - {sender}: {message}{Fore.RESET}" + ("" if override else "\n")
+
+
+class QueueLogBackend:
+    """A class that writes the log messages on a background thread, so logging never blocks the event loop.
+
+    The messages are put into a bounded queue and written by a writer thread, in order, as text lines or as JSON lines.
+    When the queue is full, the new messages are dropped and their number is logged later. A message which repeats
+    more than repeat_limit times in a window of repeat_window seconds is rate limited: only every sample_every-th
+    repeat is still logged, and the number of the suppressed repeats is logged at the end of the window.
+
+    Attributes:
+        max_queue (int): The maximum number of messages waiting to be written.
+        json_lines (bool): Whether the messages are written as JSON lines instead of colored text.
+        stream (Optional[TextIO]): The stream the messages are written to, or None for the current standard output.
+        repeat_limit (int): The number of times a message is logged in a window before it is rate limited, or 0 for
+            no limit.
+        repeat_window (float): The length of the rate limiting window in seconds.
+        sample_every (int): The rate of the repeats logged once a message is rate limited, or 0 to suppress all.
+        dropped (int): The number of messages dropped because the queue was full.
+        suppressed (int): The number of repeated messages suppressed by the rate limiting.
+    """
+
+    def __init__(
+            self,
+            max_queue: int = 10000,
+            json_lines: bool = False,
+            stream: Optional[TextIO] = None,
+            repeat_limit: int = 10,
+            repeat_window: float = 1.0,
+            sample_every: int = 100,
+    ) -> None:
+        """
+        The constructor method for the QueueLogBackend class.
+
+        Args:
+            max_queue (int, optional): The maximum number of messages waiting to be written. Defaults to 10000.
+            json_lines (bool, optional): Whether to write the messages as JSON lines. Defaults to False.
+            stream (Optional[TextIO], optional): The stream the messages are written to. Defaults to None, which
+                writes to the current standard output.
+            repeat_limit (int, optional): The number of times a message is logged in a window before it is rate
+                limited. Defaults to 10, 0 means no limit.
+            repeat_window (float, optional): The length of the rate limiting window in seconds. Defaults to 1.0.
+            sample_every (int, optional): The rate of the repeats logged once a message is rate limited. Defaults
+                to 100, 0 suppresses all of them.
+
+        Raises:
+            ValueError: If the queue cannot hold a message, or the limits are negative.
+        """
+        if max_queue <= 0 or repeat_limit < 0 or repeat_window <= 0 or sample_every < 0:
+            raise ValueError(
+                f"Invalid log backend max_queue={max_queue}, repeat_limit={repeat_limit}, "
+                f"repeat_window={repeat_window}, sample_every={sample_every}"
+            )
+
+        self.max_queue = max_queue
+        self.json_lines = json_lines
+        self.stream = stream
+        self.repeat_limit = repeat_limit
+        self.repeat_window = repeat_window
+        self.sample_every = sample_every
+        self.dropped = 0
+        self.suppressed = 0
+        # The records waiting to be written, as (time, level, sender, message, override, suppressed) tuples, the
+        # suppressed count is set for the records reporting the suppressed repeats of a message
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        # The number of times each message is seen in the current window, and the end of the window
+        self._repeats: Dict[Tuple[int, str, str], int] = {}
+        self._windowEnd = 0.0
+        # The number of dropped messages which are not reported yet
+        self._unreportedDrops = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the writer thread, if it is not running."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="pywebchannel-logger", daemon=True)
+        self._thread.start()
+        # Write the waiting messages before the interpreter exits
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Writes the waiting messages and stops the writer thread.
+
+        Args:
+            timeout (float, optional): The number of seconds to wait for the messages to be written. Defaults to 1.0.
+        """
+        if self._thread is None:
+            return
+        atexit.unregister(self.close)
+        try:
+            self._queue.put(None, timeout=timeout)
+            self._thread.join(timeout)
+        except queue.Full:
+            pass
+        self._thread = None
+
+    def submit(self, level: int, message: str, sender: str = "", override: bool = False) -> None:
+        """Queues a message to be written, unless it is rate limited or the queue is full.
+
+        This method is called by the Logger on any thread, it never blocks.
+
+        Args:
+            level (int): The level of the message, see LogLevel.
+            message (str): The message.
+            sender (str, optional): The name of the sender of the message. Defaults to "".
+            override (bool, optional): A flag to indicate whether a status message overrides the previous one.
+                Defaults to False.
+        """
+        now = time.time()
+        if self.repeat_limit > 0:
+            key = (level, sender, message)
+            with self._lock:
+                summaries = self._rollover(now)
+                count = self._repeats.get(key, 0) + 1
+                self._repeats[key] = count
+                # Log every sample_every-th repeat of a rate limited message
+                repeat = count - self.repeat_limit
+                limited = repeat > 0 and (self.sample_every == 0 or repeat % self.sample_every != 0)
+                if limited:
+                    self.suppressed += 1
+            for summary in summaries:
+                self._put(summary)
+            if limited:
+                return
+        self._put((now, level, sender, message, override, 0))
+
+    def _put(self, record: Tuple[float, int, str, str, bool, int]) -> None:
+        """Queues a record without blocking, it is dropped if the queue is full.
+
+        Args:
+            record (Tuple[float, int, str, str, bool, int]): The record.
+        """
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreportedDrops += 1
+
+    def _rollover(self, now: float, force: bool = False) -> List[Tuple[float, int, str, str, bool, int]]:
+        """Starts a new rate limiting window if the current one is over, it must be called with the lock held.
+
+        Args:
+            now (float): The current time.
+            force (bool, optional): True to end the current window even if it is not over, i.e. when the backend is
+                closed. Defaults to False.
+
+        Returns:
+            List[Tuple[float, int, str, str, bool, int]]: The records reporting the repeats suppressed in the window
+                which is over.
+        """
+        if now < self._windowEnd and not force:
+            return []
+        summaries = []
+        for (level, sender, message), count in self._repeats.items():
+            # The number of repeats which are neither logged nor sampled
+            suppressed = count - self.repeat_limit
+            if suppressed > 0 and self.sample_every > 0:
+                suppressed -= suppressed // self.sample_every
+            if suppressed > 0:
+                summaries.append((now, level, sender, message, False, suppressed))
+        self._repeats.clear()
+        self._windowEnd = now + self.repeat_window
+        return summaries
+
+    def _run(self) -> None:
+        """Writes the queued records until the backend is closed.
+
+        This method runs on the writer thread.
+        """
+        while True:
+            try:
+                records = [self._queue.get(timeout=self.repeat_window)]
+            except queue.Empty:
+                records = []
+            # Take all the waiting records, so they are written and flushed together
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Report the suppressed repeats of the window which is over, even if no message comes after it, and of the
+            # current one when the backend is closed
+            closed = None in records
+            with self._lock:
+                if self.repeat_limit > 0:
+                    records.extend(self._rollover(time.time(), closed))
+                drops, self._unreportedDrops = self._unreportedDrops, 0
+            if drops > 0:
+                records.append((time.time(), LogLevel.Warning, "Logger", f"{drops} messages dropped", False, 0))
+
+            lines = [self._format(record) for record in records if record is not None]
+            if lines:
+                stream = self.stream or sys.stdout
+                try:
+                    stream.write("".join(lines))
+                    stream.flush()
+                except (OSError, ValueError):
+                    # The stream is closed, i.e. at the exit of the interpreter
+                    pass
+            if closed:
+                return
+
+    def _format(self, record: Tuple[float, int, str, str, bool, int]) -> str:
+        """Formats a record as a text line or a JSON line.
+
+        Args:
+            record (Tuple[float, int, str, str, bool, int]): The record.
+
+        Returns:
+            str: The formatted record.
+        """
+        timestamp, level, sender, message, override, suppressed = record
+        if self.json_lines:
+            line = {
+                "time": datetime.fromtimestamp(timestamp).isoformat(),
+                "level": LogLevel.Names.get(level, str(level)),
+                "sender": sender,
+                "message": message,
+            }
+            if suppressed > 0:
+                line["suppressed"] = suppressed
+            return json.dumps(line, ensure_ascii=False, default=str) + "\n"
+        if suppressed > 0:
+            message = f"{message} (suppressed {suppressed} more times)"
+        return Logger.format(level, message, sender, override)
@@ -0,0 +1,182 @@
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal, Slot
+
+from pywebchannel.Controller import Invocation
+from pywebchannel.Metrics import Metrics
+from pywebchannel.Utils import Logger
+
+
+class Watchdog(QObject):
+    """A class that detects the stalls of the Qt event loop and finds out which handler caused them.
+
+    Everything of the web channel runs on one event loop, so a slow action, slot or signal handler delays all the
+    clients. A heartbeat timer beats on the main thread at a high frequency, and a helper thread watches the beats.
+    When the main thread misses its beats for longer than the threshold, the helper thread takes a sample of its stack
+    while it is still stalled. Once the event loop gets back to the heartbeat, the stall is reported through the
+    Logger, the Metrics and the stallDetected signal, with its duration, the handler which was running, the action
+    being called by a client if any, and the stack sample.
+
+    Attributes:
+        threshold (int): The duration in milliseconds above which a delay of the event loop is a stall.
+        interval (int): The interval of the heartbeat in milliseconds.
+    """
+
+    stackLimit = 64
+    """ The maximum number of frames in a stack sample, from the innermost one. """
+
+    stallDetected = Signal(dict)
+    """ The signal that is emitted on the main thread with the report of a stall once it is over. """
+
+    def __init__(self, threshold: int = 100, interval: int = 10, parent: Optional[QObject] = None) -> None:
+        """Initializes the Watchdog object with the given threshold, interval and parent.
+
+        Args:
+            threshold (int, optional): The duration in milliseconds above which a delay of the event loop is a stall.
+                Defaults to 100.
+            interval (int, optional): The interval of the heartbeat in milliseconds. Defaults to 10.
+            parent (Optional[QObject], optional): The parent object for the Watchdog. Defaults to None.
+
+        Raises:
+            ValueError: If the interval is not positive or the threshold is not above the interval.
+        """
+        super().__init__(parent)
+        if interval <= 0 or threshold <= interval:
+            raise ValueError(f"Invalid watchdog threshold={threshold}, interval={interval}")
+
+        self.threshold = threshold
+        self.interval = interval
+        # The heartbeat timer must fire on time, so how late it fires is the delay of the event loop
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self._heartbeat.setInterval(interval)
+        self._heartbeat.timeout.connect(self.onHeartbeat)
+        # The time of the last beat, and the stack sample taken by the helper thread after it, if any
+        self._beat = 0.0
+        self._sample: Optional[Tuple[float, Dict[str, Any]]] = None
+        # The frame of the Python function which runs the event loop that delivered the last beat, the handlers are
+        # called from it, it is the frame of the innermost loop when an event loop is nested, i.e. in a dialog
+        self._loopFrame: Optional[FrameType] = None
+        self._mainThreadId = threading.main_thread().ident
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Starts watching the event loop, it must be called on the main thread."""
+        if self._thread is not None:
+            return
+        self._beat = time.perf_counter()
+        self._sample = None
+        self._loopFrame = None
+        self._stopped.clear()
+        self._heartbeat.start()
+        self._thread = threading.Thread(target=self._watch, name="pywebchannel-watchdog", daemon=True)
+        self._thread.start()
+
+    @Slot()
+    def stop(self) -> None:
+        """Stops watching the event loop."""
+        if self._thread is None:
+            return
+        self._heartbeat.stop()
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self._loopFrame = None
+
+    @Slot()
+    def onHeartbeat(self) -> None:
+        """Beats, and reports the stall which delayed this beat, if any.
+
+        This slot is invoked by the heartbeat timer on the main thread.
+        """
+        # The caller of the beat is the function which runs the event loop, it changes when an event loop is nested
+        self._loopFrame = sys._getframe().f_back
+
+        now = time.perf_counter()
+        delay = (now - self._beat) * 1000 - self.interval
+        beat, sample = self._beat, self._sample
+        self._beat = now
+        self._sample = None
+
+        if delay < self.threshold:
+            return
+
+        # Take the sample of the stall which delayed this beat, a sample of an earlier beat is stale
+        details = sample[1] if sample is not None and sample[0] == beat else {}
+        stall = {
+            "time": time.time() - delay / 1000,
+            "duration": delay,
+            "handler": details.get("handler"),
+            "action": details.get("action"),
+            "stack": details.get("stack", []),
+        }
+        Metrics.instance().recordStall(stall)
+        Logger.warning(
+            f"Event loop stalled for {delay:.0f} ms in {stall['handler'] or 'an unknown handler'}"
+            + (f" while calling {stall['action']}" if stall["action"] else "")
+            + ("\n" + "".join(stall["stack"]) if stall["stack"] else ""),
+            "Watchdog",
+        )
+        self.stallDetected.emit(stall)
+
+    def _watch(self) -> None:
+        """Watches the beats and samples the stack of the main thread once per stall.
+
+        This method runs on the helper thread.
+        """
+        period = min(self.interval, self.threshold / 4) / 1000
+        while not self._stopped.wait(period):
+            beat = self._beat
+            sample = self._sample
+            loopFrame = self._loopFrame
+            # Sample once per stall, while the main thread is still stalled
+            if (time.perf_counter() - beat) * 1000 < self.threshold or (sample is not None and sample[0] == beat):
+                continue
+            frame = sys._current_frames().get(self._mainThreadId)
+            if frame is not None:
+                self._sample = (beat, self._describe(frame, loopFrame))
+
+    def _describe(self, frame: FrameType, loopFrame: Optional[FrameType]) -> Dict[str, Any]:
+        """Describes what the main thread is running.
+
+        Args:
+            frame (FrameType): The innermost frame of the main thread.
+            loopFrame (Optional[FrameType]): The frame of the function which runs the event loop that delivered the
+                last beat, or None if it is unknown.
+
+        Returns:
+            Dict[str, Any]: The handler called by the event loop, the action being called by a client, and the stack
+                from the handler to the innermost frame.
+        """
+        # Find the handler, which is the frame called by the function running the event loop of the last beat
+        handler = None
+        stackFrames: List[FrameType] = []
+        current = frame
+        while current is not None and len(stackFrames) < Watchdog.stackLimit:
+            stackFrames.append(current)
+            if loopFrame is not None and current.f_back is loopFrame:
+                handler = current
+                break
+            current = current.f_back
+
+        # The invocation stack may change meanwhile, take a copy
+        invocations = Invocation.snapshot()
+        action = None
+        if invocations:
+            message = invocations[-1].message
+            action = f"{message.get('object')}.{message.get('method')}" if "method" in message else None
+
+        stack = traceback.format_list(
+            traceback.StackSummary.extract((f, f.f_lineno) for f in reversed(stackFrames))
+        )
+        name = None
+        if handler is not None:
+            code = handler.f_code
+            name = f"{getattr(code, 'co_qualname', code.co_name)} ({code.co_filename}:{code.co_firstlineno})"
+        return {"handler": name, "action": action, "stack": stack}
@@ -1,46 +1,721 @@
-from typing import Optional
+import asyncio
+import collections
+import itertools
+import time
+from typing import Any, Dict, Iterable, Optional, List, Set, Tuple
 from PySide6.QtCore import (
     QByteArray,
-    QJsonDocument,
-    QJsonParseError,
+    QMetaMethod,
     QObject,
+    QTimer,
+    Qt,
     Signal,
     Slot,
 )
-from PySide6.QtNetwork import QHostAddress
+from PySide6.QtNetwork import QAbstractSocket, QHostAddress
 from PySide6.QtWebChannel import QWebChannel, QWebChannelAbstractTransport
-from PySide6.QtWebSockets import QWebSocket, QWebSocketServer
+from PySide6.QtWebSockets import QWebSocket, QWebSocketProtocol, QWebSocketServer
 
-from pywebchannel.Controller import Controller
+from pywebchannel.AsyncBridge import AsyncBridge
+from pywebchannel.Codec import Codec, CodecError, JsonCodec
+from pywebchannel.Compact import CompactEncoding, CompactSchema
+from pywebchannel.Controller import Controller, Convert, Invocation, Response
+from pywebchannel.Metrics import Metrics
+from pywebchannel.MetricsServer import MetricsServer
+from pywebchannel.Scheduler import NotifyScheduler
 from pywebchannel.Utils import Logger
 
 
+class SlowConsumerPolicy:
+    """A class to represent what is done with a client whose outgoing buffer is over the high-water mark."""
+
+    DropPropertyUpdates = 0
+    """ The property updates are dropped until the buffer drains, the other messages are still sent. """
+
+    Coalesce = 1
+    """ The property updates are merged into one update with the latest values, which is sent once the buffer drains.
+    The other messages are still sent. """
+
+    Disconnect = 2
+    """ The client is disconnected. """
+
+
+class MessageType:
+    """A class to represent the types of the QWebChannel messages."""
+
+    Signal = 1
+    PropertyUpdate = 2
+    Init = 3
+    Idle = 4
+    Debug = 5
+    InvokeMethod = 6
+    ConnectToSignal = 7
+    DisconnectFromSignal = 8
+    SetProperty = 9
+    Response = 10
+    StreamData = 11
+    """ A chunk of the items of a streamed result, sent to the client. """
+    StreamEnd = 12
+    """ The end of a streamed result, with an error string if it failed, sent to the client. """
+    StreamAck = 13
+    """ A credit for more chunks of a streamed result, sent by the client. """
+    StreamCancel = 14
+    """ The cancellation of a streamed result, sent by the client. """
+    Subscribe = 15
+    """ The objects and properties which are observed by the client, sent by the client. """
+    BatchInvoke = 16
+    """ A list of method calls which are answered together in one response, sent by the client. """
+
+
+class Stream(QObject):
+    """A class that sends the items of an iterable to a client in chunks, with credit based flow control.
+
+    The stream holds a number of credits, each one allows sending one chunk. The client grants a new credit
+    whenever it consumes a chunk, so at most `window` chunks are on their way or waiting in the client at any time,
+    and the iterable is not advanced while the client is behind. One chunk is produced per event loop iteration, so
+    the other clients are served in between.
+
+    Async iterables, i.e. async generators, are advanced on the AsyncBridge, so awaiting in between the items does not
+    block the event loop.
+
+    Attributes:
+        transport (WebSocketTransport): The transport of the client.
+        streamId (int): The identifier of the stream, unique for the transport.
+        chunkSize (int): The maximum number of items in a chunk.
+        credit (int): The number of chunks that can be sent before the client grants more.
+    """
+
+    window = 4
+    """ The number of chunks that are sent before waiting for the client. """
+
+    def __init__(self, transport: "WebSocketTransport", streamId: int, items: Iterable[Any], chunkSize: int) -> None:
+        """Initializes the Stream object and schedules the first chunk.
+
+        Args:
+            transport (WebSocketTransport): The transport of the client.
+            streamId (int): The identifier of the stream, unique for the transport.
+            items (Iterable[Any]): The items to be sent.
+            chunkSize (int): The maximum number of items in a chunk.
+        """
+        super().__init__(transport)
+        self.transport = transport
+        self.streamId = streamId
+        self.chunkSize = max(1, chunkSize)
+        self.credit = Stream.window
+        self._isAsync = hasattr(items, "__aiter__")
+        self._iterator = aiter(items) if self._isAsync else iter(items)
+        self._sequence = 0
+        # The future of the chunk which is being produced by an async iterable, if any
+        self._pendingChunk: Optional[asyncio.Future] = None
+        # Create a zero interval timer, which produces a chunk once the event loop gets back to processing events
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.sendChunk)
+        self._timer.start()
+
+    @Slot()
+    def sendChunk(self) -> None:
+        """Produces and sends the next chunk, or the end of the stream if the items are exhausted.
+
+        This slot is invoked by the timer of the stream while there are credits left.
+        """
+        # Wait for the client if there are no credits left
+        if self.credit <= 0:
+            return
+        # Produce the chunk of an async iterable on the AsyncBridge, unless it is already being produced
+        if self._isAsync:
+            if self._pendingChunk is None:
+                self._pendingChunk = AsyncBridge.instance().submit(self._nextAsyncChunk(), self._onAsyncChunk)
+            return
+        try:
+            # Take the next chunk of items
+            chunk = [*itertools.islice(self._iterator, self.chunkSize)]
+        except Exception as e:
+            # Report the error to the client and finish
+            Logger.error(f"Stream {self.streamId} failed: {e}", "Stream")
+            self.finish(str(e))
+            return
+        self._sendChunk(chunk)
+
+    async def _nextAsyncChunk(self) -> List[Any]:
+        """Takes the next chunk of items from the async iterable.
+
+        Returns:
+            List[Any]: The items of the chunk.
+        """
+        chunk = []
+        async for item in self._iterator:
+            chunk.append(item)
+            if len(chunk) == self.chunkSize:
+                break
+        return chunk
+
+    async def _closeAsync(self, pendingChunk: Optional[asyncio.Future]) -> None:
+        """Closes the async iterable once the chunk which was being produced is cancelled.
+
+        Args:
+            pendingChunk (Optional[asyncio.Future]): The cancelled future of the chunk, if any.
+        """
+        if pendingChunk is not None:
+            try:
+                await pendingChunk
+            except BaseException:
+                pass
+        if hasattr(self._iterator, "aclose"):
+            await self._iterator.aclose()
+
+    def _onAsyncChunk(self, future: asyncio.Future) -> None:
+        """Sends the chunk produced by the async iterable.
+
+        Args:
+            future (asyncio.Future): The finished future of the chunk.
+        """
+        self._pendingChunk = None
+        # The stream is closed while the chunk was being produced
+        if future.cancelled() or self.streamId not in self.transport.streams:
+            return
+        if future.exception() is not None:
+            # Report the error to the client and finish
+            Logger.error(f"Stream {self.streamId} failed: {future.exception()}", "Stream")
+            self.finish(str(future.exception()))
+            return
+        self._sendChunk(future.result())
+
+    def _sendChunk(self, chunk: List[Any]) -> None:
+        """Sends a chunk to the client, or the end of the stream if the chunk is empty.
+
+        Args:
+            chunk (List[Any]): The items of the chunk.
+        """
+        # Finish if the items are exhausted
+        if len(chunk) == 0:
+            self.finish()
+            return
+
+        try:
+            # Convert the items to web format, the chunks of compact models are sent as tables
+            data = Convert.dump(chunk)
+        except Exception as e:
+            # Report the error to the client and finish
+            Logger.error(f"Stream {self.streamId} failed: {e}", "Stream")
+            self.finish(str(e))
+            return
+
+        # Send the chunk and consume a credit
+        self.transport.sendMessage(
+            {"type": MessageType.StreamData, "stream": self.streamId, "seq": self._sequence, "data": data}
+        )
+        self._sequence += 1
+        self.credit -= 1
+        # Finish right away if the chunk is not full, the items are exhausted
+        if len(chunk) < self.chunkSize:
+            self.finish()
+            return
+        # Produce the next chunk in the next event loop iteration
+        if self.credit > 0:
+            self._timer.start()
+
+    def grant(self, credit: int) -> None:
+        """Adds credits granted by the client and resumes sending.
+
+        Args:
+            credit (int): The number of chunks the client is ready to receive.
+        """
+        self.credit += credit
+        if self.credit > 0 and not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self) -> None:
+        """Stops the stream without notifying the client, which cancelled it."""
+        self.close()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        """Sends the end of the stream to the client and closes the stream.
+
+        Args:
+            error (str, optional): The error string if the stream failed. Defaults to None.
+        """
+        message: Dict[str, Any] = {"type": MessageType.StreamEnd, "stream": self.streamId}
+        if error is not None:
+            message["error"] = error
+        self.transport.sendMessage(message)
+        self.close()
+
+    def close(self) -> None:
+        """Closes the iterable, i.e. runs the cleanup of a generator, and removes the stream from the transport."""
+        self._timer.stop()
+        self.transport.streams.pop(self.streamId, None)
+        if self._isAsync:
+            # Stop producing the chunk and close the async generator on the AsyncBridge
+            if self._pendingChunk is not None:
+                self._pendingChunk.cancel()
+            AsyncBridge.instance().submit(self._closeAsync(self._pendingChunk))
+        else:
+            close = getattr(self._iterator, "close", None)
+            if close is not None:
+                close()
+        self.deleteLater()
+
+
+class Subscription:
+    """A class that holds the objects and the properties observed by a client, and filters the messages sent to it.
+
+    A client which sends no subscription receives the updates of all the properties. Once it subscribes, it receives
+    the updates of the subscribed properties only, and the init message describes the subscribed objects only. The
+    same goes for the patches of the properties in delta mode, which are sent by their '<name>Patched' signals. Each
+    subscription replaces the previous one.
+
+    Attributes:
+        objects (Dict[str, Optional[Set[str]]]): The names of the subscribed properties, or None for all of them,
+            mapped by the object names.
+        key (Tuple): The subscribed objects and properties in a hashable form, equal for the equal subscriptions.
+    """
+
+    def __init__(self, objects: Dict[str, Optional[List[str]]], registeredObjects: Dict[str, QObject]) -> None:
+        """Initializes the Subscription object with the subscribed objects and properties.
+
+        Args:
+            objects (Dict[str, Optional[List[str]]]): The names of the subscribed properties, or None for all of them,
+                mapped by the object names.
+            registeredObjects (Dict[str, QObject]): The objects registered to the web channel, mapped by their names.
+        """
+        self.objects = {name: None if names is None else set(names) for name, names in objects.items()}
+        self.key = tuple(sorted(
+            (name, None if names is None else tuple(sorted(names))) for name, names in self.objects.items()
+        ))
+        # The subscribed properties of the registered objects, mapped by their indexes as they are sent in the
+        # property updates. Each property is given with its name and the index of its notify signal.
+        self._properties: Dict[str, Dict[str, Tuple[str, Optional[str]]]] = {}
+        for name, names in self.objects.items():
+            obj = registeredObjects.get(name)
+            if obj is None:
+                continue
+            metaObject = obj.metaObject()
+            properties = {}
+            for index in range(metaObject.propertyCount()):
+                metaProperty = metaObject.property(index)
+                if names is not None and metaProperty.name() not in names:
+                    continue
+                notifyIndex = metaProperty.notifySignalIndex() if metaProperty.hasNotifySignal() else None
+                properties[str(index)] = (metaProperty.name(), None if notifyIndex is None else str(notifyIndex))
+            self._properties[name] = properties
+        # The indexes of the patch signals of the properties in delta mode which are not observed, mapped by the
+        # object names
+        self._ignoredPatchSignals: Dict[str, Set[int]] = {}
+        for name, obj in registeredObjects.items():
+            # None observes all the properties, none of the properties of an object which is not subscribed are
+            names = self.objects[name] if name in self.objects else set()
+            metaObject = obj.metaObject()
+            ignored = set()
+            for index in range(metaObject.methodCount()):
+                method = metaObject.method(index)
+                signalName = method.name().data().decode()
+                if method.methodType() != QMetaMethod.MethodType.Signal or not signalName.endswith("Patched"):
+                    continue
+                propertyName = signalName[:-len("Patched")]
+                if metaObject.indexOfProperty(propertyName) >= 0 and names is not None and propertyName not in names:
+                    ignored.add(index)
+            if len(ignored) > 0:
+                self._ignoredPatchSignals[name] = ignored
+
+    def observes(self, name: str) -> bool:
+        """Returns whether the client observes the object with the given name.
+
+        Args:
+            name (str): The name of the object.
+
+        Returns:
+            bool: True if the object is subscribed or is internal to the channel, False otherwise.
+        """
+        return name in self.objects or name == CompactSchema.channelName
+
+    def filterInit(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Removes the objects which are not observed from the data of the init response.
+
+        Args:
+            data (Dict[str, Any]): The descriptions of the registered objects, mapped by their names.
+
+        Returns:
+            Dict[str, Any]: The descriptions of the observed objects.
+        """
+        return {name: info for name, info in data.items() if self.observes(name)}
+
+    def observesSignal(self, message: Dict[str, Any]) -> bool:
+        """Returns whether a signal message is sent to the client, the patches of the properties which are not
+        observed are not.
+
+        Args:
+            message (Dict[str, Any]): The signal message.
+
+        Returns:
+            bool: False if the message is the patch of a property which is not observed, True otherwise.
+        """
+        return message.get("signal") not in self._ignoredPatchSignals.get(message.get("object"), ())
+
+    def filterPropertyUpdate(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Removes the properties which are not observed from a property update message.
+
+        Args:
+            message (Dict[str, Any]): The property update message.
+
+        Returns:
+            Optional[Dict[str, Any]]: The property update of the observed properties, or None if nothing is left.
+        """
+        data = []
+        for entry in message["data"]:
+            name = entry["object"]
+            if name not in self.objects:
+                continue
+            # Send the entries of the objects whose properties are all subscribed as they are
+            if self.objects[name] is None:
+                data.append(entry)
+                continue
+            subscribed = self._properties.get(name, {})
+            properties = {index: value for index, value in entry["properties"].items() if index in subscribed}
+            if len(properties) == 0:
+                continue
+            notifyIndexes = {subscribed[index][1] for index in properties}
+            signals = {index: args for index, args in entry["signals"].items() if index in notifyIndexes}
+            data.append({"object": name, "signals": signals, "properties": properties})
+
+        if len(data) == 0:
+            return None
+        return {**message, "data": data}
+
+    def propertyUpdate(
+            self, previous: Optional["Subscription"], registeredObjects: Dict[str, QObject]
+    ) -> Optional[Dict[str, Any]]:
+        """Returns a property update with the current values of the properties which were filtered out by the previous
+        subscription, since the values the client has for them are stale.
+
+        Args:
+            previous (Optional[Subscription]): The previous subscription, or None if the client received all the
+                property updates.
+            registeredObjects (Dict[str, QObject]): The objects registered to the web channel, mapped by their names.
+
+        Returns:
+            Optional[Dict[str, Any]]: The property update message, or None if no property is newly subscribed.
+        """
+        if previous is None:
+            return None
+
+        data = []
+        for name, properties in self._properties.items():
+            # The objects which were not observed are not known by the client
+            if not previous.observes(name):
+                continue
+            obj = registeredObjects[name]
+            known = previous._properties.get(name, {})
+            values = {}
+            signals = {}
+            for index, (propertyName, notifyIndex) in properties.items():
+                if index in known:
+                    continue
+                value = Convert.dump(obj.property(propertyName))
+                values[index] = value
+                if notifyIndex is not None:
+                    signals[notifyIndex] = [value]
+            if len(values) > 0:
+                data.append({"object": name, "signals": signals, "properties": values})
+
+        if len(data) == 0:
+            return None
+        return {"type": MessageType.PropertyUpdate, "data": data}
+
+
+class InvokeBatch:
+    """A class that collects the results of the calls of a batch invoke message, which are answered together.
+
+    Attributes:
+        messageId: The identifier of the batch invoke message.
+        results (List[Any]): The results of the calls, in the order of the calls.
+        pending (int): The number of calls which are not answered yet.
+    """
+
+    def __init__(self, messageId: Any, count: int) -> None:
+        """
+        The constructor method for the InvokeBatch class.
+
+        Args:
+            messageId: The identifier of the batch invoke message.
+            count (int): The number of calls in the batch.
+        """
+        self.messageId = messageId
+        self.results: List[Any] = [None] * count
+        self.pending = count
+
+    def resolve(self, index: int, result: Any) -> bool:
+        """Records the result of a call.
+
+        Args:
+            index (int): The position of the call in the batch.
+            result: The result of the call.
+
+        Returns:
+            bool: True if all the calls of the batch are answered.
+        """
+        self.results[index] = result
+        self.pending -= 1
+        return self.pending == 0
+
+
+class BroadcastCache(QObject):
+    """A class that keeps the frames of the latest broadcast messages, so they are encoded once for all the clients.
+
+    QWebChannel hands every transport its own copy of each signal and property update message, which are equal for
+    all the clients. The transports of a service share one cache: the first transport encodes the message and stores
+    its frame, the other transports find the frame by the key of their messages and send it as it is.
+
+    The messages are not compared. The cache watches the signals of the controllers, and each emission, as well as
+    each idle message of a client, starts a new generation. QWebChannel sends a signal message to the clients right
+    when it is emitted, and a property update after the notify signals of its properties, so the messages sent within
+    a generation are equal if they have the same header: the object and the signal of a signal message, or the objects
+    of a property update along with the subscription of the client. The key of a message is taken when QWebChannel
+    hands it to the transport, so the batched messages keep their keys until they are encoded.
+
+    Attributes:
+        generation (int): The number of the current generation.
+        sending (int): The number of the messages being handed to the transports, more than one if a message is sent
+            while another one is.
+        encodedCount (int): The number of messages encoded by the transports.
+        reusedCount (int): The number of messages sent with the stored frame of an equal message, without encoding.
+        encodeTime (float): The time spent by the transports encoding the messages in seconds.
+    """
+
+    size = 4
+    """ The number of the latest broadcast frames which are kept. """
+
+    messageTypes = (MessageType.Signal, MessageType.PropertyUpdate)
+    """ The types of the messages which are broadcast to the clients. """
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        """Initializes the BroadcastCache object with no frames.
+
+        Args:
+            parent (Optional[QObject], optional): The parent object for the BroadcastCache. Defaults to None.
+        """
+        super().__init__(parent)
+        self._frames: Dict[Tuple, Any] = collections.OrderedDict()
+        self.generation = 0
+        self.encodedCount = 0
+        self.reusedCount = 0
+        self.encodeTime = 0.0
+        self.sending = 0
+        # The names of the watched objects, only their messages have keys
+        self._objects = set()
+        # Whether a signal was emitted while a message was handed to the transports
+        self._nested = False
+
+    def watchSignals(self, obj: QObject, objectName: str) -> None:
+        """Starts a new generation on each emission of the signals an object declares, i.e. the signals and the
+        notify signals of the properties of a controller.
+
+        Args:
+            obj (QObject): The object, which is published to the clients.
+            objectName (str): The name of the object in the web channel.
+        """
+        if objectName in self._objects:
+            return
+        metaObject = obj.metaObject()
+        # The signals of QObject itself, i.e. destroyed, are not published
+        for index in range(QObject.staticMetaObject.methodCount(), metaObject.methodCount()):
+            method = metaObject.method(index)
+            if method.methodType() == QMetaMethod.MethodType.Signal:
+                # The slot takes no arguments, so the arguments of the signal are not converted for it
+                getattr(obj, method.name().data().decode()).connect(self.invalidate)
+        self._objects.add(objectName)
+
+    @Slot()
+    def invalidate(self) -> None:
+        """Starts a new generation, the messages sent from now on are not equal to the previous ones.
+
+        This slot is invoked when a watched object emits one of its signals, and when a client is idle.
+        """
+        self.generation += 1
+        # A signal emitted while a message is handed to the transports is sent amid the copies of that message, so
+        # their keys would clash, nothing is cached until the next emission
+        self._nested = self.sending > 0
+
+    def messageKey(self, message: Dict[str, Any], subscription: Optional["Subscription"] = None) -> Optional[Tuple]:
+        """Returns the key of a broadcast message in the current generation.
+
+        Args:
+            message (Dict[str, Any]): The message handed to the transport by QWebChannel.
+            subscription (Subscription, optional): The subscription of the client, which filters the property
+                updates. Defaults to None.
+
+        Returns:
+            Optional[Tuple]: The key, or None if the message is not a broadcast message of the watched objects.
+        """
+        if self._nested:
+            return None
+        messageType = message.get("type")
+        if messageType == MessageType.Signal:
+            if message.get("object") not in self._objects:
+                return None
+            return self.generation, messageType, message.get("object"), message.get("signal")
+        if messageType == MessageType.PropertyUpdate:
+            objects = tuple(entry.get("object") for entry in message.get("data", ()))
+            if not self._objects.issuperset(objects):
+                return None
+            return self.generation, messageType, objects, subscription.key if subscription is not None else None
+        return None
+
+    def lookup(self, codec: Codec, key: Tuple) -> Any:
+        """Returns the stored frame of a message with the given key, encoded with the given codec.
+
+        Args:
+            codec (Codec): The codec of the frame.
+            key (Tuple): The key of the message, see messageKey.
+
+        Returns:
+            The frame, or None if no message with the key is stored.
+        """
+        return self._frames.get((codec, key))
+
+    def store(self, codec: Codec, key: Tuple, frame: Any) -> None:
+        """Stores the frame of a broadcast message, the oldest frame is dropped if the cache is full.
+
+        Args:
+            codec (Codec): The codec of the frame.
+            key (Tuple): The key of the message, see messageKey.
+            frame: The frame of the message.
+        """
+        self._frames[(codec, key)] = frame
+        if len(self._frames) > BroadcastCache.size:
+            self._frames.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the counters of the cache.
+
+        Returns:
+            Dict[str, Any]: The encoded and reused message counts, the encoding time and the estimated time saved by
+                the reused frames, in seconds.
+        """
+        average = self.encodeTime / self.encodedCount if self.encodedCount > 0 else 0.0
+        return {
+            "encoded": self.encodedCount,
+            "reused": self.reusedCount,
+            "encodeTime": self.encodeTime,
+            "savedTime": average * self.reusedCount,
+        }
+
+
 # A class that represents a WebSocket transport for QWebChannel
 class WebSocketTransport(QWebChannelAbstractTransport):
     """A class that inherits from QWebChannelAbstractTransport and communicates with a QWebSocket.
 
     Attributes:
-        socket (QWebSocket): The QWebSocket object that handles the WebSocket connection.        
+        socket (QWebSocket): The QWebSocket object that handles the WebSocket connection.
+        codec (Codec): The codec object that converts the messages into WebSocket frames and back.
+        batch (bool): True if the messages of one event loop iteration are sent together as a single array frame.
+        highWaterMark (int): The number of bytes waiting in the socket buffer above which the client is considered
+            as a slow consumer, or 0 if there is no limit.
+        slowConsumerPolicy (int): One of the SlowConsumerPolicy values, which is applied to the slow consumer.
+        isSlowConsumer (bool): True if the client is over the high-water mark and has not drained yet.
+        broadcastCache (BroadcastCache): The cache of the broadcast frames, shared with the other clients.
+        encodedCount (int): The number of messages encoded for the client.
+        reusedCount (int): The number of messages sent to the client with the frame encoded for another client.
+        encodeTime (float): The time spent encoding the messages for the client in seconds.
+        subscription (Optional[Subscription]): The objects and properties observed by the client, or None if it
+            observes everything.
+        channel (Optional[QWebChannel]): The web channel connected to the transport, or None if it is not connected
+            by a service.
     """
 
-    def __init__(self, socket: QWebSocket) -> None:
+    textCodec = JsonCodec()
+    """ The codec that decodes the text frames, which are always JSON. """
+
+    maxPendingInvocations = 1024
+    """ The maximum number of calls whose responses are awaited to be recorded in the metrics. """
+
+    def __init__(
+            self,
+            socket: QWebSocket,
+            codec: Optional[Codec] = None,
+            batch: bool = False,
+            broadcastCache: Optional[BroadcastCache] = None,
+    ) -> None:
         """Initializes the WebSocketTransport object with the given socket.
 
         Args:
             socket (QWebSocket): The QWebSocket object that handles the WebSocket connection.
+            codec (Codec, optional): The codec object for the outgoing messages. Defaults to None, which selects the
+                JSON codec.
+            batch (bool, optional): True to send the messages of one event loop iteration as a single array frame.
+                Defaults to False.
+            broadcastCache (BroadcastCache, optional): The cache of the broadcast frames, which is shared by the
+                transports of the same codec object. Defaults to None, which creates a cache for the transport alone,
+                which watches no objects, so nothing is cached.
         """
         # Call the superclass constructor with the socket
         super().__init__(socket)
         # Assign the socket attribute
         self.socket = socket
+        # Assign the codec attribute
+        self.codec = Codec.create(codec)
+        # Text frames are always JSON, decode them with the codec itself if it is a JSON codec
+        self.textCodec = self.codec if isinstance(self.codec, JsonCodec) else WebSocketTransport.textCodec
+        # Assign the batch attribute
+        self.batch = batch
+        # Initialize the list of messages waiting for the end of the event loop iteration
+        self._batchMessages = []
+        # Create a zero interval timer, which fires once the event loop gets back to processing events
+        self._batchTimer = QTimer(self)
+        self._batchTimer.setSingleShot(True)
+        self._batchTimer.setInterval(0)
+        self._batchTimer.timeout.connect(self.flushBatch)
+        # Assign the broadcast cache and initialize the encoding counters of the client
+        self.broadcastCache = broadcastCache if broadcastCache is not None else BroadcastCache(self)
+        self.encodedCount = 0
+        self.reusedCount = 0
+        self.encodeTime = 0.0
+        # Initialize the subscription of the client, it observes everything until it subscribes
+        self.subscription: Optional[Subscription] = None
+        # Initialize the web channel, the service assigns it once it connects the transport
+        self.channel: Optional[QWebChannel] = None
+        # Initialize the identifier of the init message, whose response is filtered by the subscription
+        self._initId = None
+        # Initialize the outgoing buffer limit and the slow consumer state
+        self.highWaterMark = 0
+        self.slowConsumerPolicy = SlowConsumerPolicy.Coalesce
+        self.isSlowConsumer = False
+        # Initialize the property update which is held back from the slow consumer
+        self._heldPropertyUpdate = None
+        # Create a zero interval timer, which acknowledges the held back property updates on behalf of the client
+        self._idleTimer = QTimer(self)
+        self._idleTimer.setSingleShot(True)
+        self._idleTimer.setInterval(0)
+        self._idleTimer.timeout.connect(self.onIdleTimeout)
+        # Initialize the streams of the results being sent, mapped by the stream identifiers
+        self.streams: Dict[int, Stream] = {}
+        self._nextStreamId = 0
+        # Initialize the identifiers of the calls whose responses are sent later by the coroutine actions
+        self._deferredResponses = set()
+        # Initialize the batches waiting for the responses of their calls, mapped by the identifiers of the calls
+        self._batchCalls: Dict[str, Tuple[InvokeBatch, int]] = {}
+        # Initialize the invocations whose responses are not sent yet, mapped by the identifiers of the calls, so the
+        # sizes of the responses are recorded for the called actions. A batch is mapped to the invocations of its calls.
+        self._pendingInvocations: Dict[Any, List[Invocation]] = {}
+        # Connect the bytesWritten signal of the socket to the onBytesWritten slot
+        self.socket.bytesWritten.connect(self.onBytesWritten)
         # Connect the textMessageReceived signal of the socket to the textMessageReceived slot
         self.socket.textMessageReceived.connect(self.textMessageReceived)
+        # Connect the binaryMessageReceived signal of the socket to the binaryMessageReceived slot
+        self.socket.binaryMessageReceived.connect(self.binaryMessageReceived)
         # Connect the disconnected signal of the socket to the onSocketDisconnected slot
         self.socket.disconnected.connect(self.onSocketDisconnected)
 
     disconnected = Signal(QWebChannelAbstractTransport)
     """ The signal that is emitted when the socket is disconnected. """
 
+    slowConsumerDetected = Signal(QWebChannelAbstractTransport)
+    """ The signal that is emitted when the outgoing buffer of the socket goes over the high-water mark. """
+
+    subscriptionRequested = Signal(QWebChannelAbstractTransport, object)
+    """ The signal that is emitted with the subscribed objects and properties when the client subscribes. """
+
     def __del__(self) -> None:
         """Deletes the WebSocketTransport object and the socket object."""
         # Delete the socket object later
@@ -52,6 +727,11 @@ class WebSocketTransport(QWebChannelAbstractTransport):
 
         This slot is invoked when the socket object emits the disconnected signal.
         """
+        # Close the streams, nobody is waiting for their items anymore
+        for stream in [*self.streams.values()]:
+            stream.close()
+        # Forget the calls which are not answered, their responses are not sent anymore
+        self._pendingInvocations.clear()
         # Emit the disconnected signal with the self object
         self.disconnected.emit(self)
         # Delete the socket object later
@@ -59,58 +739,538 @@ class WebSocketTransport(QWebChannelAbstractTransport):
         # Delete the self object later
         self.deleteLater()
 
-    def sendMessage(self, message) -> None:
+    def setHighWaterMark(self, highWaterMark: int, policy: int = SlowConsumerPolicy.Coalesce) -> None:
+        """Sets the outgoing buffer limit of the client and the policy which is applied when it is exceeded.
+
+        Args:
+            highWaterMark (int): The number of bytes waiting in the socket buffer above which the client is considered
+                as a slow consumer, or 0 for no limit.
+            policy (int, optional): One of the SlowConsumerPolicy values. Defaults to SlowConsumerPolicy.Coalesce.
+        """
+        self.highWaterMark = highWaterMark
+        self.slowConsumerPolicy = policy
+
+    def deferResponse(self, messageId: Any) -> None:
+        """Holds back the response that the web channel sends for a call, the response is sent later by sendResponse.
+
+        Args:
+            messageId: The identifier of the call message.
+        """
+        self._deferredResponses.add(messageId)
+
+    def sendResponse(self, messageId: Any, data: Any) -> None:
+        """Sends the response of a call whose response was deferred.
+
+        Args:
+            messageId: The identifier of the call message.
+            data: The response data.
+        """
+        self._deferredResponses.discard(messageId)
+        self.sendMessage({"type": MessageType.Response, "id": messageId, "data": data})
+
+    def openStream(self, items: Iterable[Any], chunkSize: int) -> int:
+        """Starts sending the items of an iterable to the client in chunks.
+
+        Args:
+            items (Iterable[Any]): The items to be sent.
+            chunkSize (int): The maximum number of items in a chunk.
+
+        Returns:
+            int: The identifier of the stream, which is sent to the client in the response of the call.
+        """
+        streamId = self._nextStreamId
+        self._nextStreamId += 1
+        self.streams[streamId] = Stream(self, streamId, items, chunkSize)
+        return streamId
+
+    def bytesToWrite(self) -> int:
+        """Returns the number of bytes waiting in the socket buffer to be written.
+
+        Returns:
+            int: The number of bytes waiting to be written.
+        """
+        return self.socket.bytesToWrite()
+
+    def sendMessage(self, message, shared: bool = True) -> None:
         """Sends a message to the WebSocket using the socket object.
 
-        The message is converted to a QJsonDocument and then to a compact JSON string.
+        The placeholder responses of the deferred calls are dropped, their real responses are sent by sendResponse.
+        The responses of the calls of a batch are collected, and sent together once all of them are answered.
+        If the client has subscribed, the property updates, the patches and the init response are limited to what it
+        observes.
+        If the client is over the high-water mark, the slow consumer policy is applied to the message first.
+
+        In batch mode, the message is queued and sent together with the other messages of the same event loop
+        iteration by the flushBatch slot. Otherwise, it is sent right away.
 
         Args:
             message: The message to be sent.
+            shared (bool, optional): True if the message is handed by QWebChannel to all the clients, so its frame can
+                be shared through the broadcast cache. False for the messages made by the transport, i.e. a merged
+                property update. Defaults to True.
         """
-        # Convert the message to a QJsonDocument
-        doc = QJsonDocument(message)
-        # Send the JSON string of the document using the socket object
-        self.socket.sendTextMessage(
-            doc.toJson(QJsonDocument.JsonFormat.Compact).toStdString()
-        )
+        # Take the key of a broadcast message as it is handed over, before it is filtered or queued
+        cache = self.broadcastCache
+        key = cache.messageKey(message, self.subscription) if shared else None
+        cache.sending += 1
+        try:
+            self._send(message, key)
+        finally:
+            cache.sending -= 1
+
+    def _send(self, message, key: Optional[Tuple]) -> None:
+        """Filters a message for the client and sends it, or queues it in batch mode.
+
+        Args:
+            message: The message to be sent.
+            key (Optional[Tuple]): The key of the message in the broadcast cache, or None if it is not shared.
+        """
+        # Collect the responses of the calls of a batch, the placeholders of the deferred ones are left to sendResponse
+        if message.get("type") == MessageType.Response and message.get("id") in self._batchCalls:
+            if message["id"] not in self._deferredResponses:
+                self._resolveBatchCall(message["id"], message.get("data"))
+            return
+        # Drop the placeholder responses of the deferred calls
+        if message.get("type") == MessageType.Response and message.get("id") in self._deferredResponses:
+            self._deferredResponses.discard(message.get("id"))
+            return
+        # Limit the message to the objects and properties observed by the client
+        if self.subscription is not None:
+            messageType = message.get("type")
+            if messageType == MessageType.PropertyUpdate:
+                message = self.subscription.filterPropertyUpdate(message)
+                # Nothing is observed, QWebChannel sends no more property updates until the client acknowledges this
+                # one as idle, acknowledge it on behalf of the client
+                if message is None:
+                    self._idleTimer.start()
+                    return
+            elif messageType == MessageType.Signal:
+                if not self.subscription.observesSignal(message):
+                    return
+            elif messageType == MessageType.Response and self._initId is not None and message.get("id") == self._initId:
+                self._initId = None
+                message = {**message, "data": self.subscription.filterInit(message["data"])}
+        # Apply the slow consumer policy if the outgoing buffer is over the high-water mark
+        if self.highWaterMark > 0 and self.socket.bytesToWrite() >= self.highWaterMark:
+            if not self._admitSlowConsumerMessage(message):
+                return
+        # Send the message right away if the batch mode is off
+        if not self.batch:
+            self._sendFrame(message, key)
+            return
+        # Queue the message along with its key
+        self._batchMessages.append((message, key))
+        # Start the timer for the first message of the event loop iteration
+        if len(self._batchMessages) == 1:
+            self._batchTimer.start()
+
+    def invokeBatch(self, messageId: Any, calls: List[Dict[str, Any]], size: int = 0) -> None:
+        """Invokes the methods of a batch one by one, in order, and answers the batch with the list of their results.
+
+        The calls are dispatched to the web channel as ordinary invoke method messages, so they are answered as if
+        they were sent one by one, including the deferred responses of the coroutine and executor actions. The batch
+        is answered once the last of them is answered. The sizes of the batch invoke message and of its response are
+        shared evenly by the calls in the metrics of the called actions.
+
+        Args:
+            messageId: The identifier of the batch invoke message.
+            calls (List[Dict[str, Any]]): The calls, each one with the object, method and args of an invoke method
+                message, and the extra fields of the call, i.e. the version known by the client.
+            size (int, optional): The size of the batch invoke message. Defaults to 0.
+        """
+        batch = InvokeBatch(messageId, len(calls))
+        # Answer an empty batch right away
+        if len(calls) == 0:
+            self.sendMessage({"type": MessageType.Response, "id": messageId, "data": []})
+            return
+
+        # Keep the invocations of the calls until the batch is answered, which may be right after the last call
+        invocations: List[Invocation] = []
+        track = Metrics.instance().enabled and messageId is not None
+        if track:
+            self._keepInvocations(messageId, invocations)
+        for index, call in enumerate(calls):
+            # Give each call an identifier which cannot clash with the numeric identifiers of the client
+            callId = f"batch.{messageId}.{index}"
+            self._batchCalls[callId] = (batch, index)
+            callMessage = {**call, "type": MessageType.InvokeMethod, "id": callId}
+            # The web channel answers the unknown methods of a known object like the methods which return nothing,
+            # check them first
+            if self._hasMethod(call.get("object"), call.get("method")):
+                with Invocation(self, callMessage) as invocation:
+                    invocations.append(invocation)
+                    self.messageReceived.emit(callMessage, self)
+            # The web channel does not answer the calls of unknown objects, answer them and the unknown methods with
+            # an error
+            if callId in self._batchCalls and callId not in self._deferredResponses:
+                error = f"Cannot invoke method '{call.get('method')}' of object '{call.get('object')}'"
+                Logger.error(error, "WebSocketTransport")
+                self._resolveBatchCall(callId, Response.envelope(error=error))
+
+        # Record the size of the batch for the called actions
+        called = [invocation for invocation in invocations if invocation.metrics is not None]
+        for invocation in called:
+            invocation.metrics.inboundBytes += size // len(calls)
+        # Forget the batch if it called no action, nothing is recorded for its response
+        if track and len(called) == 0:
+            self._pendingInvocations.pop(messageId, None)
+
+    def _hasMethod(self, objectName: Any, method: Any) -> bool:
+        """Checks if an object of the web channel has a method, given by its name, signature or index.
+
+        Args:
+            objectName: The name of the object.
+            method: The name, the signature or the index of the method.
+
+        Returns:
+            bool: False if the object is known and has no such method, True otherwise, including when the web channel
+            is not known, so the web channel checks the call itself.
+        """
+        if self.channel is None:
+            return True
+        obj = self.channel.registeredObjects().get(objectName)
+        if obj is None:
+            return True
+        metaObject = obj.metaObject()
+        if isinstance(method, int):
+            return 0 <= method < metaObject.methodCount()
+        for index in range(metaObject.methodCount()):
+            metaMethod = metaObject.method(index)
+            if method in (metaMethod.name().data().decode(), metaMethod.methodSignature().data().decode()):
+                return True
+        return False
+
+    def _keepInvocations(self, messageId: Any, invocations: List[Invocation]) -> None:
+        """Keeps the invocations of a call, or of the calls of a batch, until the response is sent, so its size is
+        recorded for the called actions.
+
+        The oldest invocations are dropped beyond maxPendingInvocations, i.e. the calls of coroutines which never
+        finish.
+
+        Args:
+            messageId: The identifier of the invoke message, or of the batch invoke message.
+            invocations (List[Invocation]): The invocations, their actions are known once they are called.
+        """
+        self._pendingInvocations[messageId] = invocations
+        if len(self._pendingInvocations) > WebSocketTransport.maxPendingInvocations:
+            del self._pendingInvocations[next(iter(self._pendingInvocations))]
+
+    def _resolveBatchCall(self, callId: str, result: Any) -> None:
+        """Records the result of a call of a batch, and answers the batch if it is the last one.
+
+        Args:
+            callId (str): The identifier of the call.
+            result: The result of the call.
+        """
+        batch, index = self._batchCalls.pop(callId)
+        if batch.resolve(index, result):
+            self.sendMessage({"type": MessageType.Response, "id": batch.messageId, "data": batch.results})
+
+    @Slot()
+    def flushBatch(self) -> None:
+        """Sends the queued messages as a single array frame, or as a plain message frame if there is only one.
+
+        This slot is invoked by the batch timer once the event loop iteration which queued the messages is over.
+        """
+        # Take the queued messages
+        messages = self._batchMessages
+        self._batchMessages = []
+        # Return if there is nothing to send
+        if len(messages) == 0:
+            return
+        # Send the message as it is if it is alone
+        if len(messages) == 1:
+            self._sendFrame(*messages[0])
+            return
+        # Join the frames of the messages, so the broadcast ones are not encoded again, otherwise send the whole list
+        if self.codec.joinable:
+            self._sendEncoded(self.codec.join([self._encode(message, key) for message, key in messages]))
+        else:
+            self._sendEncoded(self._encode([message for message, _ in messages]))
+
+    def _admitSlowConsumerMessage(self, message) -> bool:
+        """Applies the slow consumer policy to a message which is about to be sent to a client over the high-water mark.
+
+        Args:
+            message: The message to be sent.
+
+        Returns:
+            bool: True if the message should still be sent, False if it is dropped or held back.
+        """
+        # Notify the application once when the client becomes a slow consumer
+        if not self.isSlowConsumer:
+            self.isSlowConsumer = True
+            Logger.warning(
+                f"Slow consumer, {self.socket.bytesToWrite()} bytes waiting to be written", "WebSocketTransport"
+            )
+            self.slowConsumerDetected.emit(self)
+
+        # Disconnect the client, nothing is sent anymore
+        if self.slowConsumerPolicy == SlowConsumerPolicy.Disconnect:
+            if self.socket.state() != QAbstractSocket.SocketState.UnconnectedState:
+                self.socket.close(QWebSocketProtocol.CloseCode.CloseCodePolicyViolated, "Slow consumer")
+            return False
+
+        # The other messages must still reach the client, i.e. the responses of the pending calls
+        if message.get("type") != MessageType.PropertyUpdate:
+            return True
+
+        # Merge the property update into the held back one, so the latest values are sent once the buffer drains
+        if self.slowConsumerPolicy == SlowConsumerPolicy.Coalesce:
+            self._holdPropertyUpdate(message)
+
+        # QWebChannel sends no more property updates until the client acknowledges this one as idle,
+        # acknowledge it on behalf of the client
+        self._idleTimer.start()
+        return False
+
+    def _holdPropertyUpdate(self, message) -> None:
+        """Merges a property update message into the held back property update, the latest values win.
+
+        Args:
+            message: The property update message.
+        """
+        # Hold the message as it is if there is nothing held yet
+        if self._heldPropertyUpdate is None:
+            self._heldPropertyUpdate = message
+            return
+
+        # Index the held entries by their object names
+        heldEntries = {entry["object"]: entry for entry in self._heldPropertyUpdate["data"]}
+        for entry in message["data"]:
+            heldEntry = heldEntries.get(entry["object"])
+            # Append the entries of the new objects
+            if heldEntry is None:
+                self._heldPropertyUpdate["data"].append(entry)
+                heldEntries[entry["object"]] = entry
+                continue
+            # Overwrite the signals and properties of the known objects
+            heldEntry["signals"].update(entry["signals"])
+            heldEntry["properties"].update(entry["properties"])
+
+    @Slot()
+    def onIdleTimeout(self) -> None:
+        """Acknowledges the dropped or held back property updates to the web channel as if the client did it.
+
+        This slot is invoked by the idle timer in the event loop iteration after the property update is dropped.
+        """
+        # The web channel sends the property updates it held back for the client, which are not the current ones
+        self.broadcastCache.invalidate()
+        self.messageReceived.emit({"type": MessageType.Idle}, self)
+
+    @Slot(int)
+    def onBytesWritten(self, _: int) -> None:
+        """Clears the slow consumer state and sends the held back property update once the buffer drains.
+
+        The client is considered as drained when the outgoing buffer goes down to the half of the high-water mark.
+
+        This slot is invoked when the socket object emits the bytesWritten signal.
+        """
+        # Return if the client is not a slow consumer or is still over the low-water mark
+        if not self.isSlowConsumer or self.socket.bytesToWrite() > self.highWaterMark // 2:
+            return
+        # Clear the slow consumer state
+        self.isSlowConsumer = False
+        # Send the held back property update
+        heldPropertyUpdate = self._heldPropertyUpdate
+        self._heldPropertyUpdate = None
+        if heldPropertyUpdate is not None:
+            self.sendMessage(heldPropertyUpdate, shared=False)
+
+    def _encode(self, message, key: Optional[Tuple] = None) -> Any:
+        """Encodes a message, or a list of messages, with the codec.
+
+        The broadcast messages are looked up in the broadcast cache first by their keys, so a message which is equal to
+        the one just encoded for another client is not encoded again.
+
+        Args:
+            message: The message, or the list of messages, to be encoded.
+            key (Optional[Tuple], optional): The key of the message in the broadcast cache. Defaults to None, which
+                encodes the message.
+
+        Returns:
+            The encoded frame.
+        """
+        cache = self.broadcastCache
+        # Reuse the frame of an equal broadcast message
+        frame = cache.lookup(self.codec, key) if key is not None else None
+        if frame is not None:
+            self.reusedCount += 1
+            cache.reusedCount += 1
+        else:
+            # Encode the message and count the time spent
+            start = time.perf_counter()
+            frame = self.codec.encode(message)
+            elapsed = time.perf_counter() - start
+            self.encodedCount += 1
+            self.encodeTime += elapsed
+            cache.encodedCount += 1
+            cache.encodeTime += elapsed
+            # Keep the frame of a broadcast message for the other clients
+            if key is not None:
+                cache.store(self.codec, key, frame)
+        # Record the message in the metrics
+        self._recordOutbound(message, frame)
+        return frame
+
+    def _recordOutbound(self, message, frame) -> None:
+        """Records an outgoing message in the metrics, the size of a response or a signal is recorded for its action
+        or its signal.
+
+        Args:
+            message: The message, or the list of messages.
+            frame: The encoded frame of the message.
+        """
+        metrics = Metrics.instance()
+        if not metrics.enabled:
+            return
+        if not isinstance(message, dict):
+            metrics.outboundMessages.mark(len(message))
+            return
+        metrics.outboundMessages.mark()
+        messageType = message.get("type")
+        if messageType == MessageType.Response:
+            # The calls of a batch share its response evenly
+            invocations = self._pendingInvocations.pop(message.get("id"), None) or []
+            for invocation in invocations:
+                if invocation.metrics is not None:
+                    invocation.metrics.outboundBytes += len(frame) // len(invocations)
+        elif messageType == MessageType.Signal:
+            signalMetrics = metrics.signalAt(message.get("object"), message.get("signal"))
+            if signalMetrics is not None:
+                signalMetrics.messages += 1
+                signalMetrics.outboundBytes += len(frame)
+
+    def _sendFrame(self, message, key: Optional[Tuple] = None) -> None:
+        """Encodes a message, or a list of messages, and sends it using the socket object.
+
+        Args:
+            message: The message, or the list of messages, to be sent.
+            key (Optional[Tuple], optional): The key of the message in the broadcast cache. Defaults to None.
+        """
+        self._sendEncoded(self._encode(message, key))
+
+    def _sendEncoded(self, frame) -> None:
+        """Sends an encoded frame using the socket object.
+
+        The frame is sent as a binary frame for binary codecs or as a text frame for text codecs.
+
+        Args:
+            frame: The encoded frame.
+        """
+        # Record the size of the frame in the metrics
+        metrics = Metrics.instance()
+        if metrics.enabled:
+            metrics.outboundBytes.mark(len(frame))
+        # Send the frame using the socket object
+        if self.codec.binary:
+            self.socket.sendBinaryMessage(frame)
+        else:
+            self.socket.sendTextMessage(frame)
 
     @Slot(str)
     def textMessageReceived(self, messageData: str) -> None:
         """Receives a text message from the WebSocket using the socket object and emits the messageReceived signal.
 
-        The text message is parsed as a QJsonDocument and then as a QJsonObject.
-        If there is any error in parsing, the error is logged using the Logger object.
+        The text message is decoded as JSON regardless of the codec, clients are free to send text frames.
+        JSON codecs decode the text messages themselves, other codecs fall back to the default JSON codec.
 
         This slot is invoked when the socket object emits the textMessageReceived signal.
 
         Args:
             messageData (str): The text message received from the WebSocket.
         """
-        # Create a QJsonParseError object
-        error = QJsonParseError()
-        # Parse the text message as a QJsonDocument
-        messageDoc = QJsonDocument.fromJson(
-            QByteArray.fromStdString(messageData), error
-        )
-        # Check if there is any error in parsing
-        if error.errorString() != "no error occurred":
-            # Log the error of parsing the text message as a JSON object
-            Logger.error(
-                f"Failed to parse text message as JSON object: {messageData}",
-                "WebSocketTransport",
-            )
+        # Decode the text message and dispatch it
+        self._dispatch(self.textCodec, messageData)
+
+    @Slot(QByteArray)
+    def binaryMessageReceived(self, messageData: QByteArray) -> None:
+        """Receives a binary message from the WebSocket using the socket object and emits the messageReceived signal.
+
+        The binary message is decoded with the codec of the transport.
+
+        This slot is invoked when the socket object emits the binaryMessageReceived signal.
+
+        Args:
+            messageData (QByteArray): The binary message received from the WebSocket.
+        """
+        # Decode the binary message and dispatch it
+        self._dispatch(self.codec, messageData)
+
+    def _dispatch(self, codec: Codec, messageData) -> None:
+        """Decodes a received frame with the given codec and emits the messageReceived signal.
+
+        If there is any error in decoding, the error is logged using the Logger object.
+
+        Args:
+            codec (Codec): The codec object to decode the frame.
+            messageData (str | QByteArray): The received frame.
+        """
+        try:
+            # Decode the frame as a message
+            message = codec.decode(messageData)
+        except CodecError as e:
+            # Log the error of decoding the frame
+            Logger.error(f"Failed to decode message: {messageData}", "WebSocketTransport")
             # Log the error string
-            Logger.error(f"Error is: {error.errorString()}", "WebSocketTransport")
-            # Return from the slot
+            Logger.error(f"Error is: {e}", "WebSocketTransport")
+            # Return from the method
             return
-        # Check if the document is not a JSON object
-        elif not messageDoc.isObject():
-            # Log the error of receiving a JSON message that is not an object
-            Logger.error(f"Received JSON message that is not an object: {messageData}")
-            # Return from the slot
+        # Record the message in the metrics, the text frames are counted by their length in characters
+        metrics = Metrics.instance()
+        size = len(messageData) if isinstance(messageData, str) else messageData.size()
+        if metrics.enabled:
+            metrics.inboundMessages.mark()
+            metrics.inboundBytes.mark(size)
+        # Handle the flow control messages of the streams, they are not known by the web channel
+        messageType = message.get("type")
+        if messageType in (MessageType.StreamAck, MessageType.StreamCancel):
+            stream = self.streams.get(message.get("stream"))
+            if stream is None:
+                return
+            if messageType == MessageType.StreamAck:
+                stream.grant(int(message.get("credit", 1)))
+            else:
+                stream.cancel()
             return
-        # Emit the messageReceived signal with the JSON object and the self object
-        self.messageReceived.emit(messageDoc.object(), self)
+        # Handle the subscriptions, they are not known by the web channel
+        if messageType == MessageType.Subscribe:
+            objects = message.get("objects")
+            if not isinstance(objects, dict):
+                Logger.error(f"Invalid subscription: {objects}", "WebSocketTransport")
+                return
+            self.subscriptionRequested.emit(self, objects)
+            return
+        # Handle the batches of calls, they are not known by the web channel
+        if messageType == MessageType.BatchInvoke:
+            calls = message.get("calls")
+            if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+                Logger.error(f"Invalid batch: {calls}", "WebSocketTransport")
+                return
+            self.invokeBatch(message.get("id"), calls, size)
+            return
+        # Remember the init message, its response is limited to the subscribed objects
+        if messageType == MessageType.Init:
+            self._initId = message.get("id")
+            # Deliver the pending notifications first, so the init values are the base of the next delta patches
+            NotifyScheduler.instance().flushAll()
+        # The web channel sends the property updates it held back for the client, which are not the current ones
+        elif messageType == MessageType.Idle:
+            self.broadcastCache.invalidate()
+        # Emit the messageReceived signal with the JSON object and the self object, within an invocation so the
+        # actions can find out which client called them
+        track = metrics.enabled and messageType == MessageType.InvokeMethod and message.get("id") is not None
+        with Invocation(self, message) as invocation:
+            # Keep the invocation until its response is sent, the called action is known by then
+            if track:
+                self._keepInvocations(message["id"], [invocation])
+            self.messageReceived.emit(message, self)
+        # Record the size of the call for the called action
+        if invocation.metrics is not None:
+            invocation.metrics.inboundBytes += size
+        # Forget the call if it called no action, i.e. an unknown method which is never answered
+        elif track:
+            self._pendingInvocations.pop(message["id"], None)
 
 
 # A class that represents a WebSocket client wrapper for QWebChannel
@@ -119,21 +1279,37 @@ class WebSocketClientWrapper(QObject):
 
     Attributes:
         server (QWebSocketServer): The QWebSocketServer object that listens for WebSocket connections.
+        codec (Codec): The codec object that is given to the transports of the new connections.
+        batch (bool): The batch mode that is given to the transports of the new connections.
+        broadcastCache (BroadcastCache): The cache of the broadcast frames, which is shared by the transports.
     """
 
     def __init__(
-            self, server: QWebSocketServer, parent: Optional[QObject] = None
+            self,
+            server: QWebSocketServer,
+            parent: Optional[QObject] = None,
+            codec: Optional[Codec] = None,
+            batch: bool = False,
     ) -> None:
         """Initializes the WebSocketClientWrapper object with the given server and parent.
 
         Args:
             server (QWebSocketServer): The QWebSocketServer object that listens for WebSocket connections.
             parent (Optional[QObject], optional): The parent object for the WebSocketClientWrapper. Defaults to None.
+            codec (Codec, optional): The codec object for the transports. Defaults to None, which selects the JSON
+                codec.
+            batch (bool, optional): True to batch the messages of the transports. Defaults to False.
         """
         # Call the superclass constructor with the parent
         super().__init__(parent)
         # Assign the server attribute
         self.server = server
+        # Assign the codec attribute
+        self.codec = Codec.create(codec)
+        # Assign the batch attribute
+        self.batch = batch
+        # Create the broadcast cache, so the messages sent to all the transports are encoded once
+        self.broadcastCache = BroadcastCache(self)
         # Connect the newConnection signal of the server to the handleNewConnection slot
         self.server.newConnection.connect(self.handleNewConnection)
 
@@ -151,7 +1327,9 @@ class WebSocketClientWrapper(QObject):
         This slot is invoked when the server object emits the newConnection signal.
         """
         # Create a WebSocketTransport object for the next pending connection from the server
-        wsTransport = WebSocketTransport(self.server.nextPendingConnection())
+        wsTransport = WebSocketTransport(
+            self.server.nextPendingConnection(), self.codec, self.batch, self.broadcastCache
+        )
         # Connect the disconnected signal of the wsTransport to the clientDisconnected signal
         wsTransport.disconnected.connect(self.clientDisconnected)
         # Emit the clientConnected signal with the wsTransport object
@@ -169,8 +1347,38 @@ class WebChannelService(QObject):
         clientWrapper (WebSocketClientWrapper): The WebSocketClientWrapper object that handles the WebSocket connections from the server.
         channel (QWebChannel): The QWebChannel object that manages the communication between the server and the clients.
         activeClientCount (int): The number of active WebSocket clients connected to the server.
+        transports (List[WebSocketTransport]): The transports of the active WebSocket clients.
+        controllers (List[Controller]): The registered controllers, which are kept alive as long as the service, the
+            web channel does not hold them.
+        highWaterMark (int): The outgoing buffer limit of the clients in bytes, or 0 if there is no limit.
+        slowConsumerPolicy (int): One of the SlowConsumerPolicy values, which is applied to the slow consumers.
+        propertyUpdateInterval (int): The effective interval of the property updates in milliseconds.
+        minPropertyUpdateInterval (int): The interval set by setPropertyUpdateInterval, which is the narrowest one
+            in adaptive mode.
+        maxPropertyUpdateInterval (int): The widest interval in adaptive mode.
+        adaptivePropertyUpdates (bool): True if the interval is adapted to the load of the service.
+        load (float): The share of the last sampling period spent encoding messages, measured in adaptive mode.
+        lag (float): The delay of the event loop in milliseconds, measured in adaptive mode by how late the sampling
+            timer fires.
+        metrics (Metrics): The metrics of the actions, the signals and the traffic, which are shared by the services
+            of the process, see Metrics.snapshot. They are recorded once enabled, see serveMetrics.
+        metricsServer (Optional[MetricsServer]): The HTTP endpoint of the metrics, or None if they are not served.
     """
 
+    defaultPropertyUpdateInterval = 50
+    """ The default interval of the property updates of QWebChannel in milliseconds. """
+
+    adaptiveSampleInterval = 1000
+    """ The period at which the load is sampled in adaptive mode in milliseconds. """
+
+    adaptiveBusyLoad = 0.25
+    """ The load above which the property update interval is widened in adaptive mode. It is widened as well if the
+    event loop lags behind by more than the interval. """
+
+    adaptiveIdleLoad = 0.05
+    """ The load below which the property update interval is narrowed in adaptive mode, unless the event loop lags
+    behind by more than the half of the interval. """
+
     def __init__(self, serviceName: str, parent: Optional[QObject] = None) -> None:
         """Initializes the WebChannelService object with the given service name and parent.
 
@@ -194,18 +1402,58 @@ class WebChannelService(QObject):
         self.channel: QWebChannel = None
         # Initialize the activeClientCount attribute to 0
         self.activeClientCount = 0
+        # Initialize the transports attribute to an empty list
+        self.transports: List[WebSocketTransport] = []
+        # Initialize the controllers attribute to an empty list
+        self.controllers: List[Controller] = []
+        # Initialize the outgoing buffer limit of the clients, no limit by default
+        self.highWaterMark = 0
+        self.slowConsumerPolicy = SlowConsumerPolicy.Coalesce
+        # Initialize the property update interval to the default one of QWebChannel
+        self.propertyUpdateInterval = WebChannelService.defaultPropertyUpdateInterval
+        self.minPropertyUpdateInterval = WebChannelService.defaultPropertyUpdateInterval
+        self.maxPropertyUpdateInterval = WebChannelService.defaultPropertyUpdateInterval
+        self.adaptivePropertyUpdates = False
+        self.load = 0.0
+        self.lag = 0.0
+        # Create the timer which samples the load in adaptive mode, it is rearmed on every sample and must fire on
+        # time, so how late it fires is the lag of the event loop
+        self._adaptiveTimer = QTimer(self)
+        self._adaptiveTimer.setSingleShot(True)
+        self._adaptiveTimer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._adaptiveTimer.setInterval(WebChannelService.adaptiveSampleInterval)
+        self._adaptiveTimer.timeout.connect(self.onAdaptiveSample)
+        self._lastSampleTime = 0.0
+        self._lastEncodeTime = 0.0
+        # Take the metrics of the process, they are not served until serveMetrics is called
+        self.metrics = Metrics.instance()
+        self.metricsServer: Optional[MetricsServer] = None
+
+    slowConsumerDetected = Signal(WebSocketTransport)
+    """ The signal that is emitted when the outgoing buffer of a client goes over the high-water mark. """
+
+    propertyUpdateIntervalChanged = Signal(int)
+    """ The signal that is emitted with the effective property update interval in milliseconds when it changes. """
 
-    def start(self, port: int) -> bool:
+    def start(self, port: int, codec: Optional[Codec | str] = None, batch: bool = False) -> bool:
         """Starts the web channel service by creating and listening to a WebSocket server at the given port.
 
         Args:
             port (int): The port number for the WebSocket server.
+            codec (Codec | str, optional): The wire format of the outgoing messages, either a codec object or a codec
+                name, "json", "fastjson" or "msgpack". Defaults to None, which selects "json". Clients decode the
+                format of each frame on their own, so no client side configuration is needed.
+            batch (bool, optional): True to send all the messages which are produced for a client in one event loop
+                iteration as a single array frame, i.e. the signals emitted in a loop or the property updates of one
+                action. Defaults to False.
 
         Returns:
             bool: True if the web channel service is started successfully, False otherwise.
         """
         # Assign the port attribute
         self.port = port
+        # Create the codec object before listening, so an unavailable codec fails early
+        codec = Codec.create(codec)
         # Create a QWebSocketServer object with the service name and the non-secure mode
         self.websocketServer = QWebSocketServer(
             self.serviceName, QWebSocketServer.SslMode.NonSecureMode, self
@@ -221,9 +1469,13 @@ class WebChannelService(QObject):
         # Connect the closed signal of the WebSocket server to the onClosed slot
         self.websocketServer.closed.connect(self.onClosed)
         # Create a WebSocketClientWrapper object with the WebSocket server
-        self.clientWrapper = WebSocketClientWrapper(self.websocketServer)
+        self.clientWrapper = WebSocketClientWrapper(self.websocketServer, codec=codec, batch=batch)
         # Create a QWebChannel object
         self.channel = QWebChannel()
+        # Apply the property update interval
+        self.channel.setPropertyUpdateInterval(self.propertyUpdateInterval)
+        if self.adaptivePropertyUpdates:
+            self._startSampling()
         # Connect the clientConnected signal of the clientWrapper to the onClientConnected slot
         self.clientWrapper.clientConnected.connect(self.onClientConnected)
         # Connect the clientDisconnected signal of the clientWrapper to the onClientDisconnected slot
@@ -241,11 +1493,159 @@ class WebChannelService(QObject):
         if self.websocketServer is None:
             # Return from the method
             return
+        # Stop sampling the load
+        self._adaptiveTimer.stop()
+        # Stop serving the metrics
+        if self.metricsServer is not None:
+            self.metricsServer.stop()
+            self.metricsServer = None
         # Close the WebSocket server
         self.websocketServer.close()
         # Delete the WebSocket server
         self.websocketServer = None
 
+    def serveMetrics(self, port: int, path: str = "/metrics") -> bool:
+        """Serves the metrics of the service in the OpenMetrics text format over HTTP, so they can be scraped by a
+        Prometheus compatible monitoring stack.
+
+        Along with the metrics of the actions, the signals and the traffic, the number of clients, the outgoing queue
+        of each client and the delay of the event loop are served, see MetricsServer. The metrics are enabled from
+        now on.
+
+        Args:
+            port (int): The port number of the HTTP endpoint.
+            path (str, optional): The path of the metrics. Defaults to "/metrics".
+
+        Returns:
+            bool: True if the endpoint is started successfully, False otherwise.
+        """
+        self.metrics.enabled = True
+        if self.metricsServer is not None:
+            self.metricsServer.stop()
+        self.metricsServer = MetricsServer(port, path, self)
+        self.metricsServer.addService(self)
+        if not self.metricsServer.start():
+            self.metricsServer = None
+            return False
+        return True
+
+    def setHighWaterMark(self, highWaterMark: int, policy: int = SlowConsumerPolicy.Coalesce) -> None:
+        """Sets the outgoing buffer limit of the clients and the policy which is applied when a client exceeds it.
+
+        A stalled client does not read its socket, so the messages pile up in the socket buffer of the server. Once
+        the number of bytes waiting to be written to a client goes over the high-water mark, the client is considered
+        as a slow consumer, the slowConsumerDetected signal is emitted and the policy is applied until the buffer
+        drains down to the half of the high-water mark.
+
+        The limit applies to the active clients and the ones which connect later.
+
+        Args:
+            highWaterMark (int): The number of bytes, or 0 for no limit.
+            policy (int, optional): One of the SlowConsumerPolicy values. Defaults to SlowConsumerPolicy.Coalesce.
+        """
+        # Assign the limit and the policy
+        self.highWaterMark = highWaterMark
+        self.slowConsumerPolicy = policy
+        # Apply them to the active clients
+        for transport in self.transports:
+            transport.setHighWaterMark(highWaterMark, policy)
+
+    def setPropertyUpdateInterval(self, interval: int, adaptive: bool = False, maxInterval: int = 1000) -> None:
+        """Sets the interval at which QWebChannel sends the property changes to the clients.
+
+        The property changes are collected and sent to each client at most once per interval. A short interval lowers
+        the latency of the updates, while a long interval merges more changes into each update, which costs less to
+        encode and send.
+
+        In adaptive mode, the interval starts at the given interval. It is doubled, up to maxInterval, while the
+        service is busy, i.e. a large share of the time is spent encoding messages or the event loop lags behind by
+        more than the interval. It is halved, down to the given interval, while the service is idle. The effective
+        interval is reported by the propertyUpdateInterval attribute and the propertyUpdateIntervalChanged signal.
+
+        Args:
+            interval (int): The interval in milliseconds, the narrowest one in adaptive mode.
+            adaptive (bool, optional): True to adapt the interval to the load of the service. Defaults to False.
+            maxInterval (int, optional): The widest interval in adaptive mode in milliseconds. Defaults to 1000.
+
+        Raises:
+            ValueError: If the interval is negative, or the adaptive range is empty.
+        """
+        if interval < 0:
+            raise ValueError(f"Invalid property update interval {interval}")
+        if adaptive and (interval <= 0 or maxInterval < interval):
+            raise ValueError(f"Invalid adaptive property update interval range [{interval}, {maxInterval}]")
+
+        self.minPropertyUpdateInterval = interval
+        self.maxPropertyUpdateInterval = maxInterval if adaptive else interval
+        self.adaptivePropertyUpdates = adaptive
+        self._applyPropertyUpdateInterval(interval)
+        # Sample the load while the service is running in adaptive mode
+        if not adaptive:
+            self._adaptiveTimer.stop()
+        elif self.channel is not None and not self._adaptiveTimer.isActive():
+            self._startSampling()
+
+    def _applyPropertyUpdateInterval(self, interval: int) -> None:
+        """Applies an effective property update interval to the channel and reports it if it is changed.
+
+        Args:
+            interval (int): The interval in milliseconds.
+        """
+        if self.channel is not None:
+            self.channel.setPropertyUpdateInterval(interval)
+        if interval == self.propertyUpdateInterval:
+            return
+        self.propertyUpdateInterval = interval
+        self.propertyUpdateIntervalChanged.emit(interval)
+
+    def _startSampling(self) -> None:
+        """Starts sampling the load of the service in adaptive mode."""
+        self._lastSampleTime = time.perf_counter()
+        self._lastEncodeTime = self.encodeStats()["encodeTime"]
+        self._adaptiveTimer.start()
+
+    @Slot()
+    def onAdaptiveSample(self) -> None:
+        """Measures the load of the service and widens or narrows the property update interval accordingly.
+
+        The load is the share of the sampling period spent encoding the messages. The lag is how late the sampling
+        timer fires, since a busy event loop delays the timers.
+
+        This slot is invoked by the adaptive timer once per sampling period.
+        """
+        # Measure the sampling period, how late it ended and the time spent encoding within it
+        now = time.perf_counter()
+        elapsed = now - self._lastSampleTime
+        encodeTime = self.encodeStats()["encodeTime"]
+        self.lag = max(0.0, elapsed * 1000 - WebChannelService.adaptiveSampleInterval)
+        self.load = (encodeTime - self._lastEncodeTime) / elapsed if elapsed > 0 else 0.0
+        self._lastSampleTime = now
+        self._lastEncodeTime = encodeTime
+        self._adaptiveTimer.start()
+
+        # Merge more changes into each update while busy, lower the latency again while idle
+        interval = self.propertyUpdateInterval
+        if self.load > WebChannelService.adaptiveBusyLoad or self.lag > interval:
+            interval = min(self.maxPropertyUpdateInterval, interval * 2)
+        elif self.load < WebChannelService.adaptiveIdleLoad and self.lag <= interval / 2:
+            interval = max(self.minPropertyUpdateInterval, interval // 2)
+        self._applyPropertyUpdateInterval(interval)
+
+    def encodeStats(self) -> Dict[str, Any]:
+        """Returns the encoding counters of the service, which show the cost saved by encoding the broadcast messages
+        once for all the clients.
+
+        The counters of each client are kept by its transport, in its encodedCount, reusedCount and encodeTime
+        attributes.
+
+        Returns:
+            Dict[str, Any]: The encoded and reused message counts, the encoding time and the estimated time saved by
+                the reused frames, in seconds. All zero if the service is not started.
+        """
+        if self.clientWrapper is None:
+            return BroadcastCache().stats()
+        return self.clientWrapper.broadcastCache.stats()
+
     def isOnline(self) -> bool:
         """Checks if the web channel service is online by checking the status of the WebSocket server.
 
@@ -261,8 +1661,17 @@ class WebChannelService(QObject):
         Args:
             controller (Controller): The controller object to be registered.
         """
+        # Start a new generation of the broadcast frames on each signal, before the web channel sends it
+        self.clientWrapper.broadcastCache.watchSignals(controller, controller.name())
         # Register the controller object to the channel attribute using the name of the controller as the identifier
         self.channel.registerObject(controller.name(), controller)
+        # Keep the controller object alive, the channel attribute only refers to it
+        self.controllers.append(controller)
+        # Count the emissions of the signals of the controller
+        self.metrics.watchSignals(controller, controller.name())
+        # Publish the field names of the compact models, if there are any, along with the first controller
+        if len(CompactEncoding.models) > 0 and CompactSchema.channelName not in self.channel.registeredObjects():
+            self.channel.registerObject(CompactSchema.channelName, CompactSchema(self))
 
     @Slot()
     def onClosed(self) -> None:
@@ -282,6 +1691,16 @@ class WebChannelService(QObject):
         Args:
             transport (WebSocketTransport): The WebSocketTransport object that represents the WebSocket connection.
         """
+        # Apply the outgoing buffer limit to the transport object
+        transport.setHighWaterMark(self.highWaterMark, self.slowConsumerPolicy)
+        # Connect the slowConsumerDetected signal of the transport to the slowConsumerDetected signal
+        transport.slowConsumerDetected.connect(self.slowConsumerDetected)
+        # Connect the subscriptionRequested signal of the transport to the onSubscriptionRequested slot
+        transport.subscriptionRequested.connect(self.onSubscriptionRequested)
+        # Keep the transport object in the transports list
+        self.transports.append(transport)
+        # Let the transport look up the objects of the web channel, i.e. the methods called by its batches
+        transport.channel = self.channel
         # Connect the channel attribute to the transport object
         self.channel.connectTo(transport)
         # Increment the activeClientCount attribute
@@ -292,7 +1711,28 @@ class WebChannelService(QObject):
             self.serviceName,
         )
 
-    # noinspection PyUnusedLocal
+    @Slot(WebSocketTransport, object)
+    def onSubscriptionRequested(self, transport: WebSocketTransport, objects: Dict[str, Optional[List[str]]]) -> None:
+        """Replaces the subscription of a client, and sends it the current values of the newly subscribed properties.
+
+        This slot is invoked when a transport object emits the subscriptionRequested signal.
+
+        Args:
+            transport (WebSocketTransport): The WebSocketTransport object of the client.
+            objects (Dict[str, Optional[List[str]]]): The names of the subscribed properties, or None for all of them,
+                mapped by the object names.
+        """
+        registeredObjects = self.channel.registeredObjects()
+        # Deliver the pending patches first, so the values sent for the newly subscribed properties are the base of
+        # their next patches
+        NotifyScheduler.instance().flushAll()
+        previous = transport.subscription
+        transport.subscription = Subscription(objects, registeredObjects)
+        # The client has stale values of the properties which were filtered out so far
+        update = transport.subscription.propertyUpdate(previous, registeredObjects)
+        if update is not None:
+            transport.sendMessage(update, shared=False)
+
     @Slot(WebSocketTransport)
     def onClientDisconnected(self, transport: WebSocketTransport) -> None:
         """Decrements the active client count and cleans up the controller objects if the active client count is zero.
@@ -302,6 +1742,9 @@ class WebChannelService(QObject):
         Args:
             transport (WebSocketTransport): The WebSocketTransport object that represents the WebSocket connection.
         """
+        # Remove the transport object from the transports list
+        if transport in self.transports:
+            self.transports.remove(transport)
         # Decrement the activeClientCount attribute
         self.activeClientCount = self.activeClientCount - 1
         # Log the warning of a WebSocket disconnection
@@ -317,6 +1760,9 @@ class WebChannelService(QObject):
             for key in controllers:
                 # Get the controller object from the dictionary
                 controller: Controller = controllers[key]
+                # Skip the objects which are not controllers, i.e. the schema of the compact encoding
+                if not isinstance(controller, Controller):
+                    continue
                 # Log the information of cleaning up the controller object
                 Logger.info("Clean up ...", controller.name())
                 # Call the cleanup method of the controller object
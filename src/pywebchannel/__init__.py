@@ -1,4 +1,15 @@
-from .Controller import Controller, Action, Property, Signal, Convert, EmitBy, Notify, Response
+from .AsyncBridge import AsyncBridge
+from .Cache import CachePolicy
+from .Codec import Codec, JsonCodec, FastJsonCodec, MsgPackCodec
+from .Compact import Compact, CompactEncoding
+from .ExecutorBridge import ExecutorBridge
+from .Metrics import Metrics
+from .Tracing import Tracer, Span
+from .NDArray import NDArray
+from .Controller import Controller, Action, Property, Signal, Convert, EmitBy, Edge, Notify, Response, Invocation
 from .GeneratorWatcher import GeneratorWatcher
-from .WebChannelService import WebChannelService
+from .WebChannelService import WebChannelService, SlowConsumerPolicy
 from .HttpServer import HttpServer
+from .MetricsServer import MetricsServer
+from .Watchdog import Watchdog
+from .Utils import Logger, LogLevel, QueueLogBackend
@@ -1,4 +1,5 @@
-import {QWebChannel} from "./qwebchannel";
+import {QObject, QWebChannel, QWebChannelSubscriptions} from "./qwebchannel";
+import {Response} from "./models/Response";
 
 /**
  * An abstract base class for API communication using WebSockets and QWebChannel.
@@ -12,6 +13,13 @@ export abstract class BaseAPI {
   protected _ws: WebSocket;
   // The QWebChannel instance
   protected channel!: QWebChannel;
+  // The objects and properties observed by the client, or undefined to observe everything.
+  // Only the listed objects are published to the client, and only the listed properties are updated.
+  // A null or empty property list publishes the object, SignalConnectionManager.autoConnect adds the
+  // properties of the stores to it later.
+  protected subscriptions?: QWebChannelSubscriptions;
+  // The last responses of the versioned actions, mapped by their calls
+  private versionedResponses = new Map<string, Response>();
 
   /**
    * Constructs a BaseAPI instance with the given URL and service name.
@@ -66,18 +74,99 @@ export abstract class BaseAPI {
         reject(`${this._serviceName} connection closed`);
 
       // Create a new QWebChannel with the WebSocket when it is open
+      // The NumPy array descriptors are decoded into NDArray objects
+      // The subscriptions are sent before the init message, so it describes the subscribed objects only
       this._ws.onopen = (e) =>
-        new QWebChannel(this._ws, async (channel: QWebChannel) => {
-          // Assign the channel to the instance attribute
-          this.channel = channel;
-          // Call the abstract method onChannelReady with the channel
-          await this.onChannelReady(channel);
-          // Resolve the promise with the event
-          resolve(e);
-        });
+        new QWebChannel(
+          this._ws,
+          async (channel: QWebChannel) => {
+            // Assign the channel to the instance attribute
+            this.channel = channel;
+            // Call the abstract method onChannelReady with the channel
+            await this.onChannelReady(channel);
+            // Resolve the promise with the event
+            resolve(e);
+          },
+          ["NDArray"],
+          this.subscriptions
+        );
     });
   }
 
+  /**
+   * Calls a versioned action with the version of the response last received for the same call.
+   * If the state of the controller is not changed since then, the backend replies with a tiny not modified
+   * response without running the action, and the last response is returned again.
+   * @param object The controller object, i.e. this.TodoController
+   * @param method The name of the action
+   * @param args The arguments of the action
+   * @returns A promise that resolves with the response of the action
+   */
+  public async callVersioned(object: QObject, method: string, ...args: any[]): Promise<Response> {
+    // The calls are keyed by the controller, the action and the arguments
+    const key = JSON.stringify([object.__id__, method, args]);
+    const last = this.versionedResponses.get(key);
+    const response: Response = await object.__invoke__(method, args, last && {version: last.version});
+    // Reuse the last response if the state is not changed
+    if (response.notModified && last) {
+      return last;
+    }
+    // Keep the successful responses which carry a version
+    if (response.version !== undefined && !response.error) {
+      this.versionedResponses.set(key, response);
+    }
+    return response;
+  }
+
+  /**
+   * Sends the action calls made by the callback in one message, the backend runs them in order and
+   * answers all of them in one response, i.e. to load the data of a page in a single round trip.
+   * The calls must be made synchronously by the callback, before it awaits anything.
+   * @example
+   * const [todos, count] = await Promise.all(API.batch(() => [
+   *   API.TodoController.getTodos(),
+   *   API.TodoController.getCount(),
+   * ]));
+   * @param callback The function which makes the calls
+   * @returns The result of the callback, i.e. the promises of the calls
+   */
+  public batch<T>(callback: () => T): T {
+    return this.channel.batch(callback);
+  }
+
+  /**
+   * Tags the action calls made by the callback with a trace identifier, the backend traces them under it,
+   * so a slow interaction in the UI can be matched with the phases of the calls on the backend.
+   * The calls must be made synchronously by the callback, before it awaits anything.
+   * @example
+   * const todos = await API.trace((traceId) => {
+   *   console.log("Loading todos", traceId);
+   *   return API.TodoController.getTodos();
+   * });
+   * @param callback The function which makes the calls, it receives the trace identifier
+   * @param traceId The trace identifier, a new random one by default
+   * @returns The result of the callback, i.e. the promises of the calls
+   */
+  public trace<T>(callback: (traceId: string) => T, traceId: string = BaseAPI.newTraceId()): T {
+    const previous = this.channel.callFields;
+    this.channel.callFields = {...previous, trace: traceId};
+    try {
+      return callback(traceId);
+    } finally {
+      this.channel.callFields = previous;
+    }
+  }
+
+  /**
+   * Creates a random trace identifier of 32 hexadecimal digits, like the W3C trace context identifiers.
+   * @returns The trace identifier
+   */
+  public static newTraceId(): string {
+    const bytes = new Uint8Array(16);
+    crypto.getRandomValues(bytes);
+    return Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0")).join("");
+  }
+
   /**
    * Disconnects from the backend socket and closes the WebSocket.
    * @returns A promise that resolves when the connection is closed
@@ -14,6 +14,8 @@ export class CommandAPI extends BaseAPI {
   public constructor() {
     // Call the super constructor with the URL and service name
     super("ws://localhost:9000", "Command Transfer Service");
+    // Observe only the listed objects, their properties are added by SignalConnectionManager.autoConnect
+    // this.subscriptions = {HelloWorldController: []};
   }
 
   /**
@@ -0,0 +1,3 @@
+// NumPy arrays of the controllers, i.e. NDArray<Float64Array> for numpy.typing.NDArray[numpy.float64]
+export { NDArray } from "../qwebchannel";
+export type { TypedArray } from "../qwebchannel";
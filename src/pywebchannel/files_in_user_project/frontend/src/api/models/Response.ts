@@ -8,4 +8,8 @@ export interface Response {
   error: string;
   success: string;
   data: any;
+  // The version of the state the data is read from, for the versioned actions
+  version?: string;
+  // True if the state is not changed since the version sent by the client, the data is not sent then
+  notModified?: boolean;
 }
@@ -9,8 +9,71 @@ export const enum QWebChannelMessageTypes {
   disconnectFromSignal = 8,
   setProperty = 9,
   response = 10,
+  streamData = 11,
+  streamEnd = 12,
+  streamAck = 13,
+  streamCancel = 14,
+  subscribe = 15,
+  batchInvoke = 16,
 }
 
+export function msgpackEncode(value: any): Uint8Array;
+
+export function msgpackDecode(buffer: ArrayBuffer | Uint8Array): any;
+
+export function applyJsonPatch(document: any, patch: Array<{ op: string; path: string; value?: any }>): any;
+
+export type TypedArray =
+  | Int8Array
+  | Uint8Array
+  | Int16Array
+  | Uint16Array
+  | Int32Array
+  | Uint32Array
+  | BigInt64Array
+  | BigUint64Array
+  | Float32Array
+  | Float64Array;
+
+export class NDArray<T extends TypedArray = TypedArray> {
+  constructor(data: T, shape?: number[], dtype?: string);
+
+  data: T;
+  shape: number[];
+  dtype: string;
+
+  static typedArrays: { [dtype: string]: any };
+
+  static dtypeOf(data: TypedArray): string;
+
+  static decode(descriptor: { __ndarray__: string; dtype: string; shape: number[] }): NDArray;
+
+  toJSON(): { __ndarray__: string; dtype: string; shape: number[] };
+}
+
+export class QWebChannelStream<T = any> implements AsyncIterableIterator<T> {
+  constructor(channel: QWebChannel, streamId: number);
+
+  channel: QWebChannel;
+  streamId: number;
+  done: boolean;
+  error?: string;
+
+  push(items: Array<any>): void;
+
+  end(error?: string): void;
+
+  next(): Promise<IteratorResult<T>>;
+
+  return(): Promise<IteratorResult<T>>;
+
+  cancel(): void;
+
+  [Symbol.asyncIterator](): QWebChannelStream<T>;
+}
+
+export type QWebChannelSubscriptions = { [objectName: string]: string[] | null };
+
 export type QWebChannelTransport = {
   webChannelTransport: any;
 };
@@ -18,7 +81,9 @@ export type QWebChannelTransport = {
 export class QWebChannel {
   constructor(
     transport: WebSocket,
-    initCallback?: (channel: QWebChannel) => void
+    initCallback?: (channel: QWebChannel) => void,
+    converters?: string | Function | Array<string | Function>,
+    subscriptions?: QWebChannelSubscriptions
   );
 
   objects: any;
@@ -26,11 +91,27 @@ export class QWebChannel {
   usedConverters: Array<Function>;
   execCallbacks: any;
   execId: number;
+  wireFormat: "json" | "msgpack";
+  streams: { [streamId: number]: QWebChannelStream };
+  compactModels: { [name: string]: string[] };
+  subscriptions: QWebChannelSubscriptions | null;
+  batchCalls: Array<{ message: any; callback: (response: any) => void }> | null;
+  callFields: { [field: string]: any } | null;
 
   addConverter(converter: string | Function): void;
 
   send(data: any): void;
 
+  decode(data: any): any;
+
+  handleMessage(data: any): void;
+
+  stream(streamId: number): QWebChannelStream;
+
+  unwrapStreamItem(item: any): any;
+
+  decodeCompact(value: any, unwrap: (value: any) => any): any;
+
   exec(data: any, callback: (data: any) => void): void;
 
   handleSignal(message: MessageEvent): void;
@@ -40,6 +121,12 @@ export class QWebChannel {
   handlePropertyUpdate(message: MessageEvent): void;
 
   debug(message: any): void;
+
+  subscribe(objectName: string, propertyNames?: string[] | null): void;
+
+  observes(objectName: string, propertyName: string): boolean;
+
+  batch<T>(callback: () => T): T;
 }
 
 export class QObject {
@@ -48,6 +135,10 @@ export class QObject {
   __id__: string;
   __objectSignals__: any;
   __propertyCache__: any;
+  __propertyIndexes__: any;
+  __propertyPatchSignals__: any;
+  __patchedPropertyNames__: { [signalIndex: number]: string };
+  __connectedPatchSignals__: Set<number>;
 
   unwrapQObject(response: any): any;
 
@@ -56,5 +147,11 @@ export class QObject {
   propertyUpdate(signals: any, propertyMap: any): void;
 
   signalEmitted(signalName: string, signalArgs: any): void;
+
+  __subscribe__(propertyNames?: string[] | null): void;
+
+  __connectPatchSignals__(): void;
+
+  __invoke__(method: string | number, args?: Array<any>, extra?: { [field: string]: any }): Promise<any>;
 }
 
@@ -19,9 +19,423 @@ export var QWebChannelMessageTypes = {
     disconnectFromSignal: 8,
     setProperty: 9,
     response: 10,
+    streamData: 11,
+    streamEnd: 12,
+    streamAck: 13,
+    streamCancel: 14,
+    subscribe: 15,
+    batchInvoke: 16,
 };
 
-export var QWebChannel = function (transport, initCallback, converters) {
+/**
+ * Encodes a value with MessagePack, following the JSON.stringify rules for toJSON, undefined and functions.
+ * @param value The value to be encoded
+ * @returns The encoded bytes
+ */
+export function msgpackEncode(value) {
+    var textEncoder = new TextEncoder();
+    var bytes = new Uint8Array(1024);
+    var view = new DataView(bytes.buffer);
+    var offset = 0;
+
+    function reserve(length) {
+        if (offset + length <= bytes.length)
+            return;
+        var grown = new Uint8Array(Math.max(bytes.length * 2, offset + length));
+        grown.set(bytes);
+        bytes = grown;
+        view = new DataView(bytes.buffer);
+    }
+
+    function writeHeader(length, fixPrefix, fixLimit, type8, type16, type32) {
+        reserve(5);
+        if (length < fixLimit) {
+            view.setUint8(offset, fixPrefix | length);
+            offset += 1;
+        } else if (type8 !== undefined && length <= 0xff) {
+            view.setUint8(offset, type8);
+            view.setUint8(offset + 1, length);
+            offset += 2;
+        } else if (length <= 0xffff) {
+            view.setUint8(offset, type16);
+            view.setUint16(offset + 1, length);
+            offset += 3;
+        } else {
+            view.setUint8(offset, type32);
+            view.setUint32(offset + 1, length);
+            offset += 5;
+        }
+    }
+
+    function writeBytes(data) {
+        reserve(data.length);
+        bytes.set(data, offset);
+        offset += data.length;
+    }
+
+    function writeNumber(number) {
+        reserve(9);
+        if (!Number.isSafeInteger(number)) {
+            view.setUint8(offset, 0xcb);
+            view.setFloat64(offset + 1, number);
+            offset += 9;
+        } else if (number >= 0 && number < 0x80) {
+            view.setUint8(offset++, number);
+        } else if (number < 0 && number >= -0x20) {
+            view.setInt8(offset++, number);
+        } else if (number >= 0) {
+            if (number <= 0xff) {
+                view.setUint8(offset, 0xcc);
+                view.setUint8(offset + 1, number);
+                offset += 2;
+            } else if (number <= 0xffff) {
+                view.setUint8(offset, 0xcd);
+                view.setUint16(offset + 1, number);
+                offset += 3;
+            } else if (number <= 0xffffffff) {
+                view.setUint8(offset, 0xce);
+                view.setUint32(offset + 1, number);
+                offset += 5;
+            } else {
+                view.setUint8(offset, 0xcf);
+                view.setBigUint64(offset + 1, BigInt(number));
+                offset += 9;
+            }
+        } else {
+            if (number >= -0x80) {
+                view.setUint8(offset, 0xd0);
+                view.setInt8(offset + 1, number);
+                offset += 2;
+            } else if (number >= -0x8000) {
+                view.setUint8(offset, 0xd1);
+                view.setInt16(offset + 1, number);
+                offset += 3;
+            } else if (number >= -0x80000000) {
+                view.setUint8(offset, 0xd2);
+                view.setInt32(offset + 1, number);
+                offset += 5;
+            } else {
+                view.setUint8(offset, 0xd3);
+                view.setBigInt64(offset + 1, BigInt(number));
+                offset += 9;
+            }
+        }
+    }
+
+    function write(value) {
+        if (value === null || value === undefined || typeof value === "function") {
+            reserve(1);
+            view.setUint8(offset++, 0xc0);
+        } else if (typeof value === "boolean") {
+            reserve(1);
+            view.setUint8(offset++, value ? 0xc3 : 0xc2);
+        } else if (typeof value === "number") {
+            writeNumber(value);
+        } else if (typeof value === "string") {
+            var encoded = textEncoder.encode(value);
+            writeHeader(encoded.length, 0xa0, 0x20, 0xd9, 0xda, 0xdb);
+            writeBytes(encoded);
+        } else if (value instanceof Uint8Array) {
+            writeHeader(value.length, 0, 0, 0xc4, 0xc5, 0xc6);
+            writeBytes(value);
+        } else if (typeof value.toJSON === "function") {
+            write(value.toJSON());
+        } else if (Array.isArray(value)) {
+            writeHeader(value.length, 0x90, 0x10, undefined, 0xdc, 0xdd);
+            value.forEach(write);
+        } else {
+            var keys = Object.keys(value).filter(key => value[key] !== undefined && typeof value[key] !== "function");
+            writeHeader(keys.length, 0x80, 0x10, undefined, 0xde, 0xdf);
+            for (const key of keys) {
+                write(key);
+                write(value[key]);
+            }
+        }
+    }
+
+    write(value);
+    return bytes.slice(0, offset);
+}
+
+/**
+ * Decodes a MessagePack encoded buffer. Binary values are returned as Uint8Array views without copying.
+ * @param buffer The encoded buffer
+ * @returns The decoded value
+ */
+export function msgpackDecode(buffer) {
+    var textDecoder = new TextDecoder();
+    var bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
+    var view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    var offset = 0;
+
+    function readLength(size) {
+        var length = size === 1 ? view.getUint8(offset) : size === 2 ? view.getUint16(offset) : view.getUint32(offset);
+        offset += size;
+        return length;
+    }
+
+    function readString(length) {
+        var value = textDecoder.decode(bytes.subarray(offset, offset + length));
+        offset += length;
+        return value;
+    }
+
+    function readBinary(length) {
+        var value = bytes.subarray(offset, offset + length);
+        offset += length;
+        return value;
+    }
+
+    function readArray(length) {
+        var value = new Array(length);
+        for (var i = 0; i < length; ++i)
+            value[i] = read();
+        return value;
+    }
+
+    function readMap(length) {
+        var value = {};
+        for (var i = 0; i < length; ++i) {
+            var key = read();
+            value[key] = read();
+        }
+        return value;
+    }
+
+    function readNumber(getter, size) {
+        var value = view[getter](offset);
+        offset += size;
+        return typeof value === "bigint" ? Number(value) : value;
+    }
+
+    function read() {
+        var type = view.getUint8(offset++);
+        if (type < 0x80) return type;
+        if (type < 0x90) return readMap(type & 0x0f);
+        if (type < 0xa0) return readArray(type & 0x0f);
+        if (type < 0xc0) return readString(type & 0x1f);
+        if (type >= 0xe0) return type - 0x100;
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return readBinary(readLength(1));
+            case 0xc5: return readBinary(readLength(2));
+            case 0xc6: return readBinary(readLength(4));
+            case 0xca: return readNumber("getFloat32", 4);
+            case 0xcb: return readNumber("getFloat64", 8);
+            case 0xcc: return readNumber("getUint8", 1);
+            case 0xcd: return readNumber("getUint16", 2);
+            case 0xce: return readNumber("getUint32", 4);
+            case 0xcf: return readNumber("getBigUint64", 8);
+            case 0xd0: return readNumber("getInt8", 1);
+            case 0xd1: return readNumber("getInt16", 2);
+            case 0xd2: return readNumber("getInt32", 4);
+            case 0xd3: return readNumber("getBigInt64", 8);
+            case 0xd9: return readString(readLength(1));
+            case 0xda: return readString(readLength(2));
+            case 0xdb: return readString(readLength(4));
+            case 0xdc: return readArray(readLength(2));
+            case 0xdd: return readArray(readLength(4));
+            case 0xde: return readMap(readLength(2));
+            case 0xdf: return readMap(readLength(4));
+            default:
+                throw new Error("Unsupported MessagePack type: 0x" + type.toString(16));
+        }
+    }
+
+    return read();
+}
+
+/**
+ * Applies an RFC 6902 JSON Patch ("add", "remove" and "replace" operations) to a value.
+ * The value is not modified, the containers along the patched paths are copied, the others are shared.
+ * @param document The value to be patched
+ * @param patch The list of the patch operations
+ * @returns The patched value
+ */
+export function applyJsonPatch(document, patch) {
+    // Containers copied by this patch, they can be modified in place by the following operations
+    var copies = new Set();
+
+    function copyOf(container) {
+        if (copies.has(container)) return container;
+        var copy = Array.isArray(container) ? container.slice() : Object.assign({}, container);
+        copies.add(copy);
+        return copy;
+    }
+
+    function parsePath(path) {
+        if (path === "") return [];
+        return path.substring(1).split("/").map(token => token.replace(/~1/g, "/").replace(/~0/g, "~"));
+    }
+
+    for (const operation of patch) {
+        var tokens = parsePath(operation.path);
+        if (tokens.length === 0) {
+            document = operation.op === "remove" ? undefined : operation.value;
+            continue;
+        }
+
+        // Copy the containers from the root to the parent of the target
+        document = copyOf(document);
+        var parent = document;
+        for (var i = 0; i < tokens.length - 1; ++i) {
+            parent = parent[tokens[i]] = copyOf(parent[tokens[i]]);
+        }
+
+        var key = tokens[tokens.length - 1];
+        if (Array.isArray(parent)) {
+            var index = key === "-" ? parent.length : Number(key);
+            if (operation.op === "add") parent.splice(index, 0, operation.value);
+            else if (operation.op === "remove") parent.splice(index, 1);
+            else parent[index] = operation.value;
+        } else {
+            if (operation.op === "remove") delete parent[key];
+            else parent[key] = operation.value;
+        }
+    }
+
+    return document;
+}
+
+/**
+ * A NumPy array received from or sent to the backend, its items are viewed by a typed array of its dtype.
+ * The backend sends the arrays as {"__ndarray__": base64, "dtype": name, "shape": [...]} descriptors of their raw
+ * little-endian buffers, they are decoded by the "NDArray" converter of the channel.
+ * @param data The typed array of the items in row-major order
+ * @param shape The shape of the array, defaults to the one dimensional shape of the items
+ * @param dtype The NumPy dtype of the items, defaults to the one of the typed array
+ */
+export function NDArray(data, shape, dtype) {
+    this.data = data;
+    this.shape = shape !== undefined ? shape : [data.length];
+    this.dtype = dtype !== undefined ? dtype : NDArray.dtypeOf(data);
+}
+
+// Typed arrays which view the buffers of the dtypes
+NDArray.typedArrays = {
+    bool: Uint8Array,
+    int8: Int8Array,
+    uint8: Uint8Array,
+    int16: Int16Array,
+    uint16: Uint16Array,
+    int32: Int32Array,
+    uint32: Uint32Array,
+    int64: BigInt64Array,
+    uint64: BigUint64Array,
+    float32: Float32Array,
+    float64: Float64Array,
+};
+
+NDArray.dtypeOf = function (data) {
+    for (const dtype of Object.keys(NDArray.typedArrays)) {
+        // Uint8Array is viewed as uint8, bool arrays pass their dtype explicitly
+        if (dtype !== "bool" && data instanceof NDArray.typedArrays[dtype]) return dtype;
+    }
+    throw new Error("Unsupported typed array " + Object.prototype.toString.call(data));
+}
+
+NDArray.decode = function (descriptor) {
+    var text = atob(descriptor.__ndarray__);
+    var bytes = new Uint8Array(text.length);
+    for (var i = 0; i < text.length; ++i) {
+        bytes[i] = text.charCodeAt(i);
+    }
+    // The typed array views the decoded buffer without copying, the buffer is little-endian like the usual hosts
+    var TypedArray = NDArray.typedArrays[descriptor.dtype];
+    var data = new TypedArray(bytes.buffer, 0, bytes.length / TypedArray.BYTES_PER_ELEMENT);
+    return new NDArray(data, descriptor.shape, descriptor.dtype);
+}
+
+NDArray.prototype.toJSON = function () {
+    var bytes = new Uint8Array(this.data.buffer, this.data.byteOffset, this.data.byteLength);
+    var text = "";
+    // Convert in chunks, the argument count of String.fromCharCode is limited
+    for (var i = 0; i < bytes.length; i += 0x8000) {
+        text += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+    }
+    return {"__ndarray__": btoa(text), "dtype": this.dtype, "shape": this.shape};
+}
+
+/**
+ * An async iterator over the items of a result streamed by the backend.
+ * Every consumed chunk grants the backend a credit for one more chunk, so the backend never runs ahead of the consumer.
+ * Breaking out of a for-await loop cancels the stream on the backend.
+ * @param channel The web channel which receives the chunks
+ * @param streamId The identifier of the stream, received in the response of the call
+ */
+export function QWebChannelStream(channel, streamId) {
+    this.channel = channel;
+    this.streamId = streamId;
+    // Received chunks that are not consumed yet
+    this.chunks = [];
+    this.done = false;
+    this.error = undefined;
+    // Resolve function of the pending next() call, if any
+    this.wakeUp = undefined;
+}
+
+QWebChannelStream.prototype.push = function (items) {
+    // Chunks of compact models are received as tables
+    var rows = this.channel.decodeCompact(items, item => item);
+    this.chunks.push(rows !== undefined ? rows : items);
+    this.notify();
+};
+
+QWebChannelStream.prototype.end = function (error) {
+    this.done = true;
+    this.error = error;
+    this.notify();
+};
+
+QWebChannelStream.prototype.notify = function () {
+    var wakeUp = this.wakeUp;
+    this.wakeUp = undefined;
+    if (wakeUp) wakeUp();
+};
+
+QWebChannelStream.prototype.next = async function () {
+    // Skip the consumed chunks, and grant a credit for each of them
+    while (this.chunks.length > 0 && this.chunks[0].length === 0) {
+        this.chunks.shift();
+        if (!this.done) {
+            this.channel.send({type: QWebChannelMessageTypes.streamAck, stream: this.streamId, credit: 1});
+        }
+    }
+    if (this.chunks.length > 0) {
+        return {value: this.channel.unwrapStreamItem(this.chunks[0].shift()), done: false};
+    }
+    if (this.done) {
+        delete this.channel.streams[this.streamId];
+        if (this.error !== undefined) throw new Error(this.error);
+        return {value: undefined, done: true};
+    }
+    // Wait for the next chunk or the end of the stream
+    await new Promise(resolve => this.wakeUp = resolve);
+    return this.next();
+};
+
+QWebChannelStream.prototype.return = async function () {
+    this.cancel();
+    return {value: undefined, done: true};
+};
+
+QWebChannelStream.prototype.cancel = function () {
+    if (!this.done) {
+        this.channel.send({type: QWebChannelMessageTypes.streamCancel, stream: this.streamId});
+        this.done = true;
+    }
+    this.chunks = [];
+    delete this.channel.streams[this.streamId];
+    this.notify();
+};
+
+QWebChannelStream.prototype[Symbol.asyncIterator] = function () {
+    return this;
+};
+
+export var QWebChannel = function (transport, initCallback, converters, subscriptions) {
     if (typeof transport !== "object" || typeof transport.send !== "function") {
         console.error("The QWebChannel expects a transport object with a send function and onmessage callback property." +
             " Given is: transport: " + typeof (transport) + ", transport.send: " + typeof (transport.send));
@@ -31,6 +445,14 @@ export var QWebChannel = function (transport, initCallback, converters) {
     var channel = this;
     this.transport = transport;
 
+    // Binary frames are decoded from array buffers
+    if ("binaryType" in transport) {
+        transport.binaryType = "arraybuffer";
+    }
+
+    // The format of the outgoing messages, it follows the format of the binary frames sent by the backend
+    this.wireFormat = "json";
+
     var converterRegistry =
         {
             Date: function (response) {
@@ -42,6 +464,12 @@ export var QWebChannel = function (transport, initCallback, converters) {
                         return date;
                 }
                 return undefined; // Return undefined if current converter is not applicable
+            },
+            NDArray: function (response) {
+                if (response instanceof Object && typeof response.__ndarray__ === "string") {
+                    return NDArray.decode(response);
+                }
+                return undefined; // Return undefined if current converter is not applicable
             }
         };
 
@@ -68,17 +496,43 @@ export var QWebChannel = function (transport, initCallback, converters) {
     }
 
     this.send = function (data) {
+        if (channel.wireFormat === "msgpack") {
+            channel.transport.send(msgpackEncode(typeof (data) === "string" ? JSON.parse(data) : data));
+            return;
+        }
         if (typeof (data) !== "string") {
             data = JSON.stringify(data);
         }
         channel.transport.send(data);
     }
 
-    this.transport.onmessage = function (message) {
-        var data = message.data;
+    this.decode = function (data) {
         if (typeof data === "string") {
-            data = JSON.parse(data);
+            return JSON.parse(data);
+        }
+        if (data instanceof ArrayBuffer) {
+            // Binary JSON frames start with '{' or '[', MessagePack never encodes a message as a plain number
+            var firstByte = new Uint8Array(data, 0, 1)[0];
+            if (firstByte === 0x7b || firstByte === 0x5b) {
+                return JSON.parse(new TextDecoder().decode(data));
+            }
+            channel.wireFormat = "msgpack";
+            return msgpackDecode(data);
+        }
+        return data;
+    }
+
+    this.transport.onmessage = function (message) {
+        var data = channel.decode(message.data);
+        // Batched frames hold the messages of one backend event loop iteration in an array
+        if (Array.isArray(data)) {
+            data.forEach(channel.handleMessage);
+        } else {
+            channel.handleMessage(data);
         }
+    }
+
+    this.handleMessage = function (data) {
         switch (data.type) {
             case QWebChannelMessageTypes.signal:
                 channel.handleSignal(data);
@@ -89,8 +543,14 @@ export var QWebChannel = function (transport, initCallback, converters) {
             case QWebChannelMessageTypes.propertyUpdate:
                 channel.handlePropertyUpdate(data);
                 break;
+            case QWebChannelMessageTypes.streamData:
+                channel.stream(data.stream).push(data.data);
+                break;
+            case QWebChannelMessageTypes.streamEnd:
+                channel.stream(data.stream).end(data.error);
+                break;
             default:
-                console.error("invalid message received:", message.data);
+                console.error("invalid message received:", data);
                 break;
         }
     }
@@ -118,6 +578,91 @@ export var QWebChannel = function (transport, initCallback, converters) {
 
     this.objects = {};
 
+    // Calls collected by batch, or null if the calls are sent one by one
+    this.batchCalls = null;
+
+    // Fields added to the messages of the method calls, i.e. the trace identifier of the calls made by BaseAPI.trace
+    this.callFields = null;
+
+    // Sends the method calls made by the callback in one batch invoke message, the backend answers them in one response
+    this.batch = function (callback) {
+        // Nested batches are part of the outer batch
+        if (channel.batchCalls !== null)
+            return callback();
+        var calls = channel.batchCalls = [];
+        try {
+            var result = callback();
+        } finally {
+            channel.batchCalls = null;
+        }
+        if (calls.length > 0) {
+            channel.exec({
+                type: QWebChannelMessageTypes.batchInvoke,
+                calls: calls.map(call => call.message)
+            }, function (responses) {
+                calls.forEach((call, i) => call.callback(responses === undefined ? undefined : responses[i]));
+            });
+        }
+        return result;
+    }
+
+    // Streams of the results being received, mapped by the stream identifiers
+    this.streams = {};
+
+    this.stream = function (streamId) {
+        // Create the stream on its first use, the chunks may arrive before the stream is handed to the caller
+        if (!channel.streams.hasOwnProperty(streamId)) {
+            channel.streams[streamId] = new QWebChannelStream(channel, streamId);
+        }
+        return channel.streams[streamId];
+    }
+
+    this.unwrapStreamItem = function (item) {
+        for (const converter of channel.usedConverters) {
+            var result = converter(item, channel.unwrapStreamItem);
+            if (result !== undefined)
+                return result;
+        }
+        var decoded = channel.decodeCompact(item, channel.unwrapStreamItem);
+        return decoded !== undefined ? decoded : item;
+    }
+
+    // Field names of the compact models in the order of their rows, mapped by the model names
+    this.compactModels = {};
+
+    // Decodes the rows and tables of the compact models, returns undefined for the other values
+    this.decodeCompact = function (value, unwrap) {
+        if (value instanceof Array) {
+            var header = value[0];
+            if (!(header instanceof Object) || typeof header.__compact__ !== "string" || header.length === undefined)
+                return undefined;
+            var fields = channel.compactModels[header.__compact__];
+            if (fields === undefined)
+                return undefined;
+            var columns = value.slice(1).map(unwrap);
+            var rows = new Array(header.length);
+            for (var i = 0; i < rows.length; ++i) {
+                var row = {};
+                for (var f = 0; f < fields.length; ++f) {
+                    row[fields[f]] = columns[f][i];
+                }
+                rows[i] = row;
+            }
+            return rows;
+        }
+        if (value instanceof Object && typeof value.__compact__ === "string" && value.row instanceof Array) {
+            var fields = channel.compactModels[value.__compact__];
+            if (fields === undefined)
+                return undefined;
+            var row = {};
+            for (var f = 0; f < fields.length; ++f) {
+                row[fields[f]] = unwrap(value.row[f]);
+            }
+            return row;
+        }
+        return undefined;
+    }
+
     this.handleSignal = function (message) {
         var object = channel.objects[message.object];
         if (object) {
@@ -152,11 +697,60 @@ export var QWebChannel = function (transport, initCallback, converters) {
         channel.send({type: QWebChannelMessageTypes.debug, data: message});
     };
 
+    // Names of the observed properties, or null for all of them, mapped by the object names.
+    // It is null if the client observes everything, which is the default
+    this.subscriptions = null;
+
+    this.subscribe = function (objectName, propertyNames) {
+        // Everything is observed unless the client subscribes from the beginning
+        if (channel.subscriptions === null)
+            return;
+        var current = channel.subscriptions[objectName];
+        // All the properties of the object are observed already
+        if (current === null)
+            return;
+        if (propertyNames === undefined || propertyNames === null) {
+            channel.subscriptions[objectName] = null;
+        } else {
+            var names = new Set(current || []);
+            propertyNames.forEach(name => names.add(name));
+            // Nothing is added
+            if (current !== undefined && names.size === current.length)
+                return;
+            channel.subscriptions[objectName] = Array.from(names);
+        }
+        // Each subscription replaces the previous one on the backend
+        channel.send({type: QWebChannelMessageTypes.subscribe, objects: channel.subscriptions});
+        // Receive the patches of the newly observed properties
+        if (channel.objects[objectName])
+            channel.objects[objectName].__connectPatchSignals__();
+    }
+
+    // Returns whether the client observes a property, and so receives its updates and patches
+    this.observes = function (objectName, propertyName) {
+        if (channel.subscriptions === null)
+            return true;
+        var names = channel.subscriptions[objectName];
+        return names === null || (names !== undefined && names.includes(propertyName));
+    }
+
+    // Subscribe before the init message, so it describes the subscribed objects only
+    if (subscriptions) {
+        channel.subscriptions = Object.assign({}, subscriptions);
+        channel.send({type: QWebChannelMessageTypes.subscribe, objects: channel.subscriptions});
+    }
+
     channel.exec({type: QWebChannelMessageTypes.init}, function (data) {
         for (const objectName of Object.keys(data)) {
             new QObject(objectName, data[objectName], channel);
         }
 
+        // Take the field names of the compact models, the object which publishes them is internal to the channel
+        if (channel.objects.__compact__) {
+            channel.compactModels = channel.objects.__compact__.models;
+            delete channel.objects.__compact__;
+        }
+
         // now unwrap properties, which might reference other registered objects
         for (const objectName of Object.keys(channel.objects)) {
             channel.objects[objectName].unwrapProperties();
@@ -179,17 +773,87 @@ export function QObject(name, data, webChannel) {
     // Cache of all properties, updated when a notify signal is emitted
     this.__propertyCache__ = {};
 
+    // Indexes of the properties, mapped by the property names
+    this.__propertyIndexes__ = {};
+
+    // Indexes of the properties that are patched by the delta signals ("<property>Patched"), mapped by the signal indexes
+    this.__propertyPatchSignals__ = {};
+
+    // Names of the properties that are patched by the delta signals, mapped by the signal indexes
+    this.__patchedPropertyNames__ = {};
+
+    // Indexes of the delta signals the client is connected to, the ones of the properties it does not observe are not
+    this.__connectedPatchSignals__ = new Set();
+
     var object = this;
 
+    // Adds properties of the object to the subscriptions of the channel, all of them if no names are given
+    this.__subscribe__ = function (propertyNames) {
+        webChannel.subscribe(object.__id__, propertyNames);
+    }
+
+    // Connects the delta signals of the observed properties which are not connected yet
+    this.__connectPatchSignals__ = function () {
+        for (const signalIndex of Object.keys(object.__patchedPropertyNames__).map(Number)) {
+            if (object.__connectedPatchSignals__.has(signalIndex)
+                || !webChannel.observes(object.__id__, object.__patchedPropertyNames__[signalIndex]))
+                continue;
+            object.__connectedPatchSignals__.add(signalIndex);
+            webChannel.exec({
+                type: QWebChannelMessageTypes.connectToSignal,
+                object: object.__id__,
+                signal: signalIndex
+            });
+        }
+    }
+
+    // Invokes a method with the extra fields of the message, i.e. the version known by the client for a versioned action
+    this.__invoke__ = function (method, args, extra) {
+        return new Promise((resolve, reject) => {
+            // console.log("Calling method: ", method);
+            var message = Object.assign({}, webChannel.callFields, extra, {
+                "type": QWebChannelMessageTypes.invokeMethod,
+                "object": object.__id__,
+                "method": method,
+                "args": args || []
+            });
+            var callback = function (response) {
+                // console.log("Returned from: ", method, " with response ", response)
+                if (response !== undefined) {
+                    var result = object.unwrapQObject(response);
+                    // Replace the identifier of a streamed result with the stream of its items
+                    if (result && result.data && result.data.__stream__ !== undefined) {
+                        result.data = webChannel.stream(result.data.__stream__);
+                    }
+                    resolve(result)
+                } else {
+                    reject("Unknown error: Possible communication lost")
+                }
+            };
+            // Collect the call if a batch is being made, it is sent along with the other calls of the batch
+            if (webChannel.batchCalls !== null) {
+                delete message.type;
+                webChannel.batchCalls.push({message: message, callback: callback});
+                return;
+            }
+            webChannel.exec(message, callback);
+        })
+    }
+
     // ----------------------------------------------------------------------
 
     this.unwrapQObject = function (response) {
         for (const converter of webChannel.usedConverters) {
-            var result = converter(response);
+            var result = converter(response, object.unwrapQObject);
             if (result !== undefined)
                 return result;
         }
 
+        // Rows and tables of the compact models are decoded into objects and arrays of objects
+        var decoded = webChannel.decodeCompact(response, object.unwrapQObject);
+        if (decoded !== undefined)
+            return decoded;
+
         if (response instanceof Array) {
             // support list of objects
             return response.map(qobj => object.unwrapQObject(qobj))
@@ -239,6 +903,18 @@ export function QObject(name, data, webChannel) {
     function addSignal(signalData, isPropertyNotifySignal) {
         var signalName = signalData[0];
         var signalIndex = signalData[1];
+
+        // Delta signals keep the property cache up to date, so they are connected right away, like notify signals,
+        // if the client observes their properties
+        // Constant properties have no notify signal, their signal data is empty
+        var patchedPropertyName = typeof signalName === "string" && signalName.endsWith("Patched")
+            ? signalName.slice(0, -"Patched".length) : undefined;
+        if (!isPropertyNotifySignal && object.__propertyIndexes__.hasOwnProperty(patchedPropertyName)) {
+            object.__propertyPatchSignals__[signalIndex] = object.__propertyIndexes__[patchedPropertyName];
+            object.__patchedPropertyNames__[signalIndex] = patchedPropertyName;
+            isPropertyNotifySignal = true;
+            object.__connectPatchSignals__();
+        }
         object[signalName] = {
             connect: function (callback) {
                 if (typeof (callback) !== "function") {
@@ -315,6 +991,11 @@ export function QObject(name, data, webChannel) {
     }
 
     this.signalEmitted = function (signalName, signalArgs) {
+        // Apply the patches of the delta signals to the property cache before the callbacks are invoked
+        var propertyIndex = object.__propertyPatchSignals__[signalName];
+        if (propertyIndex !== undefined) {
+            object.__propertyCache__[propertyIndex] = applyJsonPatch(object.__propertyCache__[propertyIndex], signalArgs[0]);
+        }
         invokeSignalCallbacks(signalName, this.unwrapQObject(signalArgs));
     }
 
@@ -335,23 +1016,7 @@ export function QObject(name, data, webChannel) {
                 args.push(arguments[i]);
             }
 
-            return new Promise((resolve, reject) => {
-                // console.log("Calling method: ", invokedMethod);                
-                webChannel.exec({
-                    "type": QWebChannelMessageTypes.invokeMethod,
-                    "object": object.__id__,
-                    "method": invokedMethod,
-                    "args": args
-                }, function (response) {
-                    // console.log("Returned from: ", invokedMethod, " with response ", response)
-                    if (response !== undefined) {
-                        var result = object.unwrapQObject(response);
-                        resolve(result)
-                    } else {
-                        reject("Unknown error: Possible communication lost")
-                    }
-                });
-            })
+            return object.__invoke__(invokedMethod, args);
         };
     }
 
@@ -359,6 +1024,7 @@ export function QObject(name, data, webChannel) {
         var propertyIndex = propertyInfo[0];
         var propertyName = propertyInfo[1];
         var notifySignalData = propertyInfo[2];
+        object.__propertyIndexes__[propertyName] = propertyIndex;
         // initialize property cache with current value
         // NOTE: if this is an object, it is not directly unwrapped as it might
         // reference other QObject that we do not know yet
@@ -29,6 +29,23 @@ export function connect(
   };
 }
 
+/**
+ * Subscribe to the backend properties which have a store attribute of the same name
+ * The updates of the other properties are not sent to clients that subscribe,
+ * clients that observe everything ignore it
+ *
+ * @param store Store object
+ * @param APIState Backend API object containing Qt Properties
+ */
+export function subscribeStoreProperties(store: any, APIState: any) {
+  const propertyIndexes = APIState.__propertyIndexes__ ?? {};
+  const propertyNames = Object.keys(store).filter(
+    (storeKey) =>
+      typeof store[storeKey] !== "function" && propertyIndexes.hasOwnProperty(storeKey),
+  );
+  APIState.__subscribe__?.(propertyNames);
+}
+
 /**
  * Make auto connections between backend api signals and SolidJs store
  * It helps on making connections for Properties and their notification signals
@@ -48,6 +65,9 @@ export function autoConnectAPISignalsToStore(
 
   const apiObjectName = APIState.__id__;
 
+  // Subscribe to the properties of the store, in case the client does not observe everything
+  subscribeStoreProperties(store, APIState);
+
   for (const storeKey of Object.keys(store)) {
     // Ignore functions
     if (typeof store[storeKey] === "function") continue;
@@ -64,6 +84,18 @@ export function autoConnectAPISignalsToStore(
         ),
       );
     }
+    // Get delta signal, the patch is already applied to the API property when it is emitted
+    const apiPatchSignal = APIState[`${storeKey}Patched`];
+    // If it is existed, make connection
+    if (apiPatchSignal) {
+      disconnectCalls.push(
+        connect(
+          apiPatchSignal,
+          () => set(storeKey, APIState[storeKey]),
+          `${apiObjectName}.${storeKey}Patched`,
+        ),
+      );
+    }
     // Retrieve first value
     const firstValue = APIState[storeKey];
     // If it is existed, set store state
@@ -109,6 +141,9 @@ export class SignalConnectionManager {
   public autoConnect(store: any, setStore: any, APIState: any) {
     const apiObjectName = APIState.__id__;
 
+    // Subscribe to the properties of the store, in case the client does not observe everything
+    subscribeStoreProperties(store, APIState);
+
     // Use Object.entries to get both key and value of store
     for (const [storeKey, storeValue] of Object.entries(store)) {
       // Ignore functions
@@ -124,6 +159,17 @@ export class SignalConnectionManager {
           `${apiObjectName}.${apiSignalName}`,
         );
       }
+      // Get delta signal, the patch is already applied to the API property when it is emitted
+      const apiPatchSignalName = `${storeKey}Patched`;
+      const apiPatchSignal = APIState[apiPatchSignalName];
+      // If it is existed, make connection
+      if (apiPatchSignal) {
+        this.connect(
+          apiPatchSignal,
+          () => setStore(storeKey, APIState[storeKey]),
+          `${apiObjectName}.${apiPatchSignalName}`,
+        );
+      }
       // Retrieve first value
       const firstValue = APIState[storeKey];
       // If it is existed, set store state
@@ -0,0 +1,167 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer, QUrl
+from PySide6.QtNetwork import QAbstractSocket
+from PySide6.QtWebSockets import QWebSocket
+
+from pywebchannel.WebChannelService import MessageType, WebChannelService
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The Qt application, which is needed by the timers and the signals of the tests."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    yield app
+
+
+def processEvents(condition, timeout: int) -> bool:
+    """Processes the Qt events until the condition is met or the timeout in milliseconds is over."""
+    timer = QTimer()
+    timer.setSingleShot(True)
+    timer.start(timeout)
+    while not condition() and timer.isActive():
+        QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+    return condition()
+
+
+@pytest.fixture
+def spin(qapp):
+    """A function that processes the Qt events until a condition is met, or for the whole timeout if there is none."""
+
+    def spin(condition=lambda: False, timeout: int = 2000) -> bool:
+        return processEvents(condition, timeout)
+
+    return spin
+
+
+class WebSocketClient:
+    """A raw client of a service, which sends the QWebChannel messages as JSON text frames and collects the received
+    frames."""
+
+    def __init__(self, port: int, decode=json.loads) -> None:
+        self.decode = decode
+        self.frames = []
+        self.socket = QWebSocket()
+        self.socket.textMessageReceived.connect(self.frames.append)
+        self.socket.binaryMessageReceived.connect(lambda frame: self.frames.append(bytes(frame)))
+        self.socket.open(QUrl(f"ws://127.0.0.1:{port}"))
+        assert processEvents(lambda: self.socket.state() == QAbstractSocket.SocketState.ConnectedState, 2000)
+        self._lastId = 0
+
+    def send(self, message) -> None:
+        self.socket.sendTextMessage(json.dumps(message))
+
+    def messages(self):
+        """Returns the received messages, the messages of the array frames are listed one by one."""
+        messages = []
+        for frame in self.frames:
+            message = self.decode(frame)
+            messages.extend(message if isinstance(message, list) else [message])
+        return messages
+
+    def take(self):
+        """Returns the received messages and forgets them."""
+        messages = self.messages()
+        self.frames.clear()
+        return messages
+
+    def receive(self, predicate, timeout: int = 2000):
+        """Waits for a message that matches the predicate and returns it."""
+        assert processEvents(lambda: any(predicate(message) for message in self.messages()), timeout)
+        return next(message for message in self.messages() if predicate(message))
+
+    def init(self):
+        """Initializes the channel and returns the data of the objects."""
+        self._lastId += 1
+        self.send({"type": MessageType.Init, "id": self._lastId})
+        return self.response(self._lastId)
+
+    def connectTo(self, objects, objectName: str, signalName: str) -> int:
+        """Connects to a signal of an object, given the data of the objects, and returns the index of the signal."""
+        signalIndex = dict(objects[objectName]["signals"])[signalName]
+        self.send({"type": MessageType.ConnectToSignal, "object": objectName, "signal": signalIndex})
+        return signalIndex
+
+    def invoke(self, objectName: str, method: str, *args, **fields) -> int:
+        """Calls a method without waiting for its response and returns the identifier of the call."""
+        self._lastId += 1
+        self.send({"type": MessageType.InvokeMethod, "object": objectName, "method": method, "args": [*args],
+                   "id": self._lastId, **fields})
+        return self._lastId
+
+    def call(self, objectName: str, method: str, *args, **fields):
+        """Calls a method and returns the data of its response."""
+        return self.response(self.invoke(objectName, method, *args, **fields))
+
+    def response(self, messageId: int):
+        """Waits for the response of a call and returns its data."""
+        return self.receive(
+            lambda message: message.get("type") == MessageType.Response and message.get("id") == messageId
+        )["data"]
+
+
+@pytest.fixture
+def serve(qapp):
+    """A function that starts a service on a free port with the given controllers and start options, the services are
+    stopped after the test."""
+    services = []
+
+    def serve(*controllers, **options) -> WebChannelService:
+        service = WebChannelService("TestService")
+        assert service.start(0, **options)
+        service.port = service.websocketServer.serverPort()
+        for controller in controllers:
+            service.registerController(controller)
+        services.append(service)
+        return service
+
+    yield serve
+    for service in services:
+        service.stop()
+
+
+@pytest.fixture
+def connect(qapp):
+    """A function that connects a raw client to a service, the clients are closed after the test."""
+    services = []
+    clients = []
+
+    def connect(service: WebChannelService, decode=json.loads) -> WebSocketClient:
+        count = len(service.transports)
+        client = WebSocketClient(service.port, decode)
+        assert processEvents(lambda: len(service.transports) > count, 2000)
+        services.append(service)
+        clients.append(client)
+        return client
+
+    yield connect
+    # Wait for the services to let the clients go, before they are stopped
+    for client in clients:
+        client.socket.close()
+    processEvents(lambda: all(len(service.transports) == 0 for service in services), 2000)
+
+
+qwebchannel = Path(__file__).parents[1] / "src/pywebchannel/files_in_user_project/frontend/src/api/qwebchannel/index.js"
+""" The JavaScript client, which the node scripts import as ./qwebchannel.mjs. """
+
+
+@pytest.fixture
+def node(tmp_path):
+    """A function that runs a test script against the JavaScript client with node, the script fails by throwing. The
+    tests are skipped if node is not installed."""
+    executable = shutil.which("node")
+    if executable is None:
+        pytest.skip("node is not installed")
+    # The client is an ES module, which node loads by its extension
+    shutil.copy(qwebchannel, tmp_path / "qwebchannel.mjs")
+
+    def node(script: str) -> None:
+        (tmp_path / "test.mjs").write_text(script)
+        result = subprocess.run([executable, "test.mjs"], cwd=tmp_path, capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0, result.stderr
+
+    return node
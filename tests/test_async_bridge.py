@@ -0,0 +1,115 @@
+import asyncio
+import gc
+import time
+import warnings
+
+from PySide6.QtCore import QEventLoop, QTimer
+
+from pywebchannel import Action, Controller
+from pywebchannel.AsyncBridge import AsyncBridge
+
+
+def runUntil(qapp, futures, timeout=2000):
+    loop = QEventLoop()
+    for future in futures:
+        future.add_done_callback(lambda _: all(f.done() for f in futures) and loop.quit())
+    QTimer.singleShot(timeout, loop.quit)
+    loop.exec()
+
+
+def test_timers_threads_and_callbacks_wake_the_private_loop(qapp):
+    bridge = AsyncBridge.instance()
+
+    async def sleeper():
+        await asyncio.sleep(0.05)
+        return "slept"
+
+    async def threaded():
+        return await asyncio.to_thread(lambda: time.sleep(0.02) or "threaded")
+
+    async def chain():
+        for _ in range(100):
+            await asyncio.sleep(0)
+        return "chained"
+
+    start = time.perf_counter()
+    futures = [bridge.submit(sleeper()), bridge.submit(threaded()), bridge.submit(chain())]
+    runUntil(qapp, futures)
+    assert [f.result() for f in futures] == ["slept", "threaded", "chained"]
+    assert time.perf_counter() - start < 1
+    # Nothing is left to do, so the loop is not stepped anymore
+    assert not bridge._timer.isActive()
+
+
+def test_done_callback_and_run(qapp):
+    bridge = AsyncBridge.instance()
+    results = []
+    future = bridge.submit(asyncio.sleep(0, "done"), lambda f: results.append(f.result()))
+    runUntil(qapp, [future])
+    assert results == ["done"]
+    assert bridge.run(asyncio.sleep(0.01, "ran")) == "ran"
+
+
+def test_timers_step_the_loop_when_they_are_due(qapp):
+    bridge = AsyncBridge.instance()
+    future = bridge.submit(asyncio.sleep(0.2, "late"))
+    runUntil(qapp, [future], timeout=100)
+    # The loop waits for the timer without being stepped in between
+    assert not future.done() and bridge._timer.remainingTime() > 50
+    runUntil(qapp, [future])
+    assert future.result() == "late"
+
+
+class WaiterController(Controller):
+    def __init__(self):
+        super().__init__("WaiterController")
+        self.started = 0
+
+    @Action()
+    async def wait(self, delay: float):
+        self.started += 1
+        await asyncio.sleep(delay)
+        return "waited"
+
+    @Action()
+    def ping(self):
+        return "pong"
+
+    @Action(stream=True)
+    async def countdown(self, count: int):
+        for value in range(count, 0, -1):
+            await asyncio.sleep(0)
+            yield value
+
+
+def test_coroutine_actions_reply_once_finished(serve, connect):
+    client = connect(serve(WaiterController()))
+    client.init()
+    waiting = client.invoke("WaiterController", "wait", 0.1)
+    # The other calls are answered meanwhile
+    assert client.call("WaiterController", "ping")["success"] == "pong"
+    assert not any(message.get("id") == waiting for message in client.messages())
+    assert client.response(waiting)["success"] == "waited"
+
+
+def test_coroutine_actions_called_from_python(qapp):
+    waiter = WaiterController()
+    assert waiter.wait(0.01)["success"] == "waited"
+    assert waiter.countdown(3)["data"] == [3, 2, 1]
+
+
+def test_coroutine_actions_called_under_a_running_loop(qapp):
+    waiter = WaiterController()
+
+    async def main():
+        return waiter.wait(0.01), waiter.countdown(3), await WaiterController.wait.__wrapped__(waiter, 0.01)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        waited, countdown, awaited = asyncio.run(main())
+        gc.collect()
+
+    # The slot cannot block, the coroutines are closed without being run
+    assert "asyncio loop is running" in waited["error"] and "asyncio loop is running" in countdown["error"]
+    assert waiter.started == 1 and awaited == "waited"
+    assert not [warning for warning in caught if issubclass(warning.category, RuntimeWarning)]
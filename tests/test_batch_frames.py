@@ -0,0 +1,63 @@
+import msgpack
+
+from pywebchannel import Action, Controller, Signal
+from pywebchannel.WebChannelService import MessageType
+
+
+class TickerController(Controller):
+    def __init__(self):
+        super().__init__("TickerController")
+
+    ticked = Signal({"value": int})
+
+    @Action()
+    def tick(self, count: int) -> str:
+        for value in range(count):
+            self.ticked.emit(value)
+        return "done"
+
+
+def unpack(frame):
+    return msgpack.unpackb(frame, raw=False, strict_map_key=False)
+
+
+def test_messages_of_one_iteration_share_a_frame(serve, connect):
+    service = serve(TickerController(), batch=True)
+    client = connect(service)
+    signalIndex = client.connectTo(client.init(), "TickerController", "ticked")
+    client.take()
+
+    messageId = client.invoke("TickerController", "tick", 3)
+    client.response(messageId)
+    [frame] = client.frames
+    messages = client.decode(frame)
+    assert [message.get("args") for message in messages] == [[0], [1], [2], None]
+    assert all(message["signal"] == signalIndex for message in messages[:3])
+    assert messages[3]["type"] == MessageType.Response
+
+
+def test_lone_message_is_a_plain_frame(serve, connect):
+    service = serve(TickerController(), batch=True)
+    client = connect(service)
+    client.init()
+    client.take()
+
+    client.call("TickerController", "tick", 0)
+    assert [type(client.decode(frame)) for frame in client.frames] == [dict]
+
+
+def test_joined_frames_reuse_the_broadcast_frames(serve, connect):
+    service = serve(TickerController(), codec="msgpack", batch=True)
+    clients = [connect(service, unpack) for _ in range(2)]
+    for client in clients:
+        client.connectTo(client.init(), "TickerController", "ticked")
+        client.take()
+
+    clients[0].call("TickerController", "tick", 2)
+    received = []
+    for client in clients:
+        client.receive(lambda message: message.get("args") == [1])
+        received.append([message for message in client.messages() if message.get("type") == MessageType.Signal])
+    assert received[0] == received[1] and [message["args"] for message in received[0]] == [[0], [1]]
+    # Each signal is encoded once, the frames of the second client are joined from the cached ones
+    assert service.encodeStats()["reused"] >= 2
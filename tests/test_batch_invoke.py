@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from pywebchannel import Action, CachePolicy, Controller
+from pywebchannel.WebChannelService import MessageType
+
+
+class LedgerController(Controller):
+    def __init__(self):
+        super().__init__("LedgerController")
+        self.entries = []
+        self.release = None
+
+    @Action()
+    def add(self, entry: str) -> str:
+        self.entries.append(entry)
+        return ",".join(self.entries)
+
+    @Action()
+    async def settle(self) -> str:
+        # Wait until the test releases the call
+        self.release = asyncio.Event()
+        await self.release.wait()
+        return "settled"
+
+    @Action(executor="thread")
+    def total(self, values: list) -> int:
+        return sum(values)
+
+    @Action(cache=CachePolicy())
+    def rate(self, currency: str) -> str:
+        self.entries.append(f"rate {currency}")
+        return f"{currency} 1.0"
+
+
+@pytest.fixture
+def ledger(serve, connect):
+    controller = LedgerController()
+    client = connect(serve(controller))
+    client.init()
+    return controller, client
+
+
+def batch(client, *calls) -> int:
+    """Sends a batch of calls, each one given by its method and arguments, and returns the identifier of the batch."""
+    client._lastId += 1
+    client.send({
+        "type": MessageType.BatchInvoke,
+        "id": client._lastId,
+        "calls": [{"object": "LedgerController", "method": method, "args": [*args]} for method, *args in calls],
+    })
+    return client._lastId
+
+
+def test_calls_run_and_answer_in_order(ledger):
+    controller, client = ledger
+    results = client.response(batch(client, ("add", "a"), ("add", "b"), ("add", "c")))
+    assert [result["success"] for result in results] == ["a", "a,b", "a,b,c"]
+    assert client.response(batch(client)) == []
+
+
+def test_unknown_methods_and_objects_are_answered_with_errors(ledger):
+    controller, client = ledger
+    client._lastId += 1
+    client.send({"type": MessageType.BatchInvoke, "id": client._lastId, "calls": [
+        {"object": "LedgerController", "method": "add", "args": ["a"]},
+        {"object": "LedgerController", "method": "missing", "args": []},
+        {"object": "MissingController", "method": "add", "args": ["b"]},
+    ]})
+    results = client.response(client._lastId)
+    assert results[0]["success"] == "a"
+    assert results[1]["error"] == "Cannot invoke method 'missing' of object 'LedgerController'"
+    assert results[2]["error"] == "Cannot invoke method 'add' of object 'MissingController'"
+    assert controller.entries == ["a"]
+
+
+def test_batch_is_answered_after_its_last_deferred_call(ledger, spin):
+    controller, client = ledger
+    client.call("LedgerController", "rate", "EUR")
+    batchId = batch(client, ("settle",), ("total", [1, 2, 3]), ("rate", "EUR"), ("add", "a"))
+    assert spin(lambda: controller.release is not None)
+
+    # The other calls are answered meanwhile, the batch waits for its coroutine
+    assert client.call("LedgerController", "add", "b")["success"] == "rate EUR,a,b"
+    spin(timeout=100)
+    assert not any(message.get("id") == batchId for message in client.messages())
+
+    controller.release.set()
+    results = client.response(batchId)
+    assert [result["success"] for result in results] == ["settled", None, "EUR 1.0", "rate EUR,a"]
+    assert results[1]["data"] == 6
+    # The cached call is answered without running the action again
+    assert controller.entries == ["rate EUR", "a", "b"]
+    assert len([message for message in client.messages() if message.get("id") == batchId]) == 1
+
+
+def test_the_javascript_client_batches_the_calls(node):
+    node("""
+import assert from "node:assert/strict";
+import {QWebChannel, QWebChannelMessageTypes as Type} from "./qwebchannel.mjs";
+
+const sent = [];
+const transport = {send: data => sent.push(JSON.parse(data))};
+const channel = new QWebChannel(transport);
+const receive = message => transport.onmessage({data: JSON.stringify(message)});
+const methods = [["add", 5], ["settle", 6]];
+receive({type: Type.response, id: 0, data: {LedgerController: {methods, properties: [], signals: [], enums: {}}}});
+sent.length = 0;
+
+const ledger = channel.objects.LedgerController;
+const [first, second, nested] = channel.batch(() => [
+    ledger.add("a"),
+    ledger.settle(),
+    // A nested batch is a part of the outer one
+    channel.batch(() => ledger.add("b")),
+]);
+assert.equal(sent.length, 1);
+assert.equal(sent[0].type, Type.batchInvoke);
+assert.deepEqual(sent[0].calls, [
+    {object: "LedgerController", method: "add", args: ["a"]},
+    {object: "LedgerController", method: "settle", args: []},
+    {object: "LedgerController", method: "add", args: ["b"]},
+]);
+
+receive({type: Type.response, id: sent[0].id, data: [{success: "a"}, {success: "settled"}, {error: "failed"}]});
+assert.deepEqual(await first, {success: "a"});
+assert.deepEqual(await second, {success: "settled"});
+assert.deepEqual(await nested, {error: "failed"});
+
+// The calls are sent one by one again after the batch
+ledger.add("c");
+assert.equal(sent[1].type, Type.invokeMethod);
+""")
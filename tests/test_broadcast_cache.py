@@ -0,0 +1,76 @@
+from PySide6.QtCore import QObject, Property, Signal
+
+from pywebchannel.Codec import JsonCodec
+from pywebchannel.WebChannelService import BroadcastCache, MessageType, Subscription
+
+
+class Sensors(QObject):
+    readings = Signal(list)
+    valueChanged = Signal()
+
+    def getValue(self):
+        return 0
+
+    value = Property(int, getValue, notify=valueChanged)
+
+
+def signalMessage(args):
+    return {"type": MessageType.Signal, "object": "Sensors", "signal": 5, "args": [args]}
+
+
+def propertyUpdate(value):
+    return {
+        "type": MessageType.PropertyUpdate,
+        "data": [{"object": "Sensors", "signals": {}, "properties": {"1": value}}],
+    }
+
+
+def watchedCache():
+    sensors = Sensors()
+    cache = BroadcastCache()
+    cache.watchSignals(sensors, "Sensors")
+    return sensors, cache
+
+
+def test_copies_of_one_emission_share_the_frame(qapp):
+    sensors, cache = watchedCache()
+    codec = JsonCodec()
+    sensors.readings.emit([1])
+    key = cache.messageKey(signalMessage([1]))
+    cache.store(codec, key, codec.encode(signalMessage([1])))
+    # The copy handed to the next client has the same key, but the next emission does not
+    assert cache.lookup(codec, cache.messageKey(signalMessage([1]))) == codec.encode(signalMessage([1]))
+    sensors.readings.emit([2])
+    assert cache.lookup(codec, cache.messageKey(signalMessage([2]))) is None
+
+
+def test_property_updates_are_keyed_by_the_subscription(qapp):
+    sensors, cache = watchedCache()
+    sensors.valueChanged.emit()
+    registered = {"Sensors": sensors}
+    unsubscribed = cache.messageKey(propertyUpdate(1))
+    first = cache.messageKey(propertyUpdate(1), Subscription({"Sensors": ["value"]}, registered))
+    second = cache.messageKey(propertyUpdate(1), Subscription({"Sensors": ["value"]}, registered))
+    other = cache.messageKey(propertyUpdate(1), Subscription({"Sensors": None}, registered))
+    assert first == second
+    assert len({unsubscribed, first, other}) == 3
+    # The idle clients get the property updates held back for them, which are not the current ones
+    cache.invalidate()
+    assert cache.messageKey(propertyUpdate(1)) != unsubscribed
+
+
+def test_messages_of_unwatched_objects_have_no_key(qapp):
+    _, cache = watchedCache()
+    assert cache.messageKey({**signalMessage([1]), "object": "Other"}) is None
+    assert cache.messageKey({"type": MessageType.Response, "id": 1, "data": None}) is None
+    assert BroadcastCache().messageKey(signalMessage([1])) is None
+
+
+def test_signal_emitted_while_sending_disables_the_keys(qapp):
+    sensors, cache = watchedCache()
+    cache.sending += 1
+    sensors.readings.emit([1])
+    assert cache.messageKey(signalMessage([1])) is None
+    cache.sending -= 1
+    sensors.readings.emit([2])
+    assert cache.messageKey(signalMessage([2])) is not None
@@ -0,0 +1,125 @@
+import copy
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from pywebchannel import Action, CachePolicy, Controller
+from pywebchannel.Cache import ActionCache
+
+
+class Todo(BaseModel):
+    id: str
+    tags: list[str]
+
+
+def ok(data):
+    return {"success": None, "error": None, "data": data}
+
+
+def test_least_recently_used_response_is_evicted():
+    cache = ActionCache(CachePolicy(max_entries=2))
+    cache.put(("a",), ok(1))
+    cache.put(("b",), ok(2))
+    assert cache.get(("a",)) == ok(1)
+    cache.put(("c",), ok(3))
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == ok(1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_response_expires_after_its_time_to_live():
+    cache = ActionCache(CachePolicy(ttl=0.01))
+    cache.put(("a",), ok(1))
+    assert cache.get(("a",)) == ok(1)
+    time.sleep(0.02)
+    assert cache.get(("a",)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_size_is_bounded_by_default():
+    assert CachePolicy().max_bytes == CachePolicy.defaultMaxBytes
+    cache = ActionCache(CachePolicy(max_bytes=100))
+    cache.put(("a",), ok("x" * 40))
+    cache.put(("b",), ok("y" * 40))
+    assert cache.stats()["entries"] == 1
+    assert 0 < cache.stats()["bytes"] <= 100
+    # A response larger than the whole budget is not kept
+    cache.put(("c",), ok("z" * 200))
+    assert cache.get(("c",)) is None
+
+
+def test_size_is_not_reported_when_unbounded():
+    cache = ActionCache(CachePolicy(max_bytes=0))
+    cache.put(("a",), ok("x" * 1000))
+    assert cache.stats()["bytes"] is None
+
+
+def test_failed_responses_are_not_kept():
+    cache = ActionCache(CachePolicy())
+    cache.put(("a",), {"success": None, "error": "failed", "data": None})
+    assert cache.get(("a",)) is None
+
+
+@pytest.mark.parametrize("args", [
+    ([1, 2], {"a": [1]}),
+    ({"b": 2, "a": 1},),
+    (Todo(id="1", tags=["x"]),),
+    ({1, 2},),
+])
+def test_key_of_unhashable_arguments(args):
+    key = ActionCache.key(args)
+    hash(key)
+    # Equal arguments have equal keys
+    assert key == ActionCache.key(copy.deepcopy(args))
+
+
+def test_keys_of_different_arguments_differ():
+    keys = [
+        ActionCache.key(([1, 2],)),
+        ActionCache.key(((1, 2),)),
+        ActionCache.key(([2, 1],)),
+        ActionCache.key(({"a": 1},)),
+        ActionCache.key(({"a": 2},)),
+        ActionCache.key((Todo(id="1", tags=["x"]),)),
+        ActionCache.key((Todo(id="1", tags=["y"]),)),
+    ]
+    assert len(set(keys)) == len(keys)
+
+
+def test_keys_of_arrays():
+    numpy = pytest.importorskip("numpy")
+    assert ActionCache.key((numpy.arange(4.0),)) == ActionCache.key((numpy.arange(4.0),))
+    keys = [
+        ActionCache.key((numpy.arange(4.0),)),
+        ActionCache.key((numpy.arange(4),)),
+        ActionCache.key((numpy.arange(4.0).reshape(2, 2),)),
+    ]
+    assert len(set(keys)) == len(keys)
+
+
+def test_arguments_without_hashable_equivalent_are_not_cached():
+    assert ActionCache.key((bytearray(b"x"),)) is None
+
+
+class CountController(Controller):
+    def __init__(self):
+        super().__init__("CountController")
+        self.calls = 0
+
+    @Action(cache=CachePolicy(max_entries=8))
+    def count(self, items: list) -> int:
+        self.calls += 1
+        return len(items)
+
+
+def test_cached_action_runs_once_per_arguments(qapp):
+    controller = CountController()
+    assert controller.count([1, 2])["data"] == 2
+    assert controller.count([1, 2])["data"] == 2
+    assert controller.count([1])["data"] == 1
+    assert controller.calls == 2
+    controller.invalidateCache("count", [1, 2])
+    controller.count([1, 2])
+    assert controller.calls == 3
+    assert controller.cacheStats()["count"]["hits"] == 1
@@ -0,0 +1,99 @@
+import ast
+import json
+
+import pytest
+from PySide6.QtCore import QByteArray
+
+from pywebchannel import Action, Controller
+from pywebchannel.Codec import Codec, CodecError, FastJsonCodec, JsonCodec, MsgPackCodec
+
+MESSAGES = [
+    {"type": 6, "object": "TodoController", "method": "addTodo", "args": [{"text": "ü", "done": False}], "id": 1},
+    {"type": 1, "object": "TodoController", "signal": 5, "args": [[1.5, -2, None, "x"]]},
+]
+
+
+class EchoController(Controller):
+    def __init__(self):
+        super().__init__("EchoController")
+
+    @Action()
+    def echo(self, text: str) -> str:
+        return text
+
+
+def decodeFrame(codec: Codec, frame):
+    """Decodes a frame the way the transport receives it, binary frames arrive as QByteArray."""
+    return codec.decode(QByteArray(frame) if codec.binary else frame)
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), FastJsonCodec("json"), FastJsonCodec("orjson"), MsgPackCodec()],
+                         ids=lambda codec: f"{codec.name}-{getattr(codec, 'backend', '')}")
+def test_round_trip_and_join(codec):
+    for message in MESSAGES:
+        assert decodeFrame(codec, codec.encode(message)) == message
+
+    # A joined list of frames is the frame of the list
+    joined = codec.join([codec.encode(message) for message in MESSAGES])
+    assert joined == codec.encode(MESSAGES)
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), FastJsonCodec("json"), FastJsonCodec("orjson"), MsgPackCodec()],
+                         ids=lambda codec: f"{codec.name}-{getattr(codec, 'backend', '')}")
+def test_decode_rejects_invalid_frames(codec):
+    with pytest.raises(CodecError):
+        decodeFrame(codec, b"\xc1" if codec.binary else "{not json")
+    # A message must be an object
+    with pytest.raises(CodecError):
+        decodeFrame(codec, codec.encode([1, 2]))
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_fast_json_decodes_text_and_binary_frames(backend):
+    codec = FastJsonCodec(backend)
+    frame = '{"type":4,"text":"ü"}'
+    assert codec.decode(frame) == codec.decode(QByteArray(frame.encode())) == {"type": 4, "text": "ü"}
+    # The orjson frames are the UTF-8 bytes of the JSON text
+    text = json.dumps(MESSAGES[0], ensure_ascii=False, separators=(",", ":"))
+    assert codec.encode(MESSAGES[0]) == (text.encode() if backend == "orjson" else text)
+
+
+def test_fast_json_transport(serve, connect):
+    service = serve(EchoController(), codec=FastJsonCodec("orjson"))
+    client = connect(service)
+    client.init()
+    assert all(isinstance(frame, bytes) for frame in client.frames)
+
+    # An invalid frame is dropped, the client is still served
+    client.socket.sendBinaryMessage(QByteArray(b"{not json"))
+    call = {"type": 6, "object": "EchoController", "method": "echo", "args": ["ü"], "id": 100}
+    client.socket.sendBinaryMessage(QByteArray(json.dumps(call, ensure_ascii=False).encode()))
+    assert client.response(100)["success"] == "ü"
+
+
+def test_create():
+    assert isinstance(Codec.create(), JsonCodec)
+    assert isinstance(Codec.create("msgpack"), MsgPackCodec)
+    codec = FastJsonCodec()
+    assert Codec.create(codec) is codec
+    with pytest.raises(ValueError):
+        Codec.create("xml")
+
+
+def test_codec_is_abstract():
+    with pytest.raises(TypeError):
+        Codec()
+
+    class ReprCodec(Codec):
+        name = "repr"
+
+        def encode(self, message):
+            return repr(message)
+
+        def decode(self, data):
+            return ast.literal_eval(data)
+
+    # The codecs which are not joinable join their frames by encoding the decoded messages again
+    codec = ReprCodec()
+    assert not codec.joinable
+    assert codec.join([codec.encode(message) for message in MESSAGES]) == codec.encode(MESSAGES)
@@ -0,0 +1,109 @@
+import json
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from pywebchannel import Action, Compact, CompactEncoding, Controller
+from pywebchannel.Controller import Convert
+
+
+class Book(BaseModel):
+    id: int
+    title: str
+    tags: List[str] = []
+
+
+class Shelf(BaseModel):
+    name: str
+    books: List[Book]
+    featured: Optional[Book] = None
+
+
+@pytest.fixture
+def compact():
+    """Registers Book as compact for one test, the registry is global."""
+    models, fields = {**CompactEncoding.models}, {**CompactEncoding._fields}
+    Compact(Book)
+    yield
+    CompactEncoding.models.clear()
+    CompactEncoding.models.update(models)
+    CompactEncoding._fields.clear()
+    CompactEncoding._fields.update(fields)
+    CompactEncoding._hasCompact.clear()
+
+
+def shelfController() -> Controller:
+    """Returns a controller whose actions are compiled once Book is compact, like the ones of an application, which
+    defines its compact models before its controllers."""
+
+    class ShelfController(Controller):
+        def __init__(self):
+            super().__init__("ShelfController")
+
+        @Action()
+        def books(self, count: int) -> List[Book]:
+            return [Book(id=i, title=f"book{i}") for i in range(count)]
+
+        @Action()
+        def titles(self, books: List[Book], featured: Book) -> str:
+            assert all(isinstance(book, Book) for book in [*books, featured])
+            return ",".join(book.title for book in [*books, featured])
+
+    return ShelfController()
+
+
+def test_models_are_sent_as_rows_and_tables(compact):
+    books = [Book(id=1, title="a", tags=["x"]), Book(id=2, title="b")]
+    assert Convert.dump(books[0]) == {"__compact__": "Book", "row": [1, "a", ["x"]]}
+    assert Convert.dump(books) == [{"__compact__": "Book", "length": 2}, [1, 2], ["a", "b"], [["x"], []]]
+    # The other models keep their keys, with their compact fields converted
+    assert Convert.dump(Shelf(name="s", books=books[:1])) == {
+        "name": "s", "books": [{"__compact__": "Book", "length": 1}, [1], ["a"], [["x"]]], "featured": None
+    }
+    # Lists of mixed items are not tables
+    assert Convert.dump([books[0], 3]) == [{"__compact__": "Book", "row": [1, "a", ["x"]]}, 3]
+    assert Convert.dump([]) == []
+
+
+def test_rows_and_tables_load_back(compact):
+    books = [Book(id=1, title="a", tags=["x"]), Book(id=2, title="b")]
+    shelf = Shelf(name="s", books=books, featured=books[1])
+    assert Convert.plan_from_web_to_py(List[Book])(Convert.dump(books)) == books
+    assert Convert.plan_from_web_to_py(Shelf)(Convert.dump(shelf)) == shelf
+    # The plain dictionaries are still accepted
+    assert Convert.plan_from_web_to_py(List[Book])([book.model_dump() for book in books]) == books
+
+
+def test_models_are_plain_without_compact_classes():
+    assert not CompactEncoding.has_compact(List[Book])
+    assert Convert.dump(Book(id=1, title="a")) == {"id": 1, "title": "a", "tags": []}
+
+
+def test_compact_actions_and_the_javascript_client(compact, serve, connect, node):
+    client = connect(serve(shelfController()))
+    objects = client.init()
+    # The field names are published once in the init message, by an internal object
+    assert objects["__compact__"]["properties"][1][3] == {"Book": ["id", "title", "tags"]}
+
+    response = client.call("ShelfController", "books", 2)
+    assert response["data"] == [{"__compact__": "Book", "length": 2}, [0, 1], ["book0", "book1"], [[], []]]
+    table = Convert.dump([Book(id=5, title="e")])
+    assert client.call("ShelfController", "titles", table, {"id": 6, "title": "f"})["success"] == "e,f"
+
+    node(f"""
+import assert from "node:assert/strict";
+import {{QWebChannel, QWebChannelMessageTypes as Type}} from "./qwebchannel.mjs";
+
+const sent = [];
+const transport = {{send: data => sent.push(JSON.parse(data))}};
+const channel = new QWebChannel(transport);
+const receive = message => transport.onmessage({{data: JSON.stringify(message)}});
+receive({{type: Type.response, id: 0, data: {json.dumps(objects)}}});
+assert.ok(!("__compact__" in channel.objects));
+
+const books = channel.objects.ShelfController.books(2);
+const call = sent.find(message => message.type === Type.invokeMethod);
+receive({{type: Type.response, id: call.id, data: {json.dumps(response)}}});
+assert.deepEqual((await books).data, [{{id: 0, title: "book0", tags: []}}, {{id: 1, title: "book1", tags: []}}]);
+""")
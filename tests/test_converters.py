@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from pywebchannel import Action, Controller
+from pywebchannel.Controller import Convert, Response
+
+
+class Todo(BaseModel):
+    text: str
+    done: bool = False
+
+
+class TodoController(Controller):
+    def __init__(self):
+        super().__init__("TodoController")
+
+    @Action()
+    def count(self, todos: list[Todo], tags: Dict[str, Todo], pinned: Optional[Todo]) -> str:
+        assert all(isinstance(todo, Todo) for todo in [*todos, *tags.values()])
+        return f"{len(todos)} {sorted(tags)} {pinned.text if pinned is not None else None}"
+
+    @Action()
+    def matrix(self, rows: list[list[float]]) -> list[list[float]]:
+        return [[value * 2 for value in row] for row in rows]
+
+    @Action()
+    def first(self, todos: List[Todo]) -> Todo:
+        return todos[0]
+
+    @Action()
+    def grouped(self, todos: list[Todo]):
+        return {"open": [todo for todo in todos if not todo.done], "count": len(todos)}
+
+    @Action()
+    def wrapped(self, text: str) -> Response:
+        return Response(success="found", data=[Todo(text=text)])
+
+
+def test_plans_skip_the_values_used_as_they_are():
+    for paramType in (int, str, list[int], list[list[float]], dict[str, int], Optional[int], int | str):
+        assert Convert.plan_from_web_to_py(paramType) is None
+
+
+def test_plans_convert_the_models_at_any_depth():
+    plan = Convert.plan_from_web_to_py(dict[str, list[Todo]])
+    converted = plan({"week": [{"text": "a"}, {"text": "b", "done": True}]})
+    assert converted == {"week": [Todo(text="a"), Todo(text="b", done=True)]}
+
+    plan = Convert.plan_from_web_to_py(Todo | None)
+    assert plan(None) is None and plan({"text": "c"}) == Todo(text="c")
+
+
+def test_actions_convert_their_arguments_and_results(serve, connect):
+    client = connect(serve(TodoController()))
+    client.init()
+    todos = [{"text": "a"}, {"text": "b"}]
+    assert client.call("TodoController", "count", todos, {"x": {"text": "x"}}, None)["success"] == "2 ['x'] None"
+    assert client.call("TodoController", "count", [], {}, {"text": "p"})["success"] == "0 [] p"
+    assert client.call("TodoController", "matrix", [[1, 2], [3]])["data"] == [[2, 4], [6]]
+    assert client.call("TodoController", "first", todos)["data"] == {"text": "a", "done": False}
+
+
+def test_actions_called_from_python_take_the_web_format(qapp):
+    assert TodoController().first([{"text": "z"}])["data"] == {"text": "z", "done": False}
+
+
+def test_results_are_dumped_by_cached_adapters():
+    assert Convert.plan_from_py_to_web(list[int]) is None
+    assert Convert.adapter(dict[str, list[Todo]]) is Convert.adapter(dict[str, list[Todo]])
+    plan = Convert.plan_from_py_to_web(dict[str, list[Todo]])
+    assert plan({"week": [Todo(text="a")]}) == {"week": [{"text": "a", "done": False}]}
+
+
+def test_unannotated_results_are_dumped_without_being_modified():
+    value = {"todos": [Todo(text="a")], "nested": {"todo": Todo(text="b", done=True)}}
+    assert Convert.dump(value) == {
+        "todos": [{"text": "a", "done": False}], "nested": {"todo": {"text": "b", "done": True}}
+    }
+    assert isinstance(value["todos"][0], Todo)
+
+
+def test_envelope_matches_the_response_model():
+    for fields in ({}, {"success": "ok"}, {"error": "failed"}, {"data": [1, {"a": None}]}):
+        assert Response.envelope(**fields) == Response(**fields).model_dump(include={"success", "error", "data"})
+
+
+def test_action_responses_are_envelopes(qapp):
+    todos = TodoController()
+    assert todos.grouped([{"text": "a"}, {"text": "b", "done": True}]) == {
+        "success": None, "error": None, "data": {"open": [{"text": "a", "done": False}], "count": 2}
+    }
+    assert todos.wrapped("c") == {"success": "found", "error": None, "data": [{"text": "c", "done": False}]}
+    assert todos.first([]) == {"success": None, "error": "list index out of range", "data": None}
@@ -0,0 +1,81 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pywebchannel import Action, Controller, Notify
+from pywebchannel.ExecutorBridge import ExecutorBridge
+
+
+def square(value: int) -> int:
+    """The task of the process pool, it is picklable because it is a module level function."""
+    return value * value
+
+
+def processId() -> int:
+    return os.getpid()
+
+
+class WorkerController(Controller):
+    def __init__(self):
+        super().__init__("WorkerController")
+        self.workerThreads = []
+        self.notifiedThreads = []
+        self.onCrunch.connect(lambda _: self.notifiedThreads.append(threading.current_thread()))
+
+    @Action(Notify({"total": int}), executor="thread")
+    def crunch(self, count: int):
+        self.workerThreads.append(threading.current_thread())
+        return sum(range(count))
+
+    @Action(executor="thread")
+    def fail(self):
+        raise ValueError("crunch failed")
+
+    @Action(executor="process", task=square)
+    def square(self, value: int):
+        pass
+
+    @Action(executor="process", task=processId)
+    def processId(self):
+        pass
+
+    @Action(executor=ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom"))
+    def threadName(self):
+        return threading.current_thread().name
+
+
+def test_thread_pool_notifies_on_the_main_thread(serve, connect):
+    worker = WorkerController()
+    client = connect(serve(worker))
+    objects = client.init()
+    signalIndex = client.connectTo(objects, "WorkerController", "onCrunch")
+
+    assert client.call("WorkerController", "crunch", 10)["data"] == 45
+    assert worker.workerThreads[0] is not threading.main_thread()
+    assert worker.notifiedThreads == [threading.main_thread()]
+    # The client receives the notification too
+    signal = client.receive(lambda message: message.get("signal") == signalIndex)
+    assert signal["args"] == [45]
+
+
+def test_process_pool_runs_the_task(serve, connect):
+    client = connect(serve(WorkerController()))
+    client.init()
+    assert client.call("WorkerController", "square", 12)["data"] == 144
+    assert client.call("WorkerController", "processId")["data"] != os.getpid()
+
+
+def test_exceptions_become_error_responses(serve, connect):
+    client = connect(serve(WorkerController()))
+    client.init()
+    response = client.call("WorkerController", "fail")
+    assert response["error"] == "crunch failed" and response["data"] is None
+
+
+def test_executor_objects_and_calls_from_python(qapp):
+    worker = WorkerController()
+    assert worker.threadName()["success"].startswith("custom")
+    # Outside of a client call, the slot waits for the result
+    assert worker.crunch(4)["data"] == 6
+    assert worker.square(3)["data"] == 9
+    assert ExecutorBridge.isProcessPool("process") and not ExecutorBridge.isProcessPool("thread")
@@ -0,0 +1,154 @@
+import copy
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from pywebchannel import Controller, Property
+from pywebchannel.JsonPatch import JsonPatch
+from pywebchannel.Scheduler import NotifyScheduler
+
+
+def applyPatch(document, patch):
+    """Applies a patch the way applyJsonPatch of the frontend does, to check the patches end to end."""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in operation["path"].split("/")[1:]]
+        if not tokens:
+            document = operation.get("value")
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token) if isinstance(parent, list) else token]
+        key = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if key == "-" else int(key)
+            if operation["op"] == "add":
+                parent.insert(index, operation["value"])
+            elif operation["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = operation["value"]
+        elif operation["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = operation["value"]
+    return document
+
+
+@pytest.mark.parametrize("old, new", [
+    ([1, 2, 3, 4], [1, 2, 9, 3, 4]),
+    ([1, 2, 3, 4], [1, 4]),
+    ([{"id": 1, "done": False}, {"id": 2}], [{"id": 1, "done": True}, {"id": 2}, {"id": 3}]),
+    ({"a": 1, "b/c": {"x": [1]}, "~": 0}, {"a": 2, "b/c": {"x": [1, 2]}, "d": None}),
+    ({"a": [1]}, [1]),
+    ([True, 1], [1, True]),
+])
+def test_diff_applies_to_new_value(old, new):
+    patch = JsonPatch.diff(old, new)
+    assert applyPatch(old, patch) == new
+    assert JsonPatch.equal(applyPatch(old, patch), new)
+
+
+def test_diff_of_equal_values_is_empty():
+    assert JsonPatch.diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+
+
+def test_diff_skips_common_head_and_tail():
+    old = list(range(1000))
+    new = old[:500] + ["x"] + old[500:]
+    assert JsonPatch.diff(old, new) == [{"op": "add", "path": "/500", "value": "x"}]
+
+
+def test_snapshot_is_a_deep_copy_in_web_format():
+    class Item(BaseModel):
+        n: int
+
+    value = {"items": [Item(n=1)], "tags": ["a"]}
+    snapshot = JsonPatch.snapshot(value)
+    value["tags"].append("b")
+    assert snapshot == {"items": [{"n": 1}], "tags": ["a"]}
+
+
+class DeltaController(Controller):
+    def __init__(self):
+        super().__init__("DeltaController")
+
+    items = Property(list, [], delta=True, coalesce_ms=1000)
+    tags = Property(dict, {}, delta=True)
+
+
+def test_delta_property_patches_from_init_value(qapp):
+    controller = DeltaController()
+    patches = []
+    controller.itemsPatched.connect(patches.append)
+
+    # A client reads the value, then it is changed several times in one window
+    clientValue = JsonPatch.snapshot(controller.items)
+    controller.items = list(range(10))
+    controller.items = list(range(30))
+    assert patches == []
+
+    # Another client connects while the patch is pending, the transport delivers it first
+    NotifyScheduler.instance().flushAll()
+    assert len(patches) == 1
+    clientValue = applyPatch(clientValue, patches[0])
+    newClientValue = JsonPatch.snapshot(controller.items)
+    assert clientValue == newClientValue == list(range(30))
+
+    # The next patch applies to the values of both clients
+    items = [*controller.items]
+    items.insert(1, 9)
+    controller.items = items
+    NotifyScheduler.instance().flushAll()
+    assert patches[-1] == [{"op": "add", "path": "/1", "value": 9}]
+    assert applyPatch(clientValue, patches[-1]) == applyPatch(newClientValue, patches[-1]) == items
+
+
+def test_delta_property_without_window_patches_once_per_iteration(qapp):
+    controller = DeltaController()
+    patches = []
+    controller.tagsPatched.connect(patches.append)
+    controller.tags
+
+    text = "x" * 100
+    controller.tags = {"a": text, "b": 2, "c": 3}
+    controller.tags = {"a": text, "b": 2, "c": 4}
+    # Nothing is compared until the end of the event loop iteration
+    assert patches == []
+    NotifyScheduler.instance().flushAll()
+    # A patch which is not smaller than the value replaces the whole value
+    assert patches == [[{"op": "replace", "path": "", "value": {"a": text, "b": 2, "c": 4}}]]
+
+    controller.tags = {"a": text, "b": 2, "c": 5}
+    NotifyScheduler.instance().flushAll()
+    assert patches[-1] == [{"op": "replace", "path": "/c", "value": 5}]
+
+    # Assigning an equal value sends nothing
+    controller.tags = {"a": text, "b": 2, "c": 5}
+    NotifyScheduler.instance().flushAll()
+    assert len(patches) == 2
+
+
+def test_delta_property_patches_nested_containers(qapp):
+    controller = DeltaController()
+    patches = []
+    controller.tagsPatched.connect(patches.append)
+    todos = [{"id": index, "done": False} for index in range(1000)]
+    controller.tags = {"todos": todos}
+    NotifyScheduler.instance().flushAll()
+
+    # A single top-level key does not make the patch replace the whole value
+    todos = copy.deepcopy(todos)
+    todos[500]["done"] = True
+    controller.tags = {"todos": todos}
+    NotifyScheduler.instance().flushAll()
+    assert patches[-1] == [{"op": "replace", "path": "/todos/500/done", "value": True}]
+
+
+def test_size_estimates_the_json_length():
+    value = {"todos": [{"id": 1, "done": False, "text": "a b"}, None, 2.5]}
+    assert JsonPatch.size(value) == len(json.dumps(value, separators=(",", ":")))
+    # The counting stops once the value is larger than the limit
+    value = [list(range(1000)), list(range(1000))]
+    assert 10 < JsonPatch.size(value, 10) < JsonPatch.size(value)
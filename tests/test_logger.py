@@ -0,0 +1,75 @@
+import io
+import json
+import time
+
+import pytest
+
+from pywebchannel import WebChannelService
+from pywebchannel.Utils import Logger, LogLevel, QueueLogBackend
+
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture
+def restoreBackend():
+    yield
+    Logger.setBackend(None)
+
+
+def test_repeats_are_rate_limited_and_sampled():
+    stream = io.StringIO()
+    backend = QueueLogBackend(json_lines=True, stream=stream, repeat_limit=3, repeat_window=60, sample_every=5)
+    for _ in range(20):
+        backend.submit(LogLevel.Error, "failed", "Test")
+    backend.submit(LogLevel.Info, "other", "Test")
+    backend.start()
+    backend.close()
+
+    records = lines(stream)
+    # The first 3 messages, and the 5th, 10th and 15th repeats over the limit
+    assert [record["message"] for record in records if "suppressed" not in record].count("failed") == 6
+    assert {"message": "other", "level": "INFO"}.items() <= records[6].items()
+    # The other repeats are reported when the backend is closed
+    assert records[-1]["suppressed"] == 14 and backend.suppressed == 14
+
+
+def test_repeats_are_reported_when_the_window_is_over():
+    stream = io.StringIO()
+    backend = QueueLogBackend(json_lines=True, stream=stream, repeat_limit=2, repeat_window=0.05, sample_every=0)
+    backend.start()
+    for _ in range(5):
+        backend.submit(LogLevel.Warning, "slow", "Test")
+    time.sleep(0.3)
+    records = lines(stream)
+    backend.close()
+
+    assert [record.get("suppressed") for record in records] == [None, None, 3]
+
+
+def test_full_queue_drops_messages():
+    stream = io.StringIO()
+    backend = QueueLogBackend(max_queue=1, stream=stream, repeat_limit=0)
+    for index in range(3):
+        backend.submit(LogLevel.Info, f"message {index}", "Test")
+    backend.start()
+    backend.close()
+
+    assert backend.dropped == 2
+    assert "message 0" in stream.getvalue() and "2 messages dropped" in stream.getvalue()
+
+
+def test_services_leave_the_backend_to_the_application(qapp, restoreBackend):
+    Logger.setBackend(None)
+    service = WebChannelService("LoggerService")
+    assert service.start(0)
+    service.stop()
+    assert Logger.backend is None
+
+    # The backend set by the application is kept
+    stream = io.StringIO()
+    Logger.setBackend(QueueLogBackend(stream=stream))
+    assert service.start(0)
+    service.stop()
+    assert Logger.backend.stream is stream
@@ -0,0 +1,112 @@
+import gc
+import weakref
+
+import pytest
+from PySide6.QtCore import SIGNAL
+
+from pywebchannel import Action, Controller, Signal
+from pywebchannel.Metrics import Histogram, Metrics
+from pywebchannel.MetricsServer import MetricsServer
+
+
+class CountController(Controller):
+    def __init__(self):
+        super().__init__("MetricsController")
+
+    @Action()
+    def count(self, items: list) -> int:
+        return len(items)
+
+    @Action()
+    def fail(self) -> int:
+        raise ValueError("failed")
+
+
+class GaugeController(Controller):
+    def __init__(self):
+        super().__init__("GaugeController")
+
+    levelChanged = Signal({"level": int})
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics.instance()
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+
+def test_metrics_are_disabled_by_default(qapp):
+    assert Metrics().enabled is False
+
+
+def test_actions_are_recorded_once_enabled(qapp, metrics):
+    controller = CountController()
+    controller.count([1])
+    assert metrics.action("MetricsController", "count").calls == 0
+
+    metrics.enabled = True
+    controller.count([1, 2])
+    controller.fail()
+    assert metrics.action("MetricsController", "count").calls == 1
+    assert metrics.action("MetricsController", "fail").errors == 1
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 5, 5, 50):
+        histogram.observe(value)
+    assert histogram.buckets() == [(1, 1), (10, 3), (100, 4), (float("inf"), 4)]
+    assert 1 <= histogram.quantile(0.5) <= 10
+    assert histogram.quantile(1.0) <= 100
+
+
+def test_exposition_text(qapp, metrics):
+    actionMetrics = metrics.action('Quote"Controller', "run\\fast")
+    actionMetrics.calls = 3
+    actionMetrics.latency.observe(2)
+    text = MetricsServer(0).exposition()
+    lines = text.splitlines()
+
+    assert text.endswith("# EOF\n")
+    assert lines.index("# TYPE pywebchannel_action_calls counter") + 1 == \
+        lines.index("# HELP pywebchannel_action_calls The calls of an action.")
+    labels = 'controller="Quote\\"Controller",action="run\\\\fast"'
+    assert f"pywebchannel_action_calls_total{{{labels}}} 3" in lines
+    assert f'pywebchannel_action_latency_seconds_bucket{{{labels},le="0.001"}} 0' in lines
+    assert f'pywebchannel_action_latency_seconds_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f"pywebchannel_action_latency_seconds_count{{{labels}}} 1" in lines
+    assert f"pywebchannel_action_latency_seconds_sum{{{labels}}} 0.002" in lines
+    assert "pywebchannel_event_loop_stalls_total 0" in lines
+
+
+def test_signals_are_connected_only_while_enabled(qapp):
+    metrics = Metrics()
+    gauge = GaugeController()
+    metrics.watchSignals(gauge, "GaugeController")
+    receivers = lambda: gauge.receivers(SIGNAL("levelChanged(int)"))
+    assert receivers() == 0
+
+    metrics.enabled = True
+    assert receivers() == 1
+    gauge.levelChanged.emit(1)
+    metrics.enabled = False
+    assert receivers() == 0
+    gauge.levelChanged.emit(2)
+    index = gauge.metaObject().indexOfSignal("levelChanged(int)")
+    assert metrics.signalAt("GaugeController", index).emissions.total == 1
+
+
+def test_watched_objects_are_not_kept_alive(qapp):
+    metrics = Metrics()
+    metrics.enabled = True
+    gauge = GaugeController()
+    metrics.watchSignals(gauge, "GaugeController")
+    reference = weakref.ref(gauge)
+    del gauge
+    gc.collect()
+    assert reference() is None
+    assert metrics.signalAt("GaugeController", 0) is None and len(metrics._signalIndexes) == 0
+    # The counters of the signals are still reported
+    assert "GaugeController" in metrics.snapshot()["signals"]
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from pywebchannel import Action, Controller, Notify, Signal
+from pywebchannel.Controller import Convert
+from pywebchannel.NDArray import NDArray
+
+numpy = pytest.importorskip("numpy")
+from numpy.typing import NDArray as Array  # noqa: E402
+
+
+class ImageController(Controller):
+    def __init__(self):
+        super().__init__("ImageController")
+
+    frameReady = Signal({"frame": numpy.ndarray})
+
+    @Action(Notify({"image": numpy.ndarray}))
+    def brighten(self, image: Array[numpy.float32], gain: float) -> Array[numpy.float32]:
+        assert image.dtype == numpy.float32
+        image *= gain
+        return image
+
+    @Action()
+    def stats(self, values: Array[numpy.int16]):
+        return {"sum": values.sum(), "values": values}
+
+
+@pytest.mark.parametrize("dtype", [*NDArray.TYPED_ARRAYS])
+def test_arrays_round_trip(dtype):
+    array = (numpy.arange(12) % 5).astype(dtype).reshape(3, 4)
+    descriptor = NDArray.encode(array)
+    assert descriptor["dtype"] == dtype and descriptor["shape"] == [3, 4]
+    decoded = NDArray.decode(descriptor)
+    assert NDArray.equal(decoded, array) and decoded.flags.writeable
+
+
+def test_buffers_are_little_endian_and_row_major():
+    array = numpy.array([[1, 2], [3, 4]], dtype=">i4").T
+    descriptor = NDArray.encode(array)
+    assert descriptor == NDArray.encode(numpy.array([[1, 3], [2, 4]], dtype="<i4"))
+    assert numpy.array_equal(NDArray.decode(descriptor), array)
+
+
+def test_nested_lists_and_unsupported_dtypes():
+    assert NDArray.decode([[1, 2], [3, 4]], "float32").dtype == numpy.float32
+    assert NDArray.encode(None) is None and NDArray.decode(None) is None
+    with pytest.raises(Exception, match="not supported"):
+        NDArray.encode(numpy.array(["text"]))
+
+
+def test_arrays_in_actions_and_signals(serve, connect):
+    images = ImageController()
+    client = connect(serve(images))
+    objects = client.init()
+    frameIndex = client.connectTo(objects, "ImageController", "frameReady")
+    brightenedIndex = client.connectTo(objects, "ImageController", "onBrighten")
+
+    image = numpy.linspace(0, 1, 6, dtype=numpy.float32).reshape(2, 3)
+    response = client.call("ImageController", "brighten", NDArray.encode(image), 2.0)
+    assert NDArray.equal(NDArray.decode(response["data"]), image * 2)
+    signal = client.receive(lambda message: message.get("signal") == brightenedIndex)
+    assert NDArray.equal(NDArray.decode(signal["args"][0]), image * 2)
+    # The nested lists are converted to the dtype of the annotation, the structures are converted by their contents
+    response = client.call("ImageController", "stats", [1, 2, 3])
+    assert response["data"]["sum"] == 6
+    assert NDArray.equal(NDArray.decode(response["data"]["values"]), numpy.array([1, 2, 3], dtype=numpy.int16))
+
+    # The signals are emitted with the values in web format
+    images.frameReady.emit(Convert.from_py_to_web(numpy.eye(2, dtype=numpy.uint8)))
+    signal = client.receive(lambda message: message.get("signal") == frameIndex)
+    assert NDArray.equal(NDArray.decode(signal["args"][0]), numpy.eye(2, dtype=numpy.uint8))
+
+
+def test_arrays_round_trip_through_the_javascript_client(node):
+    arrays = {
+        "float64": numpy.array([[0.5, -1.25], [3.0, 1e300]]),
+        "int64": numpy.array([-(2 ** 40), 7], dtype=numpy.int64),
+        "uint8": numpy.arange(5, dtype=numpy.uint8),
+    }
+    descriptors = json.dumps({dtype: NDArray.encode(array) for dtype, array in arrays.items()})
+    node(f"""
+import assert from "node:assert/strict";
+import {{NDArray}} from "./qwebchannel.mjs";
+const descriptors = {descriptors};
+const float64 = NDArray.decode(descriptors.float64);
+assert.ok(float64.data instanceof Float64Array);
+assert.deepEqual(Array.from(float64.data), [0.5, -1.25, 3.0, 1e300]);
+assert.deepEqual(float64.shape, [2, 2]);
+assert.deepEqual(Array.from(NDArray.decode(descriptors.int64).data), [-(2n ** 40n), 7n]);
+// The arrays sent back to the backend are encoded to the same descriptors
+for (const dtype of Object.keys(descriptors)) {{
+    assert.deepEqual(JSON.parse(JSON.stringify(NDArray.decode(descriptors[dtype]))), descriptors[dtype]);
+}}
+assert.deepEqual(JSON.parse(JSON.stringify(new NDArray(new Int16Array([1, 2])))),
+    {{__ndarray__: "AQACAA==", dtype: "int16", shape: [2]}});
+""")
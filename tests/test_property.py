@@ -0,0 +1,61 @@
+from PySide6.QtCore import QEventLoop, QTimer
+
+from pywebchannel import Controller, Property
+
+
+class ThermostatController(Controller):
+    def __init__(self):
+        super().__init__("ThermostatController")
+
+    temperature = Property(float, 20.0, coalesce_ms=50)
+    humidity = Property(int, 40, coalesce_ms=50)
+    mode = Property(str, "auto", max_rate=20)
+    target = Property(int, 0)
+
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def record(signal):
+    values = []
+    signal.connect(values.append)
+    return values
+
+
+def test_changes_are_coalesced_to_the_latest_value(qapp):
+    thermostat = ThermostatController()
+    assert (thermostat.temperature, thermostat.humidity) == (20.0, 40)
+    temperatures = record(thermostat.temperatureChanged)
+    humidities = record(thermostat.humidityChanged)
+    for value in (21.0, 22.0, 23.5):
+        thermostat.temperature = value
+    thermostat.humidity = 45
+    # The value is assigned right away, the notification waits for the end of the window
+    assert thermostat.temperature == 23.5 and temperatures == []
+
+    wait(120)
+    assert temperatures == [23.5] and humidities == [45]
+
+
+def test_max_rate_selects_the_window(qapp):
+    thermostat = ThermostatController()
+    assert thermostat.mode == "auto"
+    modes = record(thermostat.modeChanged)
+    thermostat.mode = "heat"
+    thermostat.mode = "cool"
+    assert modes == []
+    wait(120)
+    assert modes == ["cool"]
+
+
+def test_changes_without_a_window_are_emitted_right_away(qapp):
+    thermostat = ThermostatController()
+    assert thermostat.target == 0
+    targets = record(thermostat.targetChanged)
+    thermostat.target = 1
+    thermostat.target = 1
+    thermostat.target = 2
+    assert targets == [1, 2]
@@ -0,0 +1,60 @@
+# The channel talks to a fake transport, which records the sent messages and answers the init message with no objects
+prelude = """
+import assert from "node:assert/strict";
+import {QWebChannel, QWebChannelMessageTypes as Type} from "./qwebchannel.mjs";
+
+const sent = [];
+const transport = {send: data => sent.push(JSON.parse(data))};
+const channel = new QWebChannel(transport);
+const receive = message => transport.onmessage({data: JSON.stringify(message)});
+receive({type: Type.response, id: 0, data: {}});
+sent.length = 0;
+"""
+
+
+def test_stream_grants_a_credit_per_consumed_chunk(node):
+    node(prelude + """
+const stream = channel.stream(0);
+receive({type: Type.streamData, stream: 0, seq: 0, data: [1, 2]});
+assert.deepEqual(await stream.next(), {value: 1, done: false});
+assert.deepEqual(await stream.next(), {value: 2, done: false});
+assert.deepEqual(sent, []);
+
+// The consumed chunk is acknowledged while waiting for the next one
+const pending = stream.next();
+assert.deepEqual(sent, [{type: Type.streamAck, stream: 0, credit: 1}]);
+receive({type: Type.streamData, stream: 0, seq: 1, data: [3]});
+assert.deepEqual(await pending, {value: 3, done: false});
+
+receive({type: Type.streamEnd, stream: 0});
+assert.deepEqual(await stream.next(), {value: undefined, done: true});
+assert.equal(sent.length, 1);
+assert.ok(!(0 in channel.streams));
+""")
+
+
+def test_stream_throws_the_error_of_its_end(node):
+    node(prelude + """
+const stream = channel.stream(3);
+receive({type: Type.streamData, stream: 3, seq: 0, data: ["a"]});
+receive({type: Type.streamEnd, stream: 3, error: "feed broken"});
+const items = [];
+await assert.rejects(async () => {
+    for await (const item of stream) items.push(item);
+}, /feed broken/);
+assert.deepEqual(items, ["a"]);
+""")
+
+
+def test_breaking_out_of_the_loop_cancels_the_stream(node):
+    node(prelude + """
+const stream = channel.stream(5);
+receive({type: Type.streamData, stream: 5, seq: 0, data: [1, 2, 3]});
+for await (const item of stream) {
+    if (item === 2) break;
+}
+assert.deepEqual(sent, [{type: Type.streamCancel, stream: 5}]);
+assert.ok(!(5 in channel.streams));
+// The cancelled stream is done, it does not wait for more chunks
+assert.deepEqual(await stream.next(), {value: undefined, done: true});
+""")
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+from PySide6.QtCore import QEventLoop, QTimer
+
+from pywebchannel import Controller, Edge, Signal
+from pywebchannel.Controller import RateLimit
+
+
+class SensorController(Controller):
+    def __init__(self):
+        super().__init__("SensorController")
+
+    throttled = Signal({"value": int}, throttle_ms=100, edge=Edge.Both)
+    leading = Signal({"value": int}, throttle_ms=100, edge=Edge.Leading)
+    debounced = Signal({"value": int}, debounce_ms=50)
+    trailing = Signal({"value": int}, throttle_ms=100)
+    limited = Signal({"value": int}, max_rate=10, edge=Edge.Both)
+
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def record(signal):
+    values = []
+    signal.connect(values.append)
+    return values
+
+
+def test_throttle_delivers_the_edges_of_each_window(qapp):
+    sensor = SensorController()
+    throttled = record(sensor.throttled)
+    leading = record(sensor.leading)
+    for value in range(5):
+        sensor.throttled.emit(value)
+        sensor.leading.emit(value)
+    assert throttled == [0] and leading == [0]
+
+    wait(200)
+    assert throttled == [0, 4] and leading == [0]
+
+
+def test_throttle_windows_are_per_signal(qapp):
+    sensor = SensorController()
+    times = []
+    sensor.limited.connect(lambda _: times.append(time.monotonic()))
+    # Another signal with the same window length starts its window first, it must not end the window of this one
+    sensor.trailing.emit(0)
+    wait(90)
+    sensor.limited.emit(1)
+    sensor.limited.emit(2)
+    wait(250)
+    assert len(times) == 2
+    assert times[1] - times[0] >= 0.099
+
+
+def test_debounce_delivers_the_last_emission_once_quiet(qapp):
+    sensor = SensorController()
+    debounced = record(sensor.debounced)
+    for value in range(3):
+        sensor.debounced.emit(value)
+        wait(10)
+    assert debounced == []
+
+    wait(150)
+    assert debounced == [2]
+
+
+def test_rate_limit_options():
+    assert RateLimit(max_rate=20).throttle_ms == 50
+    assert RateLimit(debounce_ms=10, edge=Edge.Leading).describe() == "debounce 10 ms, leading edge"
+    with pytest.raises(ValueError):
+        RateLimit(throttle_ms=10, debounce_ms=10)
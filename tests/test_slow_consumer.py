@@ -0,0 +1,103 @@
+import pytest
+from PySide6.QtNetwork import QAbstractSocket
+
+from pywebchannel import Action, Controller, Property, SlowConsumerPolicy
+from pywebchannel.WebChannelService import MessageType
+
+
+class GaugeController(Controller):
+    def __init__(self):
+        super().__init__("GaugeController")
+
+    level = Property(int, 0)
+    label = Property(str, "")
+
+    @Action()
+    def ping(self):
+        return "pong"
+
+
+class SlowClient:
+    """A client whose outgoing buffer on the server is set by the test instead of the socket."""
+
+    highWaterMark = 1000
+
+    def __init__(self, serve, connect, policy: int) -> None:
+        self.gauge = GaugeController()
+        self.service = serve(self.gauge)
+        self.service.highWaterMark = SlowClient.highWaterMark
+        self.service.slowConsumerPolicy = policy
+        self.detected = []
+        self.service.slowConsumerDetected.connect(self.detected.append)
+        self.client = connect(self.service)
+        objects = self.client.init()
+        self.client.send({"type": MessageType.Idle})
+        self.indexes = {name: str(index) for index, name, *_ in objects["GaugeController"]["properties"]}
+        self.transport = self.service.transports[0]
+        self.backlog = 0
+        self.transport.socket.bytesToWrite = lambda: self.backlog
+        self.client.take()
+
+    def drain(self, backlog: int = 0) -> None:
+        self.backlog = backlog
+        self.transport.onBytesWritten(0)
+
+    def propertyUpdates(self):
+        """Returns the received property values, one dict per property update."""
+        return [
+            {name: entry["properties"][index] for entry in message["data"] for name, index in self.indexes.items()
+             if index in entry["properties"]}
+            for message in self.client.messages() if message["type"] == MessageType.PropertyUpdate
+        ]
+
+
+@pytest.fixture
+def slowClient(serve, connect):
+    return lambda policy: SlowClient(serve, connect, policy)
+
+
+def test_drop_property_updates(slowClient, spin):
+    slow = slowClient(SlowConsumerPolicy.DropPropertyUpdates)
+    slow.backlog = 2000
+    slow.gauge.level = 1
+    spin(timeout=150)
+    assert slow.propertyUpdates() == [] and slow.transport.isSlowConsumer
+    assert slow.detected == [slow.transport]
+    # The responses are still sent, and the property updates keep being dropped
+    assert slow.client.call("GaugeController", "ping")["success"] == "pong"
+    slow.gauge.level = 2
+    spin(timeout=150)
+    assert slow.propertyUpdates() == []
+
+    # Nothing is held back, the next change is sent once the buffer drains
+    slow.drain()
+    assert not slow.transport.isSlowConsumer
+    slow.gauge.level = 3
+    assert spin(lambda: slow.propertyUpdates() == [{"level": 3}])
+
+
+def test_coalesce_sends_the_latest_values_once_drained(slowClient, spin):
+    slow = slowClient(SlowConsumerPolicy.Coalesce)
+    slow.backlog = 2000
+    slow.gauge.level = 1
+    spin(timeout=150)
+    slow.gauge.level = 2
+    slow.gauge.label = "two"
+    spin(timeout=150)
+    assert slow.propertyUpdates() == []
+
+    # The buffer must go down to the half of the high-water mark
+    slow.drain(SlowClient.highWaterMark // 2 + 1)
+    spin(timeout=50)
+    assert slow.propertyUpdates() == [] and slow.transport.isSlowConsumer
+    slow.drain()
+    assert spin(lambda: slow.propertyUpdates() == [{"level": 2, "label": "two"}])
+    assert slow.detected == [slow.transport]
+
+
+def test_disconnect(slowClient, spin):
+    slow = slowClient(SlowConsumerPolicy.Disconnect)
+    slow.backlog = 2000
+    slow.gauge.level = 1
+    assert spin(lambda: slow.client.socket.state() == QAbstractSocket.SocketState.UnconnectedState)
+    assert slow.propertyUpdates() == [] and slow.detected == [slow.transport]
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from pywebchannel import Action, Controller
+from pywebchannel.WebChannelService import MessageType, Stream
+
+
+class FeedController(Controller):
+    def __init__(self):
+        super().__init__("FeedController")
+        self.produced = 0
+        self.closed = False
+
+    @Action(stream=True, chunk_size=2)
+    def numbers(self, count: int):
+        for value in range(count):
+            yield value
+
+    @Action(stream=True, chunk_size=1)
+    def endless(self):
+        try:
+            while True:
+                self.produced += 1
+                yield self.produced
+        finally:
+            self.closed = True
+
+    @Action(stream=True, chunk_size=2)
+    async def ticks(self, count: int):
+        for value in range(count):
+            await asyncio.sleep(0.001)
+            yield value
+
+    @Action(stream=True, chunk_size=2)
+    def failing(self):
+        yield 1
+        yield 2
+        yield 3
+        raise ValueError("feed broken")
+
+
+@pytest.fixture
+def feed(serve, connect):
+    controller = FeedController()
+    client = connect(serve(controller))
+    client.init()
+    return controller, client
+
+
+def openStream(client, method, *args) -> int:
+    """Calls a streaming action and returns the identifier of its stream."""
+    return client.call("FeedController", method, *args)["data"]["__stream__"]
+
+
+def streamMessages(client, streamId: int):
+    return [
+        message for message in client.messages()
+        if message.get("type") in (MessageType.StreamData, MessageType.StreamEnd) and message["stream"] == streamId
+    ]
+
+
+def isEnd(streamId: int):
+    return lambda message: message.get("type") == MessageType.StreamEnd and message["stream"] == streamId
+
+
+def test_items_are_sent_in_chunks(feed):
+    controller, client = feed
+    streamId = openStream(client, "numbers", 5)
+    client.receive(isEnd(streamId))
+
+    messages = streamMessages(client, streamId)
+    assert [message["data"] for message in messages[:-1]] == [[0, 1], [2, 3], [4]]
+    assert [message["seq"] for message in messages[:-1]] == [0, 1, 2]
+    assert "error" not in messages[-1]
+
+
+def test_async_generators_are_sent_in_chunks(feed):
+    controller, client = feed
+    streamId = openStream(client, "ticks", 3)
+    client.receive(isEnd(streamId))
+    assert [message["data"] for message in streamMessages(client, streamId)[:-1]] == [[0, 1], [2]]
+
+
+def test_chunks_wait_for_the_credits_of_the_client(feed, spin):
+    controller, client = feed
+    streamId = openStream(client, "endless")
+    spin(timeout=100)
+    # The window is sent, then the generator is not advanced until the client consumes the chunks
+    assert len(streamMessages(client, streamId)) == Stream.window
+    assert controller.produced == Stream.window
+
+    client.send({"type": MessageType.StreamAck, "stream": streamId, "credit": 2})
+    assert spin(lambda: len(streamMessages(client, streamId)) == Stream.window + 2)
+    spin(timeout=100)
+    assert len(streamMessages(client, streamId)) == Stream.window + 2
+    assert [message["data"] for message in streamMessages(client, streamId)][-1] == [Stream.window + 2]
+
+
+def test_cancel_closes_the_generator(feed, spin):
+    controller, client = feed
+    streamId = openStream(client, "endless")
+    spin(lambda: len(streamMessages(client, streamId)) == Stream.window)
+
+    client.send({"type": MessageType.StreamCancel, "stream": streamId})
+    assert spin(lambda: controller.closed)
+    # The stream is gone, a late credit is ignored and the end is not sent to the client, which cancelled it
+    client.send({"type": MessageType.StreamAck, "stream": streamId, "credit": 1})
+    spin(timeout=100)
+    assert len(streamMessages(client, streamId)) == Stream.window
+
+
+def test_error_ends_the_stream(feed):
+    controller, client = feed
+    streamId = openStream(client, "failing")
+    end = client.receive(isEnd(streamId))
+
+    assert end["error"] == "feed broken"
+    assert [message["data"] for message in streamMessages(client, streamId)[:-1]] == [[1, 2]]
+
+
+def test_items_are_collected_outside_of_a_client_call(qapp):
+    response = FeedController().numbers(3)
+    assert response["data"] == [0, 1, 2]
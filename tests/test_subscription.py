@@ -0,0 +1,73 @@
+from pywebchannel import Controller, Property
+from pywebchannel.WebChannelService import MessageType, Subscription
+
+
+class BoardController(Controller):
+    def __init__(self):
+        super().__init__("BoardController")
+
+    title = Property(str, "")
+    todos = Property(list, [], delta=True)
+    tags = Property(dict, {}, delta=True)
+
+
+def signalIndex(obj, name):
+    metaObject = obj.metaObject()
+    return next(
+        index for index in range(metaObject.methodCount()) if metaObject.method(index).name().data().decode() == name
+    )
+
+
+def propertyIndex(obj, name):
+    return str(obj.metaObject().indexOfProperty(name))
+
+
+def patchMessage(obj, propertyName):
+    return {"type": MessageType.Signal, "object": obj.name(), "signal": signalIndex(obj, f"{propertyName}Patched")}
+
+
+def test_patches_of_observed_properties_only(qapp):
+    board = BoardController()
+    registered = {"BoardController": board}
+    subscription = Subscription({"BoardController": ["todos"]}, registered)
+    assert subscription.observesSignal(patchMessage(board, "todos"))
+    assert not subscription.observesSignal(patchMessage(board, "tags"))
+    # The other signals are sent to the clients connected to them
+    assert subscription.observesSignal({"type": MessageType.Signal, "object": "BoardController", "signal": 0})
+
+
+def test_patches_of_unsubscribed_objects_are_not_sent(qapp):
+    board = BoardController()
+    registered = {"BoardController": board}
+    assert not Subscription({}, registered).observesSignal(patchMessage(board, "todos"))
+    assert Subscription({"BoardController": None}, registered).observesSignal(patchMessage(board, "tags"))
+
+
+def test_property_update_and_init_are_filtered(qapp):
+    board = BoardController()
+    registered = {"BoardController": board, "Other": BoardController()}
+    subscription = Subscription({"BoardController": ["title"]}, registered)
+    title, todos = propertyIndex(board, "title"), propertyIndex(board, "todos")
+    titleChanged = str(signalIndex(board, "titleChanged"))
+    message = {
+        "type": MessageType.PropertyUpdate,
+        "data": [
+            {"object": "BoardController", "signals": {titleChanged: ["t"]}, "properties": {title: "t", todos: []}},
+            {"object": "Other", "signals": {titleChanged: ["o"]}, "properties": {title: "o"}},
+        ],
+    }
+    assert subscription.filterPropertyUpdate(message)["data"] == [
+        {"object": "BoardController", "signals": {titleChanged: ["t"]}, "properties": {title: "t"}},
+    ]
+    assert Subscription({"Nothing": None}, registered).filterPropertyUpdate(message) is None
+    assert subscription.filterInit({"BoardController": {}, "Other": {}, "__compact__": {}}).keys() == {
+        "BoardController", "__compact__"
+    }
+
+
+def test_equal_subscriptions_have_equal_keys(qapp):
+    registered = {"BoardController": BoardController()}
+    assert Subscription({"BoardController": ["todos", "tags"]}, registered).key == Subscription(
+        {"BoardController": ["tags", "todos"]}, registered
+    ).key
+    assert Subscription({"BoardController": None}, registered).key != Subscription({}, registered).key
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from pywebchannel import Action, Controller, Notify, Tracer
+
+
+class RouteController(Controller):
+    def __init__(self):
+        super().__init__("RouteController")
+
+    @Action(Notify({"distance": int}))
+    def plan(self, stops: list) -> int:
+        return len(stops) * 10
+
+    @Action()
+    async def reroute(self, delay: float) -> str:
+        await asyncio.sleep(delay)
+        return "rerouted"
+
+    @Action()
+    def fail(self) -> int:
+        raise ValueError("no route")
+
+
+@pytest.fixture
+def spans():
+    """Registers a hook for one test, which collects the ended spans, the tracer is shared."""
+    ended = []
+    hook = lambda span: ended.append
+    Tracer.instance().addHook(hook)
+    yield ended
+    Tracer.instance().removeHook(hook)
+
+
+@pytest.fixture
+def routes(serve, connect):
+    controller = RouteController()
+    client = connect(serve(controller))
+    client.init()
+    return controller, client
+
+
+def byName(spans) -> dict:
+    return {span.name: span for span in spans}
+
+
+def test_calls_are_not_traced_without_hooks(qapp):
+    assert not Tracer.instance().enabled
+    assert RouteController().plan([{}])["data"] == 10
+
+
+def test_calls_are_spans_of_their_phases(routes, spans):
+    controller, client = routes
+    assert client.call("RouteController", "plan", [1, 2], trace="client-trace")["data"] == 20
+
+    phases = byName(spans)
+    root = phases.pop("RouteController.plan")
+    assert root.parentId is None and root.attributes == {"controller": "RouteController", "action": "plan"}
+    assert [*phases] == ["convert", "call", "serialize", "notify"]
+    # The phases are children of the call, in the trace given by the client
+    assert all(span.parentId == root.spanId and span.traceId == "client-trace" for span in phases.values())
+    assert root.traceId == "client-trace" and root.error is None
+    assert all(root.startTime <= span.startTime <= span.endTime <= root.endTime for span in phases.values())
+
+
+def test_invalid_trace_identifiers_are_replaced(routes, spans):
+    controller, client = routes
+    client.call("RouteController", "plan", [], trace="x" * (Tracer.maxTraceIdLength + 1))
+    client.call("RouteController", "plan", [], trace=42)
+    traceIds = [span.traceId for span in spans if span.name == "RouteController.plan"]
+    assert len(traceIds) == 2 and all(len(traceId) == 32 for traceId in traceIds)
+    assert traceIds[0] != traceIds[1]
+
+
+def test_errors_end_the_spans(routes, spans):
+    controller, client = routes
+    assert client.call("RouteController", "fail")["error"] == "no route"
+    phases = byName(spans)
+    assert phases["RouteController.fail"].error == "no route" and phases["call"].error == "no route"
+
+
+def test_coroutine_spans_last_until_they_are_finished(routes, spans):
+    controller, client = routes
+    assert client.call("RouteController", "reroute", 0.1)["success"] == "rerouted"
+    phases = byName(spans)
+    assert phases["call"].duration >= 100
+    assert phases["RouteController.reroute"].endTime >= phases["call"].endTime
+
+
+def test_failing_hooks_do_not_break_the_calls(routes, spans):
+    controller, client = routes
+
+    def broken(span):
+        raise RuntimeError("exporter down")
+
+    Tracer.instance().addHook(broken)
+    try:
+        assert client.call("RouteController", "plan", [1])["data"] == 10
+    finally:
+        Tracer.instance().removeHook(broken)
+    assert "RouteController.plan" in byName(spans)
+
+
+def test_the_javascript_client_sends_the_trace_identifier(node):
+    node("""
+import assert from "node:assert/strict";
+import {QWebChannel, QWebChannelMessageTypes as Type} from "./qwebchannel.mjs";
+
+const sent = [];
+const transport = {send: data => sent.push(JSON.parse(data))};
+const channel = new QWebChannel(transport);
+const receive = message => transport.onmessage({data: JSON.stringify(message)});
+const objects = {RouteController: {methods: [["plan", 5]], properties: [], signals: [], enums: {}}};
+receive({type: Type.response, id: 0, data: objects});
+sent.length = 0;
+
+channel.callFields = {trace: "t1"};
+channel.batch(() => channel.objects.RouteController.plan([1]));
+channel.objects.RouteController.plan([2]);
+channel.callFields = null;
+channel.objects.RouteController.plan([3]);
+assert.equal(sent[0].calls[0].trace, "t1");
+assert.equal(sent[1].trace, "t1");
+assert.ok(!("trace" in sent[2]));
+""")
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from pywebchannel import Controller, Property, WebChannelService
+from pywebchannel.WebChannelService import MessageType
+
+
+class CounterController(Controller):
+    def __init__(self):
+        super().__init__("CounterController")
+
+    count = Property(int, 0)
+
+
+class Load:
+    """Feeds the adaptive sampling of a service with a given load and lag, instead of measuring them."""
+
+    def __init__(self, service: WebChannelService) -> None:
+        self.service = service
+        self.encodeTime = 0.0
+        service.encodeStats = lambda: {"encodeTime": self.encodeTime}
+
+    def sample(self, load: float, lag: float = 0) -> int:
+        """Ends a sampling period of one second with the load and the lag in milliseconds, and returns the interval."""
+        period = WebChannelService.adaptiveSampleInterval / 1000
+        self.service._lastSampleTime = time.perf_counter() - period - lag / 1000
+        self.service._lastEncodeTime = self.encodeTime
+        self.encodeTime += load * period
+        self.service.onAdaptiveSample()
+        return self.service.propertyUpdateInterval
+
+
+def test_interval_options(qapp):
+    service = WebChannelService("IntervalService")
+    intervals = []
+    service.propertyUpdateIntervalChanged.connect(intervals.append)
+    service.setPropertyUpdateInterval(20)
+    assert service.propertyUpdateInterval == 20 and intervals == [20]
+    with pytest.raises(ValueError):
+        service.setPropertyUpdateInterval(-1)
+    with pytest.raises(ValueError):
+        service.setPropertyUpdateInterval(100, adaptive=True, maxInterval=50)
+
+
+def test_adaptive_interval_follows_the_load(serve):
+    service = serve()
+    service.setPropertyUpdateInterval(25, adaptive=True, maxInterval=200)
+    assert service._adaptiveTimer.isActive()
+    load = Load(service)
+
+    # Doubled while busy, up to the widest interval
+    assert [load.sample(0.5) for _ in range(5)] == [50, 100, 200, 200, 200]
+    # Kept between the idle and the busy loads
+    assert load.sample(0.1) == 200
+    # Halved while idle, down to the narrowest interval
+    assert [load.sample(0.0) for _ in range(5)] == [100, 50, 25, 25, 25]
+    assert service.load == 0.0
+
+
+def test_adaptive_interval_widens_when_the_event_loop_lags(serve):
+    service = serve()
+    service.setPropertyUpdateInterval(25, adaptive=True, maxInterval=200)
+    load = Load(service)
+    assert load.sample(0.0, lag=40) == 50 and service.lag >= 40
+    # Not narrowed again while the lag is over the half of the interval
+    assert load.sample(0.0, lag=30) == 50
+    assert load.sample(0.0) == 25
+
+    service.setPropertyUpdateInterval(10)
+    assert not service._adaptiveTimer.isActive() and service.propertyUpdateInterval == 10
+
+
+def test_property_changes_are_merged_within_the_interval(serve, connect, spin):
+    counter = CounterController()
+    service = serve(counter)
+    service.setPropertyUpdateInterval(300)
+    client = connect(service)
+    client.init()
+    client.send({"type": MessageType.Idle})
+    client.take()
+
+    for value in range(1, 6):
+        counter.count = value
+        spin(timeout=20)
+    assert spin(lambda: any(message["type"] == MessageType.PropertyUpdate for message in client.messages()))
+    updates = [message for message in client.take() if message["type"] == MessageType.PropertyUpdate]
+    assert len(updates) == 1 and 5 in updates[0]["data"][0]["properties"].values()
@@ -0,0 +1,109 @@
+import pytest
+
+from pywebchannel import Action, CachePolicy, Controller
+
+
+class LibraryController(Controller):
+    def __init__(self):
+        super().__init__("LibraryController")
+        self.books = ["a"]
+        self.members = ["m"]
+        self.calls = 0
+
+    @Action(versioned=True)
+    def summary(self) -> dict:
+        self.calls += 1
+        return {"books": len(self.books), "members": len(self.members)}
+
+    @Action(versioned="books", cache=CachePolicy())
+    def listBooks(self) -> list:
+        self.calls += 1
+        return self.books
+
+    def addBook(self, title: str) -> None:
+        self.books.append(title)
+        self.bumpVersion("books")
+
+    def addMember(self, name: str) -> None:
+        self.members.append(name)
+        self.bumpVersion("members")
+
+
+@pytest.fixture
+def library(serve, connect):
+    controller = LibraryController()
+    client = connect(serve(controller))
+    client.init()
+    return controller, client
+
+
+def test_versions_of_the_state_and_its_parts(qapp):
+    library = LibraryController()
+    whole, books, members = library.version(), library.version("books"), library.version("members")
+    library.addBook("b")
+    # The whole state changes along with its parts, and a part does not change along with the other parts
+    assert library.version() != whole and library.version("books") != books
+    assert library.version("members") == members
+    # All the parts change along with the whole state
+    books = library.version("books")
+    library.bumpVersion()
+    assert library.version("books") != books and library.version("members") != members
+    # The versions of another controller object never match
+    assert LibraryController().version() != LibraryController().version()
+
+
+def test_known_versions_get_not_modified_responses(library):
+    controller, client = library
+    response = client.call("LibraryController", "summary")
+    assert response["data"] == {"books": 1, "members": 1} and response["version"] == controller.version()
+
+    notModified = client.call("LibraryController", "summary", version=response["version"])
+    assert notModified == {"success": None, "error": None, "data": None, "version": response["version"],
+                           "notModified": True}
+    assert controller.calls == 1
+
+    controller.addMember("n")
+    response = client.call("LibraryController", "summary", version=response["version"])
+    assert response["data"] == {"books": 1, "members": 2} and "notModified" not in response
+    assert controller.calls == 2
+
+
+def test_scoped_versions_and_cached_responses(library):
+    controller, client = library
+    response = client.call("LibraryController", "listBooks")
+    assert response["data"] == ["a"] and response["version"] == controller.version("books")
+
+    # The other parts of the state do not change the version of the books
+    controller.addMember("n")
+    assert client.call("LibraryController", "listBooks", version=response["version"])["notModified"]
+    # Changing the books drops the cached response too
+    controller.addBook("b")
+    response = client.call("LibraryController", "listBooks", version=response["version"])
+    assert response["data"] == ["a", "b"] and response["version"] == controller.version("books")
+    assert client.call("LibraryController", "listBooks")["data"] == ["a", "b"]
+    assert controller.calls == 2
+
+
+def test_versioned_streams_are_rejected():
+    with pytest.raises(Exception, match="cannot be versioned"):
+        Action(stream=True, versioned=True)
+
+
+def test_the_javascript_client_sends_the_known_version(node):
+    node("""
+import assert from "node:assert/strict";
+import {QWebChannel, QWebChannelMessageTypes as Type} from "./qwebchannel.mjs";
+
+const sent = [];
+const transport = {send: data => sent.push(JSON.parse(data))};
+const channel = new QWebChannel(transport);
+const receive = message => transport.onmessage({data: JSON.stringify(message)});
+const objects = {LibraryController: {methods: [["summary", 5]], properties: [], signals: [], enums: {}}};
+receive({type: Type.response, id: 0, data: objects});
+
+const response = channel.objects.LibraryController.__invoke__("summary", [], {version: "v1"});
+const call = sent.find(message => message.type === Type.invokeMethod);
+assert.equal(call.version, "v1");
+receive({type: Type.response, id: call.id, data: {version: "v1", notModified: true}});
+assert.deepEqual(await response, {version: "v1", notModified: true});
+""")
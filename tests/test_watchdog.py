@@ -0,0 +1,63 @@
+import time
+
+from PySide6.QtCore import QEventLoop, QTimer
+
+from pywebchannel.Controller import Invocation
+from pywebchannel.Metrics import Metrics
+from pywebchannel.Watchdog import Watchdog
+
+
+def stall():
+    time.sleep(0.3)
+
+
+def test_stalls_name_the_handler_of_the_innermost_loop(qapp):
+    watchdog = Watchdog(threshold=100, interval=10)
+    stalls = []
+    watchdog.stallDetected.connect(stalls.append)
+
+    def openDialog():
+        # A nested event loop, i.e. a modal dialog, which runs a stalling handler
+        dialogLoop = QEventLoop()
+        QTimer.singleShot(50, stall)
+        QTimer.singleShot(450, dialogLoop.quit)
+        dialogLoop.exec()
+
+    loop = QEventLoop()
+    QTimer.singleShot(50, openDialog)
+    QTimer.singleShot(600, stall)
+    QTimer.singleShot(1000, loop.quit)
+    watchdog.start()
+    try:
+        loop.exec()
+    finally:
+        watchdog.stop()
+        Metrics.instance().reset()
+
+    handlers = [report["handler"] for report in stalls]
+    assert len(handlers) == 2
+    assert all(handler is not None and handler.startswith("stall ") for handler in handlers)
+
+
+def test_stalls_name_the_action_being_called(qapp):
+    watchdog = Watchdog(threshold=100, interval=10)
+    stalls = []
+    watchdog.stallDetected.connect(stalls.append)
+
+    def callAction():
+        with Invocation(None, {"object": "SlowController", "method": "run"}) as invocation:
+            assert Invocation.snapshot() == [invocation]
+            stall()
+
+    loop = QEventLoop()
+    QTimer.singleShot(50, callAction)
+    QTimer.singleShot(500, loop.quit)
+    watchdog.start()
+    try:
+        loop.exec()
+    finally:
+        watchdog.stop()
+        Metrics.instance().reset()
+
+    assert [report["action"] for report in stalls] == ["SlowController.run"]
+    assert Invocation.snapshot() == []